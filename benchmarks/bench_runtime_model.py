@@ -0,0 +1,77 @@
+"""Benchmark of event throughput of the ``simpy`` engine.
+
+Run from the repository root with ``python -m benchmarks.bench_runtime_model``.
+Reports domain events per second, counting arrivals, departures and light
+changes, for a few loads and lane configurations. Comparing the output
+before and after a change to the engine's hot path (for instance the
+compiled runtime model of :mod:`sim.runtime`) shows its effect.
+"""
+
+import time
+
+from sim.basic_fourway_intersection import arrival_rates, uniform_cyle_time
+from sim.intersection import simulate
+from sim.models import DischargeMode, Intersection, Lane
+
+
+DURATION = 24 * 60 * 60
+
+
+def intersection_with(**lane_options) -> Intersection:
+    """Return the default intersection, with two lanes per direction if needed."""
+
+    intersection = Intersection.create_basic_four_way(uniform_cyle_time)
+    if lane_options:
+        intersection.lanes = {
+            direction: [Lane(light=light, **lane_options) for _ in range(2)]
+            for direction, light in intersection.lights.items()
+        }
+    return intersection
+
+
+def events_per_second(
+    scale: float, discharge: DischargeMode, repeat: int = 3, **lane_options
+) -> float:
+    """Return the best events per second of ``repeat`` 24 h runs."""
+
+    rates = {direction: rate * scale for direction, rate in arrival_rates.items()}
+    intersection = intersection_with(**lane_options)
+    cycle = sum(p.cycle_time.green + p.cycle_time.yellow for p in intersection.phases)
+    lights = sum(len(p.lights) for p in intersection.phases)
+    light_changes = 3 * lights * DURATION / cycle
+
+    best = 0.0
+    for seed in range(repeat):
+        # A fresh configuration per run keeps the comparison fair for
+        # engines that leave vehicles queued in the models they are given.
+        intersection = intersection_with(**lane_options)
+        start = time.perf_counter()
+        stats = simulate(DURATION, intersection, rates, discharge=discharge, seed=seed)
+        elapsed = time.perf_counter() - start
+        events = stats.total_vehicles + len(stats.waiting_times) + light_changes
+        best = max(best, events / elapsed)
+    return best
+
+
+def main() -> None:
+    """Print events per second for each benchmark case."""
+
+    cases = [
+        ('default rates', 1.0, DischargeMode.EVENT, {}),
+        ('4x rates', 4.0, DischargeMode.EVENT, {}),
+        ('4x rates, polling', 4.0, DischargeMode.POLLING, {}),
+        (
+            '4x rates, headway lanes',
+            4.0,
+            DischargeMode.EVENT,
+            {'saturation_headway': 2.0, 'startup_lost_time': 2.0},
+        ),
+    ]
+    print(f'{"case":<28} {"events/s":>12}')
+    for name, scale, discharge, lane_options in cases:
+        rate = events_per_second(scale, discharge, **lane_options)
+        print(f'{name:<28} {rate:>12,.0f}')
+
+
+if __name__ == '__main__':
+    main()
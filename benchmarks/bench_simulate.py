@@ -0,0 +1,44 @@
+"""Regression check of simulation throughput against the stored baseline.
+
+Run from the repository root with ``python -m benchmarks.bench_simulate``.
+Every case of :func:`sim.bench.benchmark_cases` is run in its own process
+and compared with ``benchmarks/baseline.json``; the script exits with
+status 1 if any case lost more than 30 % of its events per second, or
+50 % for the noisy 1 h cases. Every case runs ``--repeats`` times (three
+by default) and its fastest run is kept, both when checking and when
+recording. Pass ``--quick`` for the reduced matrix and ``--update`` to
+rewrite the baseline after an intended change or on new hardware.
+"""
+
+import argparse
+from pathlib import Path
+
+from sim.bench import REPEATS, benchmark_cases, run_benchmarks, save_baseline
+
+
+BASELINE = Path(__file__).with_name('baseline.json')
+
+
+def main() -> None:
+    """Run the suite and fail on regressions."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--quick', action='store_true')
+    parser.add_argument('--update', action='store_true')
+    parser.add_argument('--repeats', type=int, default=REPEATS)
+    args = parser.parse_args()
+
+    report = run_benchmarks(
+        benchmark_cases(quick=args.quick),
+        baseline=None if args.update else BASELINE,
+        repeats=args.repeats,
+    )
+    report.show_table()
+    if args.update:
+        save_baseline(report.results, BASELINE)
+    elif report.regressions:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
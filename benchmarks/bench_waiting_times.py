@@ -0,0 +1,55 @@
+"""Micro-benchmark of the per-vehicle cost of recording waiting times.
+
+Run from the repository root with ``python -m benchmarks.bench_waiting_times``.
+The cost per vehicle of :class:`~sim.models.metrics.WaitingTimeBuffer`
+should stay flat as the run grows, while the former ``np.append`` approach
+grows linearly.
+"""
+
+import time
+
+import numpy as np
+
+from sim.models.metrics import WaitingTimeBuffer
+
+
+def per_vehicle_cost(record, n: int) -> float:
+    """Return the mean seconds spent recording each of ``n`` values."""
+
+    values = np.random.default_rng(0).exponential(10.0, size=n).tolist()
+    start = time.perf_counter()
+    record(values)
+    return (time.perf_counter() - start) / n
+
+
+def record_buffer(values: list[float]) -> None:
+    """Record ``values`` one at a time into a ``WaitingTimeBuffer``."""
+
+    buffer = WaitingTimeBuffer()
+    for value in values:
+        buffer.add(value)
+
+
+def record_np_append(values: list[float]) -> None:
+    """Record ``values`` one at a time with ``np.append``."""
+
+    waiting_times = np.array([])
+    for value in values:
+        waiting_times = np.append(waiting_times, value)
+
+
+def main() -> None:
+    """Print the per-vehicle recording cost for increasing run lengths."""
+
+    print(f'{"vehicles":>10} {"buffer (ns)":>12} {"np.append (ns)":>15}')
+    for n in (1_000, 10_000, 100_000, 1_000_000):
+        buffer_ns = per_vehicle_cost(record_buffer, n) * 1e9
+        if n <= 100_000:
+            append_ns = f'{per_vehicle_cost(record_np_append, n) * 1e9:15.0f}'
+        else:
+            append_ns = f'{"(skipped)":>15}'
+        print(f'{n:>10} {buffer_ns:12.0f} {append_ns}')
+
+
+if __name__ == '__main__':
+    main()
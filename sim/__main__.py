@@ -2,6 +2,7 @@
 
 import argparse
 import json
+import pstats
 from pathlib import Path
 
 from sim.basic_fourway_intersection import (
@@ -9,8 +10,27 @@ from sim.basic_fourway_intersection import (
     duration as default_duration,
     intersection,
 )
-from sim.intersection import simulate
+from sim.bench import benchmark_cases, run_benchmarks, save_baseline
+from sim.checkpoint import resume
+from sim.control import ActuatedController, FixedTimeController
+from sim.intersection import Engine, simulate
+from sim.mesoscopic import simulate_mesoscopic
+from sim.optimize import optimize_timings, timing_grid
+from sim.replications import simulate_replications, simulate_until_precision
+from sim.models import IntersectionNetwork
 from sim.models.lights import Direction
+from sim.partitions import simulate_partitioned
+from sim.segments import simulate_segments
+
+
+CONTROLLERS = {'fixed': FixedTimeController, 'actuated': ActuatedController}
+"""Signal controllers selectable with ``--controller``."""
+
+
+def warmup_arg(value: str) -> float | str:
+    """Parse ``--warmup`` as seconds or the literal ``auto``."""
+
+    return value if value == 'auto' else float(value)
 
 
 def parse_args() -> argparse.Namespace:
@@ -54,11 +74,262 @@ def parse_args() -> argparse.Namespace:
         default=default_rates[Direction.WEST],
         help='Westbound arrival rate (vehicles/sec)',
     )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        help='Seed for reproducible arrivals (random when omitted)',
+    )
+    parser.add_argument(
+        '--warmup',
+        type=warmup_arg,
+        help='Warm-up seconds to exclude from statistics, or "auto" for MSER-5',
+    )
+    parser.add_argument(
+        '--engine',
+        type=Engine,
+        choices=list(Engine),
+        default=Engine.SIMPY,
+        help='Simulation engine; "vectorized" is faster for fixed-time signals',
+    )
+    parser.add_argument(
+        '--replications',
+        type=int,
+        default=1,
+        help='Number of independent replications to run',
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Worker processes for replications (defaults to the CPU count)',
+    )
+    parser.add_argument(
+        '--target-half-width',
+        type=float,
+        help=(
+            'Keep adding replications until the confidence interval of the '
+            'average waiting time is at most this wide on each side'
+        ),
+    )
+    parser.add_argument(
+        '--max-replications',
+        type=int,
+        default=1000,
+        help='Replication budget when --target-half-width is given',
+    )
+    parser.add_argument(
+        '--profile',
+        nargs='?',
+        const=Path('sim.prof'),
+        type=Path,
+        metavar='PATH',
+        help=(
+            'Instrument a single run, print engine counters and the hottest '
+            'functions, and save cProfile statistics to PATH (default: sim.prof)'
+        ),
+    )
+    parser.add_argument(
+        '--timeseries',
+        type=Path,
+        metavar='PATH',
+        help=(
+            'Save per-lane queue lengths, light states and departures of a '
+            'single run to PATH (.npz, or a directory of .npy files)'
+        ),
+    )
+    parser.add_argument(
+        '--sample-interval',
+        type=float,
+        default=1.0,
+        help='Seconds between --timeseries samples',
+    )
+    parser.add_argument(
+        '--trace',
+        type=Path,
+        metavar='PATH',
+        help=(
+            'Write the id, direction, lane, arrival and departure time of '
+            'every vehicle of a single run to PATH (see sim.trace)'
+        ),
+    )
+    parser.add_argument(
+        '--checkpoint',
+        type=Path,
+        metavar='PATH',
+        help='Save the state of a single run to PATH so it can be resumed',
+    )
+    parser.add_argument(
+        '--checkpoint-every',
+        type=float,
+        default=3600.0,
+        help='Simulated seconds between --checkpoint saves',
+    )
+    parser.add_argument(
+        '--resume',
+        type=Path,
+        metavar='PATH',
+        help='Continue the run saved in the checkpoint at PATH',
+    )
+    parser.add_argument(
+        '--segments',
+        type=int,
+        default=1,
+        help='Split a single run into this many time segments run in parallel',
+    )
+    parser.add_argument(
+        '--lead-in',
+        type=float,
+        default=3600.0,
+        help='Warm-up seconds simulated before each time segment',
+    )
+    parser.add_argument(
+        '--controller',
+        choices=CONTROLLERS,
+        help=(
+            'Signal controller of a single run, reporting the time spent on '
+            'its decisions (default: the fixed-time plan, unreported)'
+        ),
+    )
     parser.add_argument(
         '--metrics-path',
         type=Path,
         help='Path to write summary metrics as JSON',
     )
+
+    commands = parser.add_subparsers(dest='command')
+    optimize = commands.add_parser(
+        'optimize',
+        help='Search green/yellow times and phase splits',
+        description=(
+            'Rank timing plans for the default intersection. Options given '
+            'before "optimize" (duration, rates, seed, workers, warm-up, '
+            'metrics path) apply to every evaluation.'
+        ),
+    )
+    optimize.add_argument(
+        '--green',
+        type=float,
+        nargs='+',
+        default=[20, 30, 40],
+        help='Candidate green times in seconds',
+    )
+    optimize.add_argument(
+        '--yellow',
+        type=float,
+        nargs='+',
+        default=[3],
+        help='Candidate yellow times in seconds',
+    )
+    optimize.add_argument(
+        '--no-split',
+        action='store_true',
+        help='Give every phase the same green time instead of searching splits',
+    )
+    optimize.add_argument(
+        '--strategy',
+        choices=['grid', 'halving'],
+        default='halving',
+        help='Evaluate every plan fully, or prune with successive halving',
+    )
+    optimize.add_argument(
+        '--replications',
+        dest='optimize_replications',
+        type=int,
+        help=(
+            'Replications per plan (the maximum for successive halving; '
+            'default: the top-level --replications if above 1, else 8)'
+        ),
+    )
+    optimize.add_argument(
+        '--top',
+        type=int,
+        default=10,
+        help='Number of ranked plans to print',
+    )
+
+    bench = commands.add_parser(
+        'bench',
+        help='Measure simulation throughput',
+        description=(
+            'Run the benchmark matrix of sim.bench and optionally compare it '
+            'with a stored baseline. The top-level --engine and '
+            '--metrics-path options apply.'
+        ),
+    )
+    bench.add_argument(
+        '--quick',
+        action='store_true',
+        help='Run a reduced matrix that finishes in seconds',
+    )
+    bench.add_argument(
+        '--baseline',
+        type=Path,
+        help='Baseline JSON to compare against; regressions exit with status 1',
+    )
+    bench.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.3,
+        help=(
+            'Allowed relative drop in events/sec before a case regresses '
+            '(at least 0.5 for cases shorter than a day)'
+        ),
+    )
+    bench.add_argument(
+        '--repeats',
+        type=int,
+        default=3,
+        help='Run the suite this many times and keep the fastest run of each case',
+    )
+    bench.add_argument(
+        '--save-baseline',
+        type=Path,
+        help='Write the measured events/sec as a new baseline JSON',
+    )
+
+    network = commands.add_parser(
+        'network',
+        help='Simulate a network of linked intersections',
+        description=(
+            'Simulate the intersections, links and boundary arrivals of a '
+            'JSON topology file, or of a generated grid. The top-level '
+            '--duration, --seed and --metrics-path options apply.'
+        ),
+    )
+    network.add_argument(
+        'topology',
+        type=Path,
+        nargs='?',
+        help='JSON topology file, see IntersectionNetwork.from_json',
+    )
+    network.add_argument(
+        '--grid',
+        type=int,
+        nargs=2,
+        metavar=('ROWS', 'COLUMNS'),
+        help='Simulate a grid of basic four-way intersections instead',
+    )
+    network.add_argument(
+        '--streaming',
+        action='store_true',
+        help='Summarize waiting times in constant memory',
+    )
+    network.add_argument(
+        '--partitions',
+        type=int,
+        default=1,
+        help='Split the network across this many worker processes',
+    )
+    network.add_argument(
+        '--mesoscopic',
+        action='store_true',
+        help='Estimate delays with the cell-transmission model instead',
+    )
+    network.add_argument(
+        '--step',
+        type=float,
+        default=1.0,
+        help='Time step of the cell-transmission model in seconds',
+    )
     return parser.parse_args()
 
 
@@ -73,11 +344,168 @@ def main() -> None:
         Direction.WEST: args.west_rate,
     }
 
-    stats = simulate(args.duration, intersection, rates)
-    stats.show_summary()
+    single_run_options = {
+        '--profile': args.profile,
+        '--timeseries': args.timeseries,
+        '--trace': args.trace,
+        '--checkpoint': args.checkpoint,
+        '--resume': args.resume,
+        '--segments': args.segments if args.segments > 1 else None,
+        '--controller': args.controller,
+    }
+    if args.command or args.replications > 1 or args.target_half_width is not None:
+        for option, value in single_run_options.items():
+            if value is not None:
+                raise SystemExit(f'{option} applies to single runs only')
+    if args.controller and args.segments > 1:
+        raise SystemExit('Time segments assume the fixed-time plan')
+
+    if args.command == 'bench':
+        report = run_benchmarks(
+            benchmark_cases(quick=args.quick, engine=args.engine),
+            baseline=args.baseline,
+            tolerance=args.tolerance,
+            repeats=args.repeats,
+        )
+        report.show_table()
+        if args.save_baseline:
+            save_baseline(report.results, args.save_baseline)
+        if args.metrics_path:
+            args.metrics_path.write_text(report.model_dump_json(indent=2))
+        if report.regressions:
+            raise SystemExit(1)
+        return
+
+    if args.command == 'network':
+        if (args.topology is None) == (args.grid is None):
+            raise SystemExit('Give either a topology file or --grid')
+        if args.grid is not None:
+            topology = IntersectionNetwork.grid(
+                *args.grid, intersection.phases[0].cycle_time
+            )
+        else:
+            topology = IntersectionNetwork.from_json(args.topology)
+        if args.mesoscopic:
+            if args.partitions > 1:
+                raise SystemExit('--mesoscopic runs in a single process')
+            network_stats = simulate_mesoscopic(args.duration, topology, step=args.step)
+        else:
+            network_stats = simulate_partitioned(
+                args.duration,
+                topology,
+                partitions=args.partitions,
+                seed=args.seed,
+                streaming=args.streaming,
+            )
+        network_stats.show_summary()
+        if args.metrics_path:
+            args.metrics_path.write_text(json.dumps(network_stats.to_dict(), indent=2))
+        return
+
+    if args.command == 'optimize':
+        candidates = timing_grid(
+            intersection, args.green, args.yellow, split=not args.no_split
+        )
+        result = optimize_timings(
+            intersection,
+            candidates,
+            args.duration,
+            rates,
+            strategy=args.strategy,
+            replications=(
+                args.optimize_replications
+                or (args.replications if args.replications > 1 else 8)
+            ),
+            workers=args.workers,
+            seed=args.seed,
+            warmup=args.warmup,
+            engine=args.engine,
+        )
+        result.show_table(args.top)
+        metrics = result.model_dump()
+    elif args.target_half_width is not None:
+        results = simulate_until_precision(
+            args.target_half_width,
+            args.duration,
+            intersection,
+            rates,
+            max_replications=args.max_replications,
+            workers=args.workers,
+            seed=args.seed,
+            warmup=args.warmup,
+            engine=args.engine,
+        )
+        results.show_summary()
+        print(
+            f'Converged:                {results.converged}\n'
+            f'Discarded replications:   {results.discarded}\n'
+            f'Simulated seconds:        {results.simulated_seconds:.0f}'
+        )
+        metrics = results.model_dump(exclude={'summaries'})
+    elif args.resume is not None:
+        stats = resume(
+            args.resume,
+            checkpoint_every=args.checkpoint_every if args.checkpoint else None,
+        )
+        stats.show_summary()
+        metrics = stats.to_dict()
+    elif args.segments > 1:
+        stats = simulate_segments(
+            args.duration,
+            intersection,
+            rates,
+            segments=args.segments,
+            lead_in=args.lead_in,
+            workers=args.workers,
+            seed=args.seed,
+            warmup=args.warmup,
+        )
+        stats.show_summary()
+        metrics = stats.to_dict()
+    elif args.replications > 1:
+        results = simulate_replications(
+            args.replications,
+            args.duration,
+            intersection,
+            rates,
+            workers=args.workers,
+            seed=args.seed,
+            warmup=args.warmup,
+            engine=args.engine,
+        )
+        results.show_summary()
+        metrics = results.model_dump(exclude={'summaries'})
+    else:
+        stats = simulate(
+            args.duration,
+            intersection,
+            rates,
+            seed=args.seed,
+            warmup=args.warmup,
+            engine=args.engine,
+            profile_path=args.profile,
+            sample_interval=args.sample_interval if args.timeseries else None,
+            trace_path=args.trace,
+            checkpoint_path=args.checkpoint,
+            checkpoint_every=args.checkpoint_every,
+            controller=(CONTROLLERS[args.controller]() if args.controller else None),
+        )
+        stats.show_summary()
+        metrics = stats.to_dict()
+        if stats.controller_report is not None:
+            print()
+            stats.controller_report.show_summary()
+            metrics['controller'] = stats.controller_report.model_dump()
+        if stats.engine_report is not None:
+            print()
+            stats.engine_report.show_summary()
+            pstats.Stats(str(args.profile)).sort_stats('cumulative').print_stats(15)
+            metrics['engine'] = stats.engine_report.model_dump()
+        if stats.timeseries is not None:
+            stats.timeseries.save(args.timeseries)
 
     if args.metrics_path:
-        args.metrics_path.write_text(json.dumps(stats.to_dict(), indent=2))
+        args.metrics_path.write_text(json.dumps(metrics, indent=2))
 
 
 if __name__ == '__main__':
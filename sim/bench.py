@@ -0,0 +1,341 @@
+"""Throughput benchmarks of :func:`sim.intersection.simulate`.
+
+A benchmark case simulates the default four-way intersection for a given
+duration, load and number of lanes per direction. Each case runs in a
+fresh process so that its peak resident memory is its own, and reports:
+
+* wall time of the fastest run,
+* domain events per second, counting arrivals, departures and light
+  changes,
+* vehicles per second, and
+* peak RSS of the process.
+
+Results can be stored as a JSON baseline and later runs compared against
+it; a case whose events per second drop by more than the tolerance is a
+regression. Each case runs in :data:`REPEATS` processes by default and
+the fastest is kept, as within a process: noise only ever slows a run
+down, so the fastest run is the most stable estimate of the code's speed.
+The repeats go through the whole suite in turn, so a case's runs are
+minutes apart and a slow spell of the machine rarely hits all of them.
+Cases shorter than a day last milliseconds and vary widely from process
+to process, so they are held to the looser :data:`SHORT_TOLERANCE`. Run
+the suite with ``python -m sim bench``.
+"""
+
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+import json
+import math
+import multiprocessing
+from pathlib import Path
+import sys
+import time
+
+from pydantic import BaseModel
+
+from sim.basic_fourway_intersection import arrival_rates, uniform_cyle_time
+from sim.intersection import Engine, simulate
+from sim.models import Intersection, Lane
+
+
+DURATIONS = {'1h': 3600, '24h': 24 * 3600, '7d': 7 * 24 * 3600}
+"""Simulated durations of the benchmark matrix."""
+
+LOADS = {'light': 0.5, 'moderate': 1.0, 'heavy': 3.0, 'oversaturated': 8.0}
+"""Multipliers of the default arrival rates; 8x exceeds one lane's capacity."""
+
+LANES = (1, 2, 4)
+"""Lanes per direction of the benchmark matrix."""
+
+MIN_WALL_TIME = 1.0
+"""Short cases are repeated until they have run for at least this long."""
+
+REPEATS = 3
+"""Processes each case runs in by default; the fastest is kept."""
+
+SHORT_TOLERANCE = 0.5
+"""Least allowed relative drop for cases simulating less than a day."""
+
+
+class BenchmarkCase(BaseModel):
+    """One point of the benchmark matrix."""
+
+    name: str
+    duration: int
+    scale: float
+    lanes: int
+    engine: Engine = Engine.SIMPY
+
+
+class BenchmarkResult(BaseModel):
+    """Measurements of one benchmark case."""
+
+    case: BenchmarkCase
+    runs: int
+    wall_time: float
+    """Seconds taken by the fastest run."""
+    events: int
+    events_per_second: float
+    vehicles_per_second: float
+    peak_rss_mb: float | None
+    """Peak resident memory of the benchmark process, if measurable."""
+
+
+class BenchmarkReport(BaseModel):
+    """Results of a benchmark suite and their comparison to a baseline."""
+
+    results: list[BenchmarkResult]
+    tolerance: float | None = None
+    regressions: list[str] = []
+    """Descriptions of cases slower than the baseline allows."""
+
+    def show_table(self) -> None:
+        """Print one row per case, flagging regressions."""
+
+        print(
+            f'{"case":<28} {"wall s":>8} {"events/s":>12} '
+            f'{"vehicles/s":>12} {"peak MB":>8}'
+        )
+        slow = {line.split(':')[0] for line in self.regressions}
+        for result in self.results:
+            rss = f'{result.peak_rss_mb:.0f}' if result.peak_rss_mb else '-'
+            flag = '  REGRESSION' if result.case.name in slow else ''
+            print(
+                f'{result.case.name:<28} {result.wall_time:>8.3f} '
+                f'{result.events_per_second:>12,.0f} '
+                f'{result.vehicles_per_second:>12,.0f} {rss:>8}{flag}'
+            )
+        for line in self.regressions:
+            print(f'Regression: {line}', file=sys.stderr)
+
+
+def benchmark_cases(
+    *,
+    quick: bool = False,
+    engine: Engine = Engine.SIMPY,
+) -> list[BenchmarkCase]:
+    """Return the benchmark matrix.
+
+    Parameters
+    ----------
+    quick : bool, optional
+        Only the 1 h and 24 h durations, the light and oversaturated loads
+        and one or four lanes, for a check that takes seconds.
+    engine : Engine, optional
+        Engine used by every case.
+
+    Returns
+    -------
+    list[BenchmarkCase]
+        Cases ordered by duration, load and lanes.
+    """
+
+    durations = ['1h', '24h'] if quick else list(DURATIONS)
+    loads = ['light', 'oversaturated'] if quick else list(LOADS)
+    lanes = (1, 4) if quick else LANES
+    return [
+        BenchmarkCase(
+            name=f'{duration}-{load}-{count}lane',
+            duration=DURATIONS[duration],
+            scale=LOADS[load],
+            lanes=count,
+            engine=engine,
+        )
+        for duration, load, count in product(durations, loads, lanes)
+    ]
+
+
+def build_intersection(lanes: int) -> Intersection:
+    """Return the default intersection with ``lanes`` lanes per direction."""
+
+    intersection = Intersection.create_basic_four_way(uniform_cyle_time)
+    intersection.lanes = {
+        direction: [Lane(light=light) for _ in range(lanes)]
+        for direction, light in intersection.lights.items()
+    }
+    return intersection
+
+
+def light_changes(intersection: Intersection, duration: float) -> int:
+    """Return the number of light state changes in ``[0, duration)``."""
+
+    cycle = sum(p.cycle_time.green + p.cycle_time.yellow for p in intersection.phases)
+    changes = 0
+    offset = 0.0
+    for phase in intersection.phases:
+        times = (
+            offset,
+            offset + phase.cycle_time.green,
+            offset + phase.cycle_time.green + phase.cycle_time.yellow,
+        )
+        for moment in times:
+            if moment < duration:
+                changes += len(phase.lights) * math.ceil((duration - moment) / cycle)
+        offset += phase.cycle_time.green + phase.cycle_time.yellow
+    return changes
+
+
+def peak_rss_mb() -> float | None:
+    """Return the peak resident memory of this process in MiB, if known."""
+
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+
+
+def run_case(case: BenchmarkCase) -> BenchmarkResult:
+    """Run ``case`` in this process and return its measurements.
+
+    The case is repeated with new seeds until it has run for
+    :data:`MIN_WALL_TIME`, and the fastest run is reported.
+    """
+
+    intersection = build_intersection(case.lanes)
+    rates = {d: rate * case.scale for d, rate in arrival_rates.items()}
+    changes = light_changes(intersection, case.duration)
+
+    best = None
+    runs = 0
+    elapsed_total = 0.0
+    while runs == 0 or elapsed_total < MIN_WALL_TIME:
+        start = time.perf_counter()
+        stats = simulate(
+            case.duration, intersection, rates, seed=runs, engine=case.engine
+        )
+        elapsed = time.perf_counter() - start
+        elapsed_total += elapsed
+        runs += 1
+        events = stats.total_vehicles + len(stats.waiting_times) + changes
+        if best is None or elapsed < best[0]:
+            best = (elapsed, events, stats.total_vehicles)
+
+    wall_time, events, vehicles = best
+    return BenchmarkResult(
+        case=case,
+        runs=runs,
+        wall_time=wall_time,
+        events=events,
+        events_per_second=events / wall_time,
+        vehicles_per_second=vehicles / wall_time,
+        peak_rss_mb=peak_rss_mb(),
+    )
+
+
+def run_isolated(case: BenchmarkCase) -> BenchmarkResult:
+    """Run ``case`` in a freshly spawned process and return its measurements."""
+
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(run_case, case).result()
+
+
+def compare(
+    results: Sequence[BenchmarkResult],
+    baseline: dict[str, float],
+    tolerance: float,
+) -> list[str]:
+    """Return the cases whose events per second fell below the baseline.
+
+    Parameters
+    ----------
+    results : Sequence[BenchmarkResult]
+        Fresh measurements.
+    baseline : dict[str, float]
+        Events per second of each case name; cases missing from it are
+        not compared.
+    tolerance : float
+        Allowed relative slowdown, e.g. ``0.25`` for 25 %. Cases shorter
+        than a day may slow down by :data:`SHORT_TOLERANCE` if larger.
+
+    Returns
+    -------
+    list[str]
+        One description per regressed case.
+    """
+
+    regressions = []
+    for result in results:
+        reference = baseline.get(result.case.name)
+        if reference is None:
+            continue
+        allowed = tolerance
+        if result.case.duration < DURATIONS['24h']:
+            allowed = max(tolerance, SHORT_TOLERANCE)
+        if result.events_per_second < reference * (1 - allowed):
+            change = result.events_per_second / reference - 1
+            regressions.append(
+                f'{result.case.name}: {result.events_per_second:,.0f} events/s '
+                f'vs baseline {reference:,.0f} ({change:+.0%})'
+            )
+    return regressions
+
+
+def load_baseline(path: str | Path) -> dict[str, float]:
+    """Return the events per second of each case stored in ``path``."""
+
+    return json.loads(Path(path).read_text())['events_per_second']
+
+
+def save_baseline(results: Sequence[BenchmarkResult], path: str | Path) -> None:
+    """Store the events per second of ``results`` as a baseline at ``path``."""
+
+    baseline = {
+        'events_per_second': {
+            result.case.name: round(result.events_per_second) for result in results
+        }
+    }
+    Path(path).write_text(json.dumps(baseline, indent=2) + '\n')
+
+
+def run_benchmarks(
+    cases: Sequence[BenchmarkCase],
+    *,
+    baseline: str | Path | None = None,
+    tolerance: float = 0.3,
+    isolate: bool = True,
+    repeats: int = REPEATS,
+) -> BenchmarkReport:
+    """Run ``cases`` and compare them with an optional baseline.
+
+    Parameters
+    ----------
+    cases : Sequence[BenchmarkCase]
+        Cases to run, e.g. from :func:`benchmark_cases`.
+    baseline : str | Path | None, optional
+        JSON file written by :func:`save_baseline`.
+    tolerance : float, optional
+        Allowed relative drop in events per second; at least
+        :data:`SHORT_TOLERANCE` for cases shorter than a day.
+    isolate : bool, optional
+        Run each case in its own process so that peak RSS is per case.
+    repeats : int, optional
+        Run the suite this many times, each case in a new process when
+        isolated, and report the run of each case with the most events
+        per second.
+
+    Returns
+    -------
+    BenchmarkReport
+        Measurements and any regressions.
+    """
+
+    runner = run_isolated if isolate else run_case
+    results: list[BenchmarkResult | None] = [None] * len(cases)
+    for _ in range(repeats):
+        for index, case in enumerate(cases):
+            result = runner(case)
+            best = results[index]
+            if best is None or result.events_per_second > best.events_per_second:
+                results[index] = result
+    if baseline is None:
+        return BenchmarkReport(results=results)
+    return BenchmarkReport(
+        results=results,
+        tolerance=tolerance,
+        regressions=compare(results, load_baseline(baseline), tolerance),
+    )
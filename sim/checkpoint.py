@@ -0,0 +1,245 @@
+"""Checkpoints of event-engine runs.
+
+``simpy`` processes are generators and cannot be saved, so a
+:class:`Checkpoint` records the state they act on instead: the clock, the
+position in the phase cycle and the signal controller's decisions so far,
+light states, lane queues, the random streams and progress of every
+arrival process, and the statistics collected so far.
+:meth:`Checkpoint.restore` rebuilds the processes from it, each continuing
+with the event it was waiting for.
+
+``simulate(..., checkpoint_path=...)`` saves a checkpoint every
+``checkpoint_every`` simulated seconds, and :func:`resume` continues such
+a run up to its original duration. A resumed run reproduces the rest of
+the uninterrupted run, except that vehicles leaving different lanes at the
+same instant may be recorded in another order.
+"""
+
+from collections.abc import Mapping
+import os
+from pathlib import Path
+import pickle
+from typing import Any
+
+import simpy
+
+from sim.intersection import (
+    ArrivalState,
+    IntersectionSimulation,
+    generate_vehicle_arrivals,
+)
+from sim.models import Direction, SummaryStatistics
+from sim.warmup import truncate_warmup
+
+
+CHECKPOINT_VERSION = 2
+"""Format version; checkpoints of other versions are rejected."""
+
+
+class Checkpoint:
+    """State of a run of :func:`sim.intersection.simulate` at one moment.
+
+    Parameters
+    ----------
+    simulation : IntersectionSimulation
+        The run's simulation, in event mode.
+    arrivals : Mapping[Direction, ArrivalState]
+        State of each direction's arrival process.
+    config : dict[str, Any]
+        ``duration``, ``intersection``, ``rates``, ``start_time``,
+        ``warmup`` and ``controller`` of the run.
+    """
+
+    def __init__(
+        self,
+        simulation: IntersectionSimulation,
+        arrivals: Mapping[Direction, ArrivalState],
+        config: dict[str, Any],
+    ) -> None:
+        """Capture the current state of ``simulation``."""
+
+        self.version = CHECKPOINT_VERSION
+        self.time = simulation.env.now
+        self.config = config
+        self.discharge = simulation.discharge
+        self.collect = (simulation.collect_from, simulation.collect_until)
+        self.phase = (
+            simulation.phase_index,
+            simulation.phase_state,
+            simulation.next_change,
+        )
+        self.lights = {
+            direction: (light.state, light.green_since)
+            for direction, light in simulation.lights.items()
+        }
+        self.lanes = {
+            direction: [
+                (list(lane.queue), lane.departed, lane.last_departure) for lane in lanes
+            ]
+            for direction, lanes in simulation.lanes.items()
+        }
+        self.decisions = (
+            list(simulation.decisions),
+            list(simulation.decision_time),
+        )
+        self.arrivals = dict(arrivals)
+        self.stats = simulation.stats
+        self.departure_times = simulation.departure_times
+
+    def save(self, path: str | Path) -> None:
+        """Write the checkpoint to ``path``, replacing any previous one.
+
+        The file is replaced atomically, so an interrupted save leaves the
+        previous checkpoint intact.
+        """
+
+        path = Path(path)
+        partial = path.with_name(path.name + '.partial')
+        with open(partial, 'wb') as file:
+            pickle.dump(self, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(partial, path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> 'Checkpoint':
+        """Read a checkpoint written by :meth:`save`."""
+
+        with open(path, 'rb') as file:
+            checkpoint = pickle.load(file)
+        if not isinstance(checkpoint, cls):
+            raise ValueError(f'{path} is not a simulation checkpoint')
+        if checkpoint.version != CHECKPOINT_VERSION:
+            raise ValueError(
+                f'Checkpoint version {checkpoint.version} is not supported'
+            )
+        return checkpoint
+
+    def restore(
+        self,
+    ) -> tuple[
+        simpy.Environment, IntersectionSimulation, dict[Direction, ArrivalState]
+    ]:
+        """Rebuild the run in a new environment at the checkpoint's time.
+
+        Returns
+        -------
+        tuple[simpy.Environment, IntersectionSimulation, dict]
+            Environment, simulation and arrival states, with every process
+            scheduled to continue where it left off.
+        """
+
+        env = simpy.Environment(initial_time=self.time)
+        collect_from, collect_until = self.collect
+        simulation = IntersectionSimulation(
+            env,
+            self.config['intersection'],
+            discharge=self.discharge,
+            stats=self.stats,
+            collect_from=collect_from,
+            collect_until=collect_until,
+            controller=self.config['controller'],
+        )
+        simulation.departure_times = self.departure_times
+        simulation.decisions, simulation.decision_time = (
+            list(counts) for counts in self.decisions
+        )
+        (
+            simulation.phase_index,
+            simulation.phase_state,
+            simulation.next_change,
+        ) = self.phase
+        for direction, (state, green_since) in self.lights.items():
+            light = simulation.lights[direction]
+            light.set_state(state, green_since)
+            light.green_since = green_since
+        for direction, lanes in self.lanes.items():
+            for lane, (queue, departed, last_departure) in zip(
+                simulation.lanes[direction], lanes
+            ):
+                lane.queue.extend(queue)
+                lane.light.count_queued(len(queue))
+                lane.departed = departed
+                lane.last_departure = last_departure
+
+        rates = self.config['rates']
+        for direction, state in self.arrivals.items():
+            env.process(
+                generate_vehicle_arrivals(
+                    env, simulation, direction, rates[direction], state=state
+                )
+            )
+        return env, simulation, self.arrivals
+
+
+def run_with_checkpoints(
+    env: simpy.Environment,
+    simulation: IntersectionSimulation,
+    arrivals: Mapping[Direction, ArrivalState],
+    config: dict[str, Any],
+    path: str | Path,
+    every: float,
+) -> None:
+    """Run ``env`` to the end of the run, saving a checkpoint periodically.
+
+    Parameters
+    ----------
+    env : simpy.Environment
+        Environment of ``simulation``.
+    simulation : IntersectionSimulation
+        Simulation to checkpoint.
+    arrivals : Mapping[Direction, ArrivalState]
+        State of each direction's arrival process.
+    config : dict[str, Any]
+        Run configuration, see :class:`Checkpoint`.
+    path : str | Path
+        File receiving the latest checkpoint.
+    every : float
+        Simulated seconds between checkpoints.
+    """
+
+    if every <= 0:
+        raise ValueError('The checkpoint interval must be positive')
+    until = config['duration']
+    moment = env.now + every
+    while moment < until:
+        env.run(until=moment)
+        Checkpoint(simulation, arrivals, config).save(path)
+        moment += every
+    env.run(until=until)
+
+
+def resume(
+    path: str | Path,
+    *,
+    checkpoint_every: float | None = None,
+) -> SummaryStatistics:
+    """Continue a checkpointed run until its original duration.
+
+    Parameters
+    ----------
+    path : str | Path
+        Checkpoint written by ``simulate(..., checkpoint_path=path)``.
+    checkpoint_every : float | None, optional
+        Keep saving checkpoints to ``path`` at this interval.
+
+    Returns
+    -------
+    SummaryStatistics
+        Statistics of the whole run, as :func:`sim.intersection.simulate`
+        would have returned them.
+    """
+
+    checkpoint = Checkpoint.load(path)
+    config = checkpoint.config
+    env, simulation, arrivals = checkpoint.restore()
+    if checkpoint_every is not None:
+        run_with_checkpoints(env, simulation, arrivals, config, path, checkpoint_every)
+    else:
+        env.run(until=config['duration'])
+
+    if config['warmup'] == 'auto':
+        truncate_warmup(
+            simulation.stats, simulation.departure_times, config['start_time']
+        )
+    if config['controller'] is not None:
+        simulation.stats.controller_report = simulation.controller_report()
+    return simulation.stats
@@ -0,0 +1,150 @@
+"""Signal controllers deciding the phase sequence of the event engine.
+
+:class:`~sim.intersection.IntersectionSimulation` asks its controller what
+to do at every phase boundary:
+
+* :meth:`SignalController.green_time` when a phase turns green,
+* :meth:`SignalController.extend` when its green time runs out,
+* :meth:`SignalController.next_phase` when its yellow ends.
+
+Controllers read the state of the run from the simulation they are given,
+in particular the queue counts maintained for every lane, light and phase
+(see :mod:`sim.runtime`), which cost the same however long the queues
+are. They keep no state of their own, so one controller can drive any
+number of runs, also concurrently. The engine measures the wall time of
+every decision and reports it per phase in a
+:class:`~sim.models.ControllerReport`.
+"""
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from sim.intersection import IntersectionSimulation
+
+
+class SignalController:
+    """Fixed-time control: every phase in turn, for its configured times.
+
+    Subclasses override the decisions they change.
+    """
+
+    __slots__ = ()
+
+    def green_time(self, simulation: 'IntersectionSimulation', phase: int) -> float:
+        """Return the green time of ``phase``, which has just turned green."""
+
+        return simulation.runtime.phases[phase].green
+
+    def extend(self, simulation: 'IntersectionSimulation', phase: int) -> float:
+        """Return the seconds to extend the green of ``phase``, or zero.
+
+        Called whenever the green time or the previous extension runs out;
+        the phase turns yellow once this returns zero.
+        """
+
+        return 0.0
+
+    def next_phase(self, simulation: 'IntersectionSimulation', phase: int) -> int:
+        """Return the index of the phase to serve after ``phase``."""
+
+        return (phase + 1) % len(simulation.runtime.phases)
+
+
+class FixedTimeController(SignalController):
+    """Serve the configured phases in order, for their configured times."""
+
+    __slots__ = ()
+
+
+def is_fixed_time(controller: SignalController | None) -> bool:
+    """Return whether ``controller`` runs the configured fixed-time plan.
+
+    ``None`` stands for the default fixed-time control. Subclasses may
+    change any decision, so only the two fixed-time classes themselves
+    count.
+    """
+
+    return controller is None or type(controller) in (
+        SignalController,
+        FixedTimeController,
+    )
+
+
+class ActuatedController(SignalController):
+    """Queue-actuated control with max-pressure phase selection.
+
+    Every green lasts at least ``min_green`` and is extended ``extension``
+    seconds at a time while its phase still has queued vehicles and the
+    highest pressure, up to ``max_green``. The next phase is the one with
+    the highest pressure among the phases with queued vehicles, ties going
+    to the next in cycle order, so phases without demand are skipped. The
+    cycle continues in order while no vehicle waits.
+
+    The pressure of a phase is the number of vehicles queued for its
+    lights minus those queued on the approaches they lead to (see
+    :meth:`~sim.intersection.IntersectionSimulation.downstream_queued`);
+    for an isolated intersection it is the phase's queue.
+
+    Parameters
+    ----------
+    min_green : float, optional
+        Shortest green time in seconds.
+    max_green : float, optional
+        Longest green time in seconds, extensions included.
+    extension : float, optional
+        Seconds added to a green at a time.
+    """
+
+    __slots__ = ('min_green', 'max_green', 'extension')
+
+    def __init__(
+        self,
+        min_green: float = 10.0,
+        max_green: float = 60.0,
+        extension: float = 5.0,
+    ) -> None:
+        """Validate and store the timing limits."""
+
+        if not 0 < min_green <= max_green:
+            raise ValueError('Green times must satisfy 0 < min_green <= max_green')
+        if extension <= 0:
+            raise ValueError('The extension must be positive')
+        self.min_green = min_green
+        self.max_green = max_green
+        self.extension = extension
+
+    def green_time(self, simulation: 'IntersectionSimulation', phase: int) -> float:
+        """Return the minimum green time."""
+
+        return self.min_green
+
+    def extend(self, simulation: 'IntersectionSimulation', phase: int) -> float:
+        """Extend while the phase has the highest pressure and a queue."""
+
+        # Phases without lights, e.g. all-red clearance, never have a queue.
+        if not simulation.phase_queued(phase):
+            return 0.0
+        lights = simulation.runtime.phases[phase].lights
+        remaining = self.max_green - (simulation.env.now - lights[0].green_since)
+        if remaining <= 0:
+            return 0.0
+        pressure = simulation.phase_pressure(phase)
+        for other in range(len(simulation.runtime.phases)):
+            if other != phase and simulation.phase_pressure(other) > pressure:
+                return 0.0
+        return min(self.extension, remaining)
+
+    def next_phase(self, simulation: 'IntersectionSimulation', phase: int) -> int:
+        """Return the phase with queued vehicles and the highest pressure."""
+
+        count = len(simulation.runtime.phases)
+        best = (phase + 1) % count
+        best_pressure = None
+        for step in range(1, count + 1):
+            candidate = (phase + step) % count
+            if not simulation.phase_queued(candidate):
+                continue
+            pressure = simulation.phase_pressure(candidate)
+            if best_pressure is None or pressure > best_pressure:
+                best, best_pressure = candidate, pressure
+        return best
@@ -0,0 +1,316 @@
+"""Arrival rates derived from recorded detector counts.
+
+Detectors report how many vehicles passed during fixed intervals (usually
+15 minutes), often for months. :class:`DetectorProfile` turns such a
+record into one piecewise-constant :class:`~sim.traffic_patterns.RateSchedule`
+per direction, whose segments are the count intervals, and can be passed to
+``simulate(traffic_manager=...)`` in place of a ``TrafficPatternManager``.
+
+Two file formats are read:
+
+* ``.csv`` files with a header containing ``time``, ``direction`` and
+  ``count`` columns, one row per detector and interval; other columns (such
+  as ``lane``) are ignored and counts of the same direction are summed.
+  ``time`` is either seconds since the start of the record or an ISO 8601
+  timestamp, in which case the record starts at midnight of the first
+  timestamp so that simulation time keeps its time of day. The first row
+  decides which, and all rows must follow it. Rows are read in
+  chunks, so the file is never held in memory as Python objects.
+* ``.npy`` arrays of shape ``(intervals, 4)`` or ``(intervals, 4, lanes)``
+  with directions in :class:`Direction` order. They are memory-mapped and
+  summed over lanes a chunk at a time.
+
+Compiled rates are cached on disk under the SHA-256 hash of the file, so
+later runs of the same file skip parsing.
+"""
+
+import csv
+from hashlib import sha256
+import itertools
+import os
+from pathlib import Path
+
+import numpy as np
+
+from sim.models.lights import Direction
+from sim.traffic_patterns import RateSchedule
+
+
+CACHE_VERSION = 1
+"""Bumped whenever the cached representation changes."""
+
+CHUNK_ROWS = 65536
+"""Number of CSV rows or array intervals processed at a time."""
+
+
+def default_cache_dir() -> Path:
+    """Return the directory holding cached profiles.
+
+    ``TRAFFIC_LIGHTS_CACHE`` overrides the default of
+    ``~/.cache/traffic-lights``.
+    """
+
+    override = os.environ.get('TRAFFIC_LIGHTS_CACHE')
+    if override:
+        return Path(override)
+    return Path.home() / '.cache' / 'traffic-lights'
+
+
+def file_digest(path: Path) -> str:
+    """Return the SHA-256 hex digest of the file at ``path``."""
+
+    digest = sha256()
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _accumulate(
+    totals: np.ndarray, size: int, index: np.ndarray, counts: np.ndarray
+) -> tuple[np.ndarray, int]:
+    """Add ``counts`` at flat ``index`` positions of ``totals``.
+
+    ``totals`` grows geometrically; only its first ``size`` entries are in
+    use, and the updated array and size are returned.
+    """
+
+    if len(index) == 0:
+        return totals, size
+    if index.min() < 0:
+        raise ValueError('Detector counts precede the start of the record')
+    size = max(size, int(index.max()) + 1)
+    if size > len(totals):
+        grown = np.zeros(max(size, 2 * len(totals)), dtype=np.float64)
+        grown[: len(totals)] = totals
+        totals = grown
+    totals += np.bincount(index, weights=counts, minlength=len(totals))
+    return totals, size
+
+
+def _time_origin(times: np.ndarray) -> float | np.datetime64:
+    """Return the origin of a record whose first times are ``times``.
+
+    Records in seconds start at ``0.0``, timestamped records at midnight of
+    their first day.
+    """
+
+    try:
+        times[:1].astype(np.float64)
+    except ValueError:
+        return times[:1].astype('datetime64[s]')[0].astype('datetime64[D]')
+    return 0.0
+
+
+def _seconds(times: np.ndarray, origin: float | np.datetime64) -> np.ndarray:
+    """Return ``times`` in seconds since ``origin``.
+
+    Raises ``ValueError`` unless ``times`` have the format of ``origin``,
+    including seconds in a timestamped record, which NumPy would read as
+    years.
+    """
+
+    if not isinstance(origin, np.datetime64):
+        return times.astype(np.float64)
+    if not np.char.endswith(times.astype('U5'), '-').all():
+        raise ValueError('Not a timestamp')
+    return (times.astype('datetime64[s]') - origin).astype(np.float64)
+
+
+def read_csv_counts(path: Path, interval: float) -> np.ndarray:
+    """Return summed counts of shape ``(intervals, 4)`` from a CSV record.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        CSV file in the format described in :mod:`sim.detector_profiles`.
+    interval : float
+        Length of each count interval in seconds.
+
+    Returns
+    -------
+    numpy.ndarray
+        Vehicle counts per interval and direction.
+    """
+
+    codes = {d.value.lower(): code for code, d in enumerate(Direction)}
+    directions = len(Direction)
+    totals, size = np.zeros(0, dtype=np.float64), 0
+    origin = None
+    with open(path, newline='') as handle:
+        reader = csv.reader(handle)
+        header = [name.strip().lower() for name in next(reader)]
+        try:
+            columns = [header.index(name) for name in ('time', 'direction', 'count')]
+        except ValueError:
+            raise ValueError(
+                f'{path} needs "time", "direction" and "count" columns'
+            ) from None
+        time_column, direction_column, count_column = columns
+
+        while chunk := list(itertools.islice(reader, CHUNK_ROWS)):
+            times = np.array([row[time_column] for row in chunk])
+            try:
+                if origin is None:
+                    origin = _time_origin(times)
+                seconds = _seconds(times, origin)
+            except ValueError:
+                raise ValueError(
+                    f'Times in {path} must be all seconds or all timestamps'
+                ) from None
+            try:
+                direction = np.array(
+                    [codes[row[direction_column].strip().lower()] for row in chunk]
+                )
+            except KeyError as error:
+                raise ValueError(
+                    f'Unknown direction {error.args[0]!r} in {path}'
+                ) from None
+            counts = np.array([row[count_column] for row in chunk], dtype=np.float64)
+
+            slots = np.floor(seconds / interval).astype(np.int64)
+            totals, size = _accumulate(
+                totals, size, slots * directions + direction, counts
+            )
+
+    intervals = -(-size // directions)
+    result = np.zeros(intervals * directions)
+    result[:size] = totals[:size]
+    return result.reshape(intervals, directions)
+
+
+def read_npy_counts(path: Path) -> np.ndarray:
+    """Return summed counts of shape ``(intervals, 4)`` from a ``.npy`` array.
+
+    The array is memory-mapped and reduced over lanes in chunks.
+    """
+
+    counts = np.load(path, mmap_mode='r')
+    if counts.ndim not in (2, 3) or counts.shape[1] != len(Direction):
+        raise ValueError(
+            f'{path} must have shape (intervals, {len(Direction)}[, lanes])'
+        )
+    totals = np.empty(counts.shape[:2], dtype=np.float64)
+    for begin in range(0, len(counts), CHUNK_ROWS):
+        block = np.asarray(counts[begin : begin + CHUNK_ROWS], dtype=np.float64)
+        if block.ndim == 3:
+            block = block.sum(axis=2)
+        totals[begin : begin + CHUNK_ROWS] = block
+    return totals
+
+
+class DetectorProfile:
+    """Per-direction arrival rates measured over consecutive intervals.
+
+    Parameters
+    ----------
+    counts : dict[Direction, numpy.ndarray]
+        Vehicles counted in each interval, per direction.
+    interval : float, optional
+        Length of each interval in seconds.
+    """
+
+    def __init__(
+        self, counts: dict[Direction, np.ndarray], interval: float = 900
+    ) -> None:
+        """Create a profile from per-direction counts."""
+
+        if interval <= 0:
+            raise ValueError('interval must be positive')
+        lengths = {len(values) for values in counts.values()}
+        if len(lengths) != 1 or 0 in lengths:
+            raise ValueError(
+                'Every direction needs the same, non-zero number of intervals'
+            )
+        self.counts = {d: np.asarray(v, dtype=np.float64) for d, v in counts.items()}
+        self.interval = float(interval)
+
+    @property
+    def duration(self) -> float:
+        """Return the length of the record in seconds."""
+
+        return len(next(iter(self.counts.values()))) * self.interval
+
+    @classmethod
+    def from_file(
+        cls,
+        path: str | os.PathLike,
+        *,
+        interval: float = 900,
+        cache_dir: str | os.PathLike | None = None,
+        use_cache: bool = True,
+    ) -> 'DetectorProfile':
+        """Load a profile from a ``.csv`` or ``.npy`` count file.
+
+        Parameters
+        ----------
+        path : str | os.PathLike
+            Count file; see :mod:`sim.detector_profiles` for the formats.
+        interval : float, optional
+            Length of each count interval in seconds.
+        cache_dir : str | os.PathLike | None, optional
+            Directory of cached profiles; defaults to
+            :func:`default_cache_dir`.
+        use_cache : bool, optional
+            Read and write the cache. Disable to always parse the file.
+
+        Returns
+        -------
+        DetectorProfile
+            Profile of every direction with at least one count.
+        """
+
+        path = Path(path)
+        cache = None
+        if use_cache:
+            key = f'{file_digest(path)}-{interval:g}-v{CACHE_VERSION}'
+            cache = Path(cache_dir or default_cache_dir()) / f'{key}.npz'
+            if cache.exists():
+                with np.load(cache) as cached:
+                    return cls.from_array(cached['counts'], interval)
+
+        if path.suffix.lower() == '.npy':
+            totals = read_npy_counts(path)
+        elif path.suffix.lower() == '.csv':
+            totals = read_csv_counts(path, interval)
+        else:
+            raise ValueError(f'Unsupported count file: {path}')
+
+        if cache is not None:
+            cache.parent.mkdir(parents=True, exist_ok=True)
+            partial = cache.with_suffix(f'.{os.getpid()}.tmp.npz')
+            np.savez(partial, counts=totals)
+            partial.replace(cache)
+        return cls.from_array(totals, interval)
+
+    @classmethod
+    def from_array(cls, totals: np.ndarray, interval: float = 900) -> 'DetectorProfile':
+        """Create a profile from counts of shape ``(intervals, 4)``.
+
+        Directions whose column is all zero are left out.
+        """
+
+        return cls(
+            {
+                direction: totals[:, code]
+                for code, direction in enumerate(Direction)
+                if totals[:, code].any()
+            },
+            interval,
+        )
+
+    def compile(self) -> dict[Direction, RateSchedule]:
+        """Return each direction's rates as a :class:`RateSchedule`.
+
+        The schedule repeats the whole record, so runs longer than
+        :attr:`duration` wrap around to its start.
+        """
+
+        intervals = len(next(iter(self.counts.values())))
+        breakpoints = np.arange(intervals + 1) * self.interval
+        return {
+            direction: RateSchedule(
+                breakpoints, values / self.interval, period=self.duration
+            )
+            for direction, values in self.counts.items()
+        }
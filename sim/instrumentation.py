@@ -0,0 +1,181 @@
+"""Opt-in instrumentation of the event engine.
+
+``simulate(..., instrument=True)`` runs the simulation with the subclasses
+below instead of :class:`simpy.Environment` and
+:class:`~sim.intersection.IntersectionSimulation`, and attaches the
+resulting :class:`~sim.models.EngineReport` to the returned statistics.
+Uninstrumented runs never import this module; all they pay for it is a
+call of the empty
+:meth:`~sim.intersection.IntersectionSimulation.check_queue` hook per
+queue check.
+"""
+
+from collections.abc import Generator
+import cProfile
+from pathlib import Path
+import time
+from typing import Any
+
+import simpy
+
+from sim.intersection import IntersectionSimulation
+from sim.models import EngineReport, TrafficLightState
+from sim.runtime import LaneRuntime, LightRuntime
+
+
+class InstrumentedEnvironment(simpy.Environment):
+    """``simpy`` environment counting processed events and the peak backlog."""
+
+    def __init__(self, initial_time: float = 0) -> None:
+        """Create the environment starting at ``initial_time``."""
+
+        super().__init__(initial_time)
+        self.steps = 0
+        self.peak_queue = 0
+
+    def step(self) -> None:
+        """Process the next event, updating the counters."""
+
+        size = len(self._queue)
+        if size > self.peak_queue:
+            self.peak_queue = size
+        self.steps += 1
+        super().step()
+
+
+class InstrumentedSimulation(IntersectionSimulation):
+    """Intersection simulation that counts its domain events.
+
+    Queue checks are the wake-ups of lane discharge processes in event mode
+    and the once-per-second checks of waiting vehicles in polling mode.
+    """
+
+    def __init__(self, env, intersection, **kwargs: Any) -> None:
+        """Initialize the counters, then the simulation."""
+
+        self.events = {
+            'light_changes': 0,
+            'arrivals': 0,
+            'departures': 0,
+            'queue_checks': 0,
+        }
+        self.peak_lane_queues: dict[int, int] = {}
+        self.hour_marks: list[float] = []
+        super().__init__(env, intersection, **kwargs)
+        env.process(self.clock())
+
+    def clock(self) -> Generator[Any, Any, None]:
+        """Record the wall-clock time at every simulated hour."""
+
+        while True:
+            yield self.env.timeout(3600)
+            self.hour_marks.append(time.perf_counter())
+
+    def change_lights(
+        self, lights: list[LightRuntime], state: TrafficLightState
+    ) -> None:
+        """Count and apply a light change."""
+
+        self.events['light_changes'] += len(lights)
+        super().change_lights(lights, state)
+
+    def add_vehicle(self, vehicle_id: int, lane: LaneRuntime) -> None:
+        """Count an arrival and track the lane's longest queue."""
+
+        self.events['arrivals'] += 1
+        super().add_vehicle(vehicle_id, lane)
+        self.track_queue(lane)
+
+    def record_departure(self, lane: LaneRuntime) -> None:
+        """Count a departure."""
+
+        self.events['departures'] += 1
+        super().record_departure(lane)
+
+    def track_queue(self, lane: LaneRuntime) -> None:
+        """Update the longest queue seen on ``lane``."""
+
+        length = len(lane.queue)
+        if length > self.peak_lane_queues.get(id(lane), 0):
+            self.peak_lane_queues[id(lane)] = length
+
+    def check_queue(self, lane: LaneRuntime) -> None:
+        """Count a queue check and track the lane's longest queue.
+
+        Polling vehicles join their queue without :meth:`add_vehicle`, so
+        their queues are tracked here.
+        """
+
+        self.events['queue_checks'] += 1
+        self.track_queue(lane)
+
+    def report(self, wall_time: float, profile_path: str | None = None) -> EngineReport:
+        """Return the collected instrumentation.
+
+        Parameters
+        ----------
+        wall_time : float
+            Seconds spent running the environment.
+        profile_path : str | None, optional
+            File holding the run's ``cProfile`` statistics.
+
+        Returns
+        -------
+        EngineReport
+            Counters, peaks and timings of the run.
+        """
+
+        marks = [*self.hour_marks, self.hour_marks[0] + wall_time]
+        peaks = {
+            f'{direction}[{index}]': self.peak_lane_queues.get(id(lane), 0)
+            for direction, lanes in self.lanes.items()
+            for index, lane in enumerate(lanes)
+        }
+        return EngineReport(
+            events=dict(self.events),
+            simpy_events=self.env.steps,
+            peak_event_queue=self.env.peak_queue,
+            peak_lane_queues=peaks,
+            wall_time=wall_time,
+            wall_time_per_hour=[b - a for a, b in zip(marks, marks[1:])],
+            profile_path=profile_path,
+        )
+
+
+def run_instrumented(
+    env: InstrumentedEnvironment,
+    simulation: InstrumentedSimulation,
+    until: float,
+    profile_path: str | Path | None = None,
+) -> EngineReport:
+    """Run ``env`` until ``until`` and return the report of ``simulation``.
+
+    Parameters
+    ----------
+    env : InstrumentedEnvironment
+        Environment of ``simulation``.
+    simulation : InstrumentedSimulation
+        Simulation whose processes are scheduled on ``env``.
+    until : float
+        Simulation time at which to stop.
+    profile_path : str | Path | None, optional
+        Run under ``cProfile`` and dump its statistics to this file.
+
+    Returns
+    -------
+    EngineReport
+        Instrumentation of the run.
+    """
+
+    profiler = cProfile.Profile() if profile_path is not None else None
+    start = time.perf_counter()
+    simulation.hour_marks.insert(0, start)
+    if profiler is not None:
+        profiler.runcall(env.run, until=until)
+        profiler.dump_stats(profile_path)
+    else:
+        env.run(until=until)
+    wall_time = time.perf_counter() - start
+    return simulation.report(
+        wall_time, None if profile_path is None else str(profile_path)
+    )
@@ -1,114 +1,490 @@
 """Simulation engine for traffic light intersections."""
 
-from collections.abc import Generator
-from itertools import cycle
-from typing import Any
-import random
-from datetime import datetime, timedelta
-
-from sim.traffic_patterns import TrafficPatternManager
+from collections.abc import Callable, Generator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from enum import StrEnum
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Literal
+import math
+
+from sim.control import FixedTimeController, SignalController, is_fixed_time
+from sim.seeding import BLOCK_SIZE, ArrivalSampler, SeedLike, direction_streams
+from sim.timeseries import TimeSeriesRecorder
+from sim.trace import TraceWriter
+from sim.traffic_patterns import RateSchedule, RateSource
+from sim.vectorized import simulate_vectorized
+from sim.warmup import truncate_warmup
 
 import simpy
 import numpy as np
 
 from sim.models import (
     Direction,
-    TrafficLight,
     TrafficLightState,
     Intersection,
-    Lane,
     ArrivalRates,
+    ControllerReport,
+    DischargeMode,
     SummaryStatistics,
 )
+from sim.models.metrics import WaitingTimeBuffer
+from sim.runtime import LaneRuntime, LightRuntime, compile_intersection
+
+
+class Engine(StrEnum):
+    """Simulation engines available to :func:`simulate`."""
+
+    SIMPY = 'simpy'
+    """Discrete-event simulation of every light change and vehicle."""
 
-np.random.seed(42)
+    VECTORIZED = 'vectorized'
+    """Array recurrences for fixed-time signals; see :mod:`sim.vectorized`."""
 
 
 class IntersectionSimulation:
-    """Manage the state of an ``Intersection`` in a ``simpy`` environment."""
+    """Manage the state of an ``Intersection`` in a ``simpy`` environment.
 
-    def __init__(self, env, intersection: Intersection) -> None:
-        """Initialize the simulation and start the light cycle."""
+    The intersection is compiled into a :class:`~sim.runtime.IntersectionRuntime`
+    holding the light states and lane queues of this run; the configuration
+    itself is never modified.
+    """
+
+    def __init__(
+        self,
+        env,
+        intersection: Intersection,
+        *,
+        discharge: DischargeMode = DischargeMode.EVENT,
+        stats: SummaryStatistics | None = None,
+        collect_from: float = -math.inf,
+        collect_until: float = math.inf,
+        trace: TraceWriter | None = None,
+        cycle_start: float | None = None,
+        controller: SignalController | None = None,
+    ) -> None:
+        """Initialize the simulation and start the light cycle.
+
+        ``stats`` receives the collected metrics; a fresh
+        :class:`SummaryStatistics` keeping every waiting time is used when
+        omitted. Vehicles arriving before ``collect_from`` are simulated but
+        only counted in ``stats.warmup_vehicles``, and vehicles arriving at
+        or after ``collect_until`` are simulated but not counted. Every
+        departing vehicle, warm-up included, is recorded in ``trace`` when
+        given.
+
+        The first phase turns green at ``cycle_start``, which defaults to
+        the current time. An earlier ``cycle_start`` starts the fixed-time
+        cycle at the phase, light states and remaining time it would have
+        reached by now.
+
+        ``controller`` decides the phase sequence and green times; the
+        configured fixed-time plan is followed when omitted. Only
+        fixed-time control can start from an earlier ``cycle_start``.
+        """
 
         self.env = env
-        self.lights = intersection.lights
-        self.phase_cycle = cycle(intersection.phases)
-        self.lanes = intersection.lanes or {}
-        self.stats = SummaryStatistics()
+        self.runtime = compile_intersection(intersection, env.now)
+        self.lights = self.runtime.lights
+        self.lanes = self.runtime.lanes
+        self.discharge = discharge = DischargeMode(discharge)
+        self.stats = stats if stats is not None else SummaryStatistics()
+        self.collect_from = collect_from
+        self.collect_until = collect_until
+        self.controller = (
+            controller if controller is not None else FixedTimeController()
+        )
+        # Controller calls and the seconds they took, by phase.
+        self.decisions = [0] * len(self.runtime.phases)
+        self.decision_time = [0.0] * len(self.runtime.phases)
+        # Position in the phase cycle: the current phase, the state of its
+        # lights and when they next change (``None`` until the cycle starts).
+        self.phase_index = 0
+        self.phase_state = TrafficLightState.GREEN
+        self.next_change: float | None = None
+        if cycle_start is not None and cycle_start < env.now:
+            if not is_fixed_time(self.controller):
+                raise ValueError('Only fixed-time control can seek the cycle')
+            self.seek_cycle(cycle_start)
+        self.trace = trace
+        # Departure time of every recorded vehicle, kept only when needed to
+        # locate an automatically detected warm-up period.
+        self.departure_times: WaitingTimeBuffer | None = None
+
+        if discharge is DischargeMode.POLLING and any(
+            lane.saturation_headway is not None
+            for lanes in self.lanes.values()
+            for lane in lanes
+        ):
+            raise ValueError('Saturation headways require DischargeMode.EVENT')
+
+        if discharge is DischargeMode.EVENT:
+            for lanes in self.lanes.values():
+                for lane in lanes:
+                    env.process(self.discharge_lane(lane))
 
         env.process(self.run())
 
-    def change_lights(self, lights: list[TrafficLight], state: TrafficLightState) -> None:
+    def change_lights(
+        self, lights: list[LightRuntime], state: TrafficLightState
+    ) -> None:
         """Set ``state`` on all traffic ``lights``."""
 
+        now = self.env.now
         for light in lights:
-            self.lights[light.source].state = state
+            light.set_state(state, now)
+            if light.green:
+                for lane in light.lanes:
+                    self.wake_lane(lane)
+
+    def seek_cycle(self, cycle_start: float) -> None:
+        """Position the phase cycle as if it had started at ``cycle_start``.
+
+        Lights of the current phase are green or yellow and lights of
+        phases already served are red; the others keep their configured
+        state until their phase first comes around.
+        """
+
+        phases = self.runtime.phases
+        now = self.env.now
+        length = sum(phase.green + phase.yellow for phase in phases)
+        elapsed = now - cycle_start
+        offset = cycle_start + length * math.floor(elapsed / length)
+        served = elapsed >= length
+        for index, phase in enumerate(phases):
+            end = offset + phase.green + phase.yellow
+            if now < end:
+                break
+            served = True
+            for light in phase.lights:
+                light.set_state(TrafficLightState.RED, offset)
+            offset = end
+
+        self.phase_index = index
+        if now < offset + phase.green:
+            self.phase_state = TrafficLightState.GREEN
+            self.next_change = offset + phase.green
+        else:
+            self.phase_state = TrafficLightState.YELLOW
+            self.next_change = end
+        for light in phase.lights:
+            light.set_state(self.phase_state, offset)
+        if served:
+            for other in phases[index + 1 :]:
+                for light in other.lights:
+                    light.set_state(TrafficLightState.RED, offset)
 
     def run(self) -> Generator[Any, Any, None]:
-        """Iterate through the configured phases indefinitely."""
-
-        while True:
-            next_phase = next(self.phase_cycle)
-            lights = next_phase.lights
+        """Serve the phases chosen by the controller indefinitely.
 
-            self.change_lights(lights, TrafficLightState.GREEN)
-            yield self.env.timeout(next_phase.cycle_time.green)
+        The cycle continues from :attr:`next_change` when it is already
+        positioned, e.g. by :meth:`seek_cycle` or a restored checkpoint.
+        """
 
-            self.change_lights(lights, TrafficLightState.YELLOW)
-            yield self.env.timeout(next_phase.cycle_time.yellow)
+        env = self.env
+        phases = self.runtime.phases
+        if self.next_change is None:
+            delay = self.start_phase()
+        else:
+            delay = max(self.next_change - env.now, 0.0)
 
-            self.change_lights(lights, TrafficLightState.RED)
+        while True:
+            yield env.timeout(delay)
+            phase = phases[self.phase_index]
+            if self.phase_state is TrafficLightState.GREEN:
+                delay = self.decide(self.controller.extend)
+                if delay <= 0:
+                    self.phase_state = TrafficLightState.YELLOW
+                    self.change_lights(phase.lights, TrafficLightState.YELLOW)
+                    delay = phase.yellow
+                self.next_change = env.now + delay
+            else:
+                self.change_lights(phase.lights, TrafficLightState.RED)
+                self.phase_index = self.decide(self.controller.next_phase)
+                delay = self.start_phase()
+
+    def start_phase(self) -> float:
+        """Turn the lights of the current phase green and return its green time."""
+
+        phase = self.runtime.phases[self.phase_index]
+        self.phase_state = TrafficLightState.GREEN
+        self.change_lights(phase.lights, TrafficLightState.GREEN)
+        green = self.decide(self.controller.green_time)
+        self.next_change = self.env.now + green
+        return green
+
+    def decide(self, decision: Callable[['IntersectionSimulation', int], Any]) -> Any:
+        """Return ``decision`` for the current phase, timing the call."""
+
+        phase = self.phase_index
+        start = perf_counter()
+        result = decision(self, phase)
+        self.decision_time[phase] += perf_counter() - start
+        self.decisions[phase] += 1
+        return result
+
+    def controller_report(self) -> ControllerReport:
+        """Return the controller's decisions so far and their cost."""
+
+        return ControllerReport(
+            controller=type(self.controller).__name__,
+            decisions=list(self.decisions),
+            decision_time=list(self.decision_time),
+        )
+
+    def phase_queued(self, index: int) -> int:
+        """Return the number of vehicles queued for the lights of a phase."""
+
+        return self.runtime.phases[index].queued
+
+    def downstream_queued(self, light: LightRuntime) -> int:
+        """Return the vehicles queued where ``light`` leads, if known.
+
+        An isolated intersection knows nothing beyond its exits; see
+        :class:`~sim.network.NetworkIntersection`.
+        """
+
+        return 0
+
+    def phase_pressure(self, index: int) -> int:
+        """Return the vehicles a phase would serve less those queued beyond."""
+
+        return sum(
+            light.queued - self.downstream_queued(light)
+            for light in self.runtime.phases[index].lights
+        )
+
+    def add_vehicle(self, vehicle_id: int, lane: LaneRuntime) -> None:
+        """Place a newly arrived vehicle into ``lane``."""
+
+        if self.discharge is DischargeMode.POLLING:
+            self.env.process(self.vehicle_arrival(vehicle_id, lane))
+            return
+
+        self.count_arrival()
+        lane.queue.append((vehicle_id, self.env.now))
+        lane.light.count_queued(1)
+        if len(lane.queue) == 1:
+            self.wake_lane(lane)
+
+    def count_arrival(self) -> None:
+        """Count a vehicle arriving now, unless still warming up."""
+
+        now = self.env.now
+        if now < self.collect_from:
+            self.stats.warmup_vehicles += 1
+        elif now < self.collect_until:
+            self.stats.total_vehicles += 1
+
+    def record_departure(self, lane: LaneRuntime) -> None:
+        """Remove the head vehicle of ``lane`` and record its waiting time."""
+
+        vehicle_id, arrival_time = lane.queue.popleft()
+        lane.light.count_queued(-1)
+        lane.departed += 1
+        lane.last_departure = self.env.now
+        if self.collect_from <= arrival_time < self.collect_until:
+            self.stats.waiting_times.add(self.env.now - arrival_time)
+            if self.departure_times is not None:
+                self.departure_times.add(self.env.now)
+        if self.trace is not None:
+            self.trace.record(vehicle_id, lane, arrival_time, self.env.now)
+
+    def trace_queued(self) -> None:
+        """Record the vehicles still queued in ``trace`` as not departed."""
+
+        for lanes in self.lanes.values():
+            for lane in lanes:
+                for vehicle_id, arrival_time in lane.queue:
+                    self.trace.record(vehicle_id, lane, arrival_time, math.inf)
+
+    def wake_lane(self, lane: LaneRuntime) -> None:
+        """Resume the discharge process of ``lane`` if it is idle."""
+
+        wakeup = lane.wakeup
+        if wakeup is not None:
+            lane.wakeup = None
+            wakeup.succeed()
+
+    def check_queue(self, lane: LaneRuntime) -> None:
+        """Hook called whenever the queue of ``lane`` is checked; does nothing.
+
+        Checks are the wake-ups of a lane's discharge process in event mode
+        and the checks of a waiting vehicle's light in polling mode.
+        """
+
+    def departure_time(self, lane: LaneRuntime, last_departure: float) -> float:
+        """Return the earliest time the head vehicle of ``lane`` may leave.
+
+        Parameters
+        ----------
+        lane : LaneRuntime
+            A lane with at least one queued vehicle and a green light.
+        last_departure : float
+            Time the previous vehicle left ``lane``.
+
+        Returns
+        -------
+        float
+            Departure time of the head vehicle, assuming the light stays
+            green until then.
+        """
+
+        if lane.saturation_headway is None:
+            # React on a one-second grid from arrival, like polling vehicles.
+            _, arrival_time = lane.queue[0]
+            return arrival_time + math.ceil(self.env.now - arrival_time)
+
+        return max(
+            self.env.now,
+            lane.light.green_since + lane.startup_lost_time,
+            last_departure + lane.saturation_headway,
+        )
+
+    def discharge_lane(self, lane: LaneRuntime) -> Generator[Any, Any, None]:
+        """Release vehicles from ``lane`` while its light is green.
+
+        Without a saturation headway the head vehicle leaves at the first
+        whole number of seconds after its arrival at which the light is
+        green, which reproduces the departures of
+        :attr:`DischargeMode.POLLING` without waking once per second. The
+        process sleeps whenever the lane is empty or red.
+        """
+
+        env = self.env
+        light = lane.light
+        queue = lane.queue
+        while True:
+            if not queue or not light.green:
+                lane.wakeup = env.event()
+                yield lane.wakeup
+                self.check_queue(lane)
+                continue
+
+            departure_time = self.departure_time(lane, lane.last_departure)
+            if departure_time > env.now:
+                yield env.timeout(departure_time - env.now)
+                self.check_queue(lane)
+                if not light.green:
+                    continue
+                if (
+                    lane.saturation_headway is not None
+                    and env.now < light.green_since + lane.startup_lost_time
+                ):
+                    # The light went red and green again while waiting, so
+                    # the start-up lost time starts over.
+                    continue
+
+            self.record_departure(lane)
 
     def vehicle_arrival(
         self,
         vehicle_id: int,
-        lane: Lane,
+        lane: LaneRuntime,
     ) -> Generator[Any, Any, None]:
-        """Process a single vehicle through ``lane``."""
+        """Process a single vehicle through ``lane`` by polling its light."""
 
         arrival_time = self.env.now
-        self.stats.total_vehicles += 1
+        self.count_arrival()
         lane.queue.append((vehicle_id, arrival_time))
+        lane.light.count_queued(1)
         while True:
-            if (
-                lane.light.state == TrafficLightState.GREEN
-                and lane.queue[0][0] == vehicle_id
-            ):
-                waiting_time = self.env.now - arrival_time
-                self.stats.waiting_times = np.append(
-                    self.stats.waiting_times, waiting_time
-                )
-                lane.queue.pop(0)
+            self.check_queue(lane)
+            if lane.light.green and lane.queue[0][0] == vehicle_id:
+                self.record_departure(lane)
                 break
             yield self.env.timeout(1)
 
 
+class ArrivalState:
+    """Progress of one direction's arrival process.
+
+    Kept outside the process generator so that a run can be checkpointed
+    and resumed (see :mod:`sim.checkpoint`).
+    """
+
+    __slots__ = ('sampler', 'vehicle_id', 'next_arrival', 'level', 'pending')
+
+    def __init__(self, sampler: ArrivalSampler) -> None:
+        """Start a process drawing from ``sampler``."""
+
+        self.sampler = sampler
+        # Id of the last vehicle that arrived.
+        self.vehicle_id = 0
+        # Time of the arrival being waited for, if any.
+        self.next_arrival: float | None = None
+        # With a rate schedule: the cumulative intensity reached by the
+        # drawn arrivals and the remaining ones, latest first.
+        self.level: float | None = None
+        self.pending: list[float] = []
+
+
 def generate_vehicle_arrivals(
     env,
     intersection_sim: IntersectionSimulation,
     direction: Direction,
-    rate: float,
-    traffic_manager: 'TrafficPatternManager | None' = None,
+    rate: float | RateSchedule,
+    traffic_manager: RateSource | None = None,
+    *,
+    rng: np.random.Generator | None = None,
+    lane_rng: np.random.Generator | None = None,
+    block_size: int = BLOCK_SIZE,
+    state: ArrivalState | None = None,
 ):
-    """Yield vehicle arrival events according to ``rate`` or a manager."""
+    """Yield vehicle arrival events according to ``rate`` or a manager.
+
+    A constant ``rate`` gives a Poisson process. A :class:`RateSchedule`,
+    or the direction's schedule compiled from ``traffic_manager``, gives a
+    non-homogeneous Poisson process whose arrivals follow rate changes
+    exactly, even within a gap.
+
+    Inter-arrival gaps are drawn from ``rng`` and lanes are chosen with
+    ``lane_rng``, both in blocks of ``block_size`` (see
+    :class:`~sim.seeding.ArrivalSampler`); fresh unseeded generators are
+    used when omitted. Alternatively, ``state`` continues a process from
+    where it was checkpointed, and is kept up to date as the process runs.
+    """
 
-    vehicle_id = 0
+    if traffic_manager is not None:
+        rate = traffic_manager.compile()[direction]
+    lanes = intersection_sim.lanes[direction]
+    if state is None:
+        rng = rng if rng is not None else np.random.default_rng()
+        lane_rng = lane_rng if lane_rng is not None else np.random.default_rng()
+        state = ArrivalState(ArrivalSampler(rng, lane_rng, len(lanes), block_size))
+    sampler = state.sampler
+
+    if state.next_arrival is not None:
+        # Resumed while waiting for this arrival.
+        yield env.timeout(max(state.next_arrival - env.now, 0.0))
+        state.vehicle_id += 1
+        intersection_sim.add_vehicle(state.vehicle_id, lanes[sampler.lane()])
+
+    if not isinstance(rate, RateSchedule):
+        while True:
+            gap = sampler.gap(rate)
+            state.next_arrival = env.now + gap
+            yield env.timeout(gap)
+            state.vehicle_id += 1
+            intersection_sim.add_vehicle(state.vehicle_id, lanes[sampler.lane()])
+
+    if state.level is None:
+        state.level = float(rate.cumulative(env.now))
+    pending = state.pending
     while True:
-        current_rate = rate
-        if traffic_manager is not None:
-            seconds = int(env.now) % (24 * 60 * 60)
-            current_time = (datetime.min + timedelta(seconds=seconds)).time()
-            current_rate = traffic_manager.get_arrival_rates(current_time)[direction]
-
-        # ``numpy.random.exponential`` expects a scale of ``1/lambda``.
-        yield env.timeout(np.random.exponential(1 / current_rate))
-        vehicle_id += 1
-        lanes = intersection_sim.lanes.get(direction)
-        if lanes:
-            lane = random.choice(lanes)
-        else:
-            lane = Lane(light=intersection_sim.lights[direction])
-        env.process(intersection_sim.vehicle_arrival(vehicle_id, lane))
+        if not pending:
+            levels = np.cumsum(np.concatenate(([state.level], sampler.gap_block())))
+            state.level = levels[-1]
+            # Reversed so that ``pop`` returns the arrivals in order.
+            pending.extend(rate.inverse(levels[1:]).tolist()[::-1])
+        arrival = pending.pop()
+        if math.isinf(arrival):
+            state.next_arrival = None
+            return
+        state.next_arrival = arrival
+        yield env.timeout(max(arrival - env.now, 0.0))
+        state.vehicle_id += 1
+        intersection_sim.add_vehicle(state.vehicle_id, lanes[sampler.lane()])
 
 
 def simulate(
@@ -116,8 +492,21 @@ def simulate(
     intersection: Intersection,
     arrival_rates: ArrivalRates | None = None,
     *,
-    traffic_manager: 'TrafficPatternManager | None' = None,
+    traffic_manager: RateSource | None = None,
     start_time: int = 0,
+    discharge: DischargeMode = DischargeMode.EVENT,
+    streaming: bool = False,
+    seed: SeedLike = None,
+    warmup: float | Literal['auto'] | None = None,
+    engine: Engine = Engine.SIMPY,
+    block_size: int = BLOCK_SIZE,
+    instrument: bool = False,
+    profile_path: str | Path | None = None,
+    sample_interval: float | None = None,
+    trace_path: str | Path | None = None,
+    checkpoint_path: str | Path | None = None,
+    checkpoint_every: float = 3600.0,
+    controller: SignalController | None = None,
 ) -> SummaryStatistics:
     """Run a complete intersection simulation.
 
@@ -130,10 +519,77 @@ def simulate(
     arrival_rates : ArrivalRates | None, optional
         Constant per-direction arrival rates. Ignored when
         ``traffic_manager`` is provided.
-    traffic_manager : TrafficPatternManager | None, optional
-        Manager used to update arrival rates dynamically.
+    traffic_manager : RateSource | None, optional
+        Source of time-varying arrival rates, such as a
+        ``TrafficPatternManager`` or a
+        :class:`~sim.detector_profiles.DetectorProfile`. It is compiled into
+        a :class:`RateSchedule` per direction, and arrivals are sampled
+        exactly from the resulting non-homogeneous Poisson process.
     start_time : int, optional
         Initial simulation time in seconds.
+    discharge : DischargeMode, optional
+        How queued vehicles are released onto green lights. Both modes
+        produce identical results for the same random stream;
+        ``DischargeMode.EVENT`` avoids one wake-up per queued vehicle per
+        second.
+    streaming : bool, optional
+        Summarize waiting times in constant memory with
+        :meth:`SummaryStatistics.streaming` instead of keeping each one.
+        The median becomes an approximation.
+    seed : SeedLike, optional
+        Seed for the run's random streams. Every direction draws its
+        arrivals and lane choices from its own substream, so runs with the
+        same seed are reproducible regardless of what else executes in the
+        process. ``None`` uses fresh OS entropy.
+    warmup : float | Literal['auto'] | None, optional
+        Initial transient to exclude from the statistics. A number is a
+        warm-up length in seconds after ``start_time``: vehicles arriving
+        earlier are simulated but not recorded. ``'auto'`` runs the whole
+        horizon and then discards the leading departures selected by MSER-5
+        (see :func:`sim.warmup.mser_truncation`); it needs every waiting
+        time and therefore cannot be combined with ``streaming``. The
+        truncation point is reported in ``warmup_time`` and
+        ``warmup_vehicles`` of the returned statistics.
+    engine : Engine, optional
+        ``Engine.VECTORIZED`` computes the same results as the default
+        event engine with NumPy array operations, which is much faster for
+        long runs.
+    block_size : int, optional
+        Number of gaps and lane choices pre-sampled at a time. Results are
+        reproducible for a given ``seed`` and ``block_size``.
+    instrument : bool, optional
+        Count engine events, peak queue sizes and wall time per simulated
+        hour (see :mod:`sim.instrumentation`) and attach them to the
+        result as ``engine_report``. Only the ``simpy`` engine can be
+        instrumented; runs without instrumentation are unaffected.
+    profile_path : str | Path | None, optional
+        Also run under ``cProfile`` and dump its statistics to this file.
+        Implies ``instrument``.
+    sample_interval : float | None, optional
+        Record each lane's queue length, light state and departures every
+        this many seconds into a :class:`~sim.models.TimeSeries`, attached
+        to the result as ``timeseries`` (see :mod:`sim.timeseries`). Only
+        the ``simpy`` engine can be sampled.
+    trace_path : str | Path | None, optional
+        Write the id, direction, lane, arrival and departure time of every
+        vehicle to this file as it leaves, in the binary format of
+        :mod:`sim.trace`; read it back with :func:`sim.trace.read_trace`.
+    checkpoint_path : str | Path | None, optional
+        Save the complete state of the run to this file every
+        ``checkpoint_every`` simulated seconds, so that an interrupted run
+        can be continued with :func:`sim.checkpoint.resume`. Requires the
+        ``simpy`` engine in event mode, without instrumentation, sampling
+        or tracing.
+    checkpoint_every : float, optional
+        Simulated seconds between checkpoints.
+    controller : SignalController | None, optional
+        Signal controller deciding the phase sequence and green times, such
+        as an :class:`~sim.control.ActuatedController`. Its decisions and
+        their wall time are attached to the result as
+        ``controller_report``. The vectorized engine only runs fixed-time
+        control: it accepts ``None`` or a
+        :class:`~sim.control.FixedTimeController`, makes no decisions and
+        attaches no report.
 
     Returns
     -------
@@ -141,30 +597,178 @@ def simulate(
         Collected simulation statistics.
     """
 
-    env = simpy.Environment(initial_time=start_time)
-
-    intersection_sim = IntersectionSimulation(env, intersection)
-
+    rates: dict[Direction, float | RateSchedule]
     if traffic_manager is not None:
-        base_rates = traffic_manager.base_rates
-        for direction, rate in base_rates.items():
-            env.process(
-                generate_vehicle_arrivals(
-                    env,
-                    intersection_sim,
-                    direction,
-                    rate,
-                    traffic_manager,
-                )
-            )
+        rates = dict(traffic_manager.compile())
     elif arrival_rates is not None:
-        for direction, rate in arrival_rates.items():
-            env.process(
-                generate_vehicle_arrivals(env, intersection_sim, direction, rate)
-            )
+        rates = dict(arrival_rates)
     else:
         raise ValueError('Either arrival_rates or traffic_manager must be provided')
 
-    env.run(until=duration)
+    instrument = instrument or profile_path is not None
+    if engine == Engine.VECTORIZED:
+        if instrument:
+            raise ValueError('Instrumentation requires the simpy engine')
+        if sample_interval is not None:
+            raise ValueError('Time series sampling requires the simpy engine')
+        if not is_fixed_time(controller):
+            raise ValueError('Adaptive signal controllers require the simpy engine')
+        return simulate_vectorized(
+            duration,
+            intersection,
+            rates,
+            start_time=start_time,
+            streaming=streaming,
+            seed=seed,
+            warmup=warmup,
+            block_size=block_size,
+            trace_path=trace_path,
+        )
+
+    if warmup == 'auto' and streaming:
+        raise ValueError('Automatic warm-up detection requires streaming=False')
+    if checkpoint_path is not None and (
+        instrument
+        or sample_interval is not None
+        or trace_path is not None
+        or DischargeMode(discharge) is not DischargeMode.EVENT
+    ):
+        raise ValueError(
+            'Checkpoints require DischargeMode.EVENT without instrumentation, '
+            'sampling or tracing'
+        )
+    fixed_warmup = warmup is not None and warmup != 'auto'
+
+    environment_class, simulation_class = simpy.Environment, IntersectionSimulation
+    if instrument:
+        from sim.instrumentation import InstrumentedEnvironment, InstrumentedSimulation
+
+        environment_class = InstrumentedEnvironment
+        simulation_class = InstrumentedSimulation
+
+    env = environment_class(initial_time=start_time)
+    stats = SummaryStatistics.streaming() if streaming else SummaryStatistics()
+    trace = TraceWriter(trace_path) if trace_path is not None else None
+    intersection_sim = simulation_class(
+        env,
+        intersection,
+        discharge=discharge,
+        stats=stats,
+        collect_from=start_time + warmup if fixed_warmup else -math.inf,
+        trace=trace,
+        controller=controller,
+    )
+    if fixed_warmup:
+        stats.warmup_time = warmup
+    elif warmup == 'auto':
+        intersection_sim.departure_times = WaitingTimeBuffer()
+
+    streams = direction_streams(seed)
+    arrivals = {}
+    for direction, rate in rates.items():
+        lanes = len(intersection_sim.lanes[direction])
+        state = ArrivalState(ArrivalSampler(*streams[direction], lanes, block_size))
+        arrivals[direction] = state
+        env.process(
+            generate_vehicle_arrivals(
+                env, intersection_sim, direction, rate, state=state
+            )
+        )
+
+    recorder = None
+    if sample_interval is not None:
+        recorder = TimeSeriesRecorder(
+            intersection_sim.lanes, start_time, duration, sample_interval
+        )
+        env.process(recorder.run(env))
+
+    try:
+        if instrument:
+            from sim.instrumentation import run_instrumented
+
+            stats.engine_report = run_instrumented(
+                env, intersection_sim, duration, profile_path
+            )
+        elif checkpoint_path is not None:
+            from sim.checkpoint import run_with_checkpoints
+
+            config = {
+                'duration': duration,
+                'intersection': intersection,
+                'rates': rates,
+                'start_time': start_time,
+                'warmup': warmup,
+                'controller': controller,
+            }
+            run_with_checkpoints(
+                env,
+                intersection_sim,
+                arrivals,
+                config,
+                checkpoint_path,
+                checkpoint_every,
+            )
+        else:
+            env.run(until=duration)
+        if trace is not None:
+            intersection_sim.trace_queued()
+    finally:
+        if trace is not None:
+            trace.close()
+
+    if warmup == 'auto':
+        truncate_warmup(stats, intersection_sim.departure_times, start_time)
+    if recorder is not None:
+        stats.timeseries = recorder.result()
+    if controller is not None:
+        stats.controller_report = intersection_sim.controller_report()
 
     return intersection_sim.stats
+
+
+def simulate_many(
+    duration: int,
+    intersection: Intersection,
+    arrival_rates: ArrivalRates | None = None,
+    *,
+    seeds: Sequence[SeedLike],
+    workers: int | None = None,
+    **simulate_kwargs: Any,
+) -> list[SummaryStatistics]:
+    """Run one simulation per seed on a thread pool.
+
+    Runs share ``intersection`` as a read-only template and keep all of
+    their state to themselves, so they can execute concurrently. Threads
+    suit free-threaded CPython builds and callers that cannot spawn
+    processes, such as an async service offloading runs with
+    ``loop.run_in_executor``; for CPU-bound batches on a standard build,
+    :func:`sim.replications.simulate_replications` uses processes instead.
+
+    Parameters
+    ----------
+    duration : int
+        Length of each run in seconds.
+    intersection : Intersection
+        Intersection configuration shared by all runs.
+    arrival_rates : ArrivalRates | None, optional
+        Constant per-direction arrival rates, as for :func:`simulate`.
+    seeds : Sequence[SeedLike]
+        Seed of each run.
+    workers : int | None, optional
+        Number of threads; ``ThreadPoolExecutor``'s default when ``None``.
+    **simulate_kwargs
+        Further keyword arguments forwarded to :func:`simulate`.
+
+    Returns
+    -------
+    list[SummaryStatistics]
+        Statistics of each run, in the order of ``seeds``.
+    """
+
+    def run(seed: SeedLike) -> SummaryStatistics:
+        return simulate(
+            duration, intersection, arrival_rates, seed=seed, **simulate_kwargs
+        )
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(run, seeds))
@@ -0,0 +1,330 @@
+"""Mesoscopic cell-transmission model of intersection networks.
+
+:func:`simulate_mesoscopic` treats traffic as a fluid. Every lane of every
+intersection is one cell holding a queue, and time advances in fixed
+steps. In each step a lane receives its share of the approach's boundary
+arrivals (the expected count under the arrival rate schedule) and of the
+flow entering the approach from upstream links. It then discharges up to
+its capacity: ``step / saturation_headway`` vehicles while its light is
+green, after the start-up lost time, or the whole queue when the lane has
+no saturation headway. Flow leaving a lane travels along the link from its
+exit and reaches the next intersection ``travel_time`` later. Flow leaving
+through an exit without a link leaves the network.
+
+All lanes of all intersections are stored in flat NumPy arrays and
+advanced together. Link travel times are at least a block of steps, so
+each block's inflows and the capacities of its steps are computed at once
+before it starts. The queues then advance one step at a time, all lanes
+together: each step adds the step's inflow, discharges the smaller of the
+queue and the capacity, and subtracts the discharge, three in-place ufunc
+calls on the lane arrays.
+
+Waiting times are estimated as the time integral of the queues, so the
+results are deterministic expected values. They are meant for screening
+signal timings before simulating the promising ones vehicle by vehicle.
+"""
+
+from collections.abc import Mapping
+import math
+
+import numpy as np
+
+from sim.models import (
+    Direction,
+    IntersectionNetwork,
+    Lane,
+    MesoscopicStatistics,
+)
+from sim.traffic_patterns import DAY, RateSchedule, RateSource
+from sim.vectorized import cycle_greens
+
+
+MAX_BLOCK = 64
+"""Largest number of steps whose inflows and capacities are computed at once."""
+
+
+def _group_sums(values: np.ndarray, groups: np.ndarray, size: int) -> np.ndarray:
+    """Sum the columns of ``values`` into ``size`` columns by ``groups``."""
+
+    rows = len(values)
+    index = (np.arange(rows)[:, None] * size + groups).ravel()
+    return np.bincount(index, weights=values.ravel(), minlength=rows * size).reshape(
+        rows, size
+    )
+
+
+def _green_time(
+    windows: np.ndarray, times: np.ndarray, step: float, lanes: int
+) -> np.ndarray:
+    """Return the green seconds of each lane in the steps starting at ``times``.
+
+    ``windows`` holds the lane, start, end and cycle length of every green
+    within a cycle, and ``times`` are measured from the start of the cycle.
+    A step crossing the end of a cycle also counts greens of the next one.
+    """
+
+    lane, start, end, cycle = windows.T
+    phase = np.mod(times[:, None], cycle)
+    green = np.zeros((len(times), len(windows)))
+    for shift in (0.0, cycle):
+        overlap = np.minimum(phase + step, end + shift) - np.maximum(
+            phase, start + shift
+        )
+        green += np.maximum(overlap, 0.0)
+    return _group_sums(green, lane.astype(np.intp), lanes)
+
+
+def simulate_mesoscopic(
+    duration: float,
+    network: IntersectionNetwork,
+    *,
+    traffic_managers: Mapping[str, RateSource] | None = None,
+    start_time: float = 0,
+    step: float = 1.0,
+) -> MesoscopicStatistics:
+    """Estimate the delays of a network with a cell-transmission model.
+
+    Parameters
+    ----------
+    duration : float
+        Time in seconds at which the run stops, rounded up to a whole
+        number of steps.
+    network : IntersectionNetwork
+        Intersections, links and boundary arrival rates to simulate. Each
+        intersection's phases cycle from ``start_time``, as in the other
+        engines.
+    traffic_managers : Mapping[str, RateSource] | None, optional
+        Time-varying arrival rates of some intersections, such as a
+        :class:`~sim.traffic_patterns.TrafficPatternManager`. They replace
+        the intersection's entry in ``network.arrival_rates``, and all
+        schedules must repeat with the same period.
+    start_time : float, optional
+        Initial simulation time in seconds.
+    step : float, optional
+        Length of a time step in seconds; it must not exceed any cycle.
+        Green, yellow and travel times are best whole numbers of steps:
+        a lane without a saturation headway releases its whole queue in
+        any step with some green, and travel times are rounded to steps.
+
+    Returns
+    -------
+    MesoscopicStatistics
+        Expected arrivals, departures and waiting time of every
+        intersection.
+    """
+
+    if duration <= start_time or math.isinf(duration):
+        raise ValueError('duration must be a finite time after start_time')
+    if step <= 0:
+        raise ValueError('step must be positive')
+    traffic_managers = traffic_managers or {}
+
+    names = list(network.intersections)
+    lane_node, lane_flow, lane_cycle = [], [], []
+    windows = []  # (lane, start, end, cycle) of every effective green.
+    approaches: dict[tuple[str, Direction], list[int]] = {}
+    exits = []
+    schedules: dict[tuple[str, Direction], RateSchedule] = {}
+    constants: dict[tuple[str, Direction], float] = {}
+    for node, name in enumerate(names):
+        intersection = network.intersections[name]
+        if name in traffic_managers:
+            rates = traffic_managers[name].compile()
+        else:
+            rates = network.arrival_rates.get(name, {})
+        configured = intersection.lanes or {}
+        for direction, light in intersection.lights.items():
+            cycle, offsets, lengths = cycle_greens(intersection, direction)
+            if step > cycle:
+                raise ValueError('step must not exceed any signal cycle')
+            lanes = approaches[name, direction] = []
+            for lane in configured.get(direction) or [Lane(light=light)]:
+                index = len(lane_node)
+                lanes.append(index)
+                lane_node.append(node)
+                lane_cycle.append(cycle)
+                # Lanes without a saturation headway release their whole
+                # queue in any step with some green.
+                headway = lane.saturation_headway
+                lane_flow.append(math.inf if headway is None else 1 / headway)
+                for offset, length in zip(offsets, lengths):
+                    begin = offset + lane.startup_lost_time
+                    if begin < offset + length:
+                        windows.append((index, begin, offset + length, cycle))
+                exits.append((name, intersection.lights[lane.source].destination))
+            rate = rates.get(direction, 0.0)
+            if isinstance(rate, RateSchedule) and rate.period_intensity > 0:
+                schedules[name, direction] = rate
+            elif not isinstance(rate, RateSchedule) and rate > 0:
+                constants[name, direction] = rate
+
+    count = len(lane_node)
+    lane_node = np.array(lane_node)
+    lane_flow = np.array(lane_flow)
+    lane_cycle = np.array(lane_cycle)
+    windows = np.array(windows).reshape(-1, 4)
+
+    # Capacity of every lane in each step of its cycle, one table per cycle
+    # length that is a whole number of steps. Other lanes are computed for
+    # every block.
+    tables = []
+    exact = np.zeros(count, dtype=bool)
+    for cycle in np.unique(lane_cycle):
+        period_steps = round(cycle / step)
+        if not math.isclose(period_steps * step, cycle):
+            continue
+        lanes = np.flatnonzero(lane_cycle == cycle)
+        exact[lanes] = True
+        position = np.full(count, -1)
+        position[lanes] = np.arange(len(lanes))
+        subset = windows[np.isin(windows[:, 0], lanes)].copy()
+        subset[:, 0] = position[subset[:, 0].astype(np.intp)]
+        green = _green_time(subset, np.arange(period_steps) * step, step, len(lanes))
+        tables.append((lanes, period_steps, _capacity(green, lane_flow[lanes])))
+    drifting = np.flatnonzero(~exact)
+    drifting_windows = windows[np.isin(windows[:, 0], drifting)]
+
+    # Boundary arrivals: the cumulative expected arrivals of every lane fed
+    # from outside at the breakpoints of all schedules.
+    periods = {schedule.period for schedule in schedules.values()}
+    if len(periods) > 1:
+        raise ValueError('All arrival rate schedules must share one period')
+    period = periods.pop() if periods else DAY
+    for key, rate in constants.items():
+        schedules[key] = RateSchedule([0.0, period], [rate], period)
+    breakpoints = np.unique(
+        np.concatenate(
+            [[0.0, period]] + [schedule.breakpoints for schedule in schedules.values()]
+        )
+    )
+    fed_lanes, fed_rates = [], []
+    for key, schedule in schedules.items():
+        lanes = approaches[key]
+        fed_lanes.extend(lanes)
+        fed_rates.extend([schedule.rate(breakpoints[:-1]) / len(lanes)] * len(lanes))
+    fed_lanes = np.array(fed_lanes, dtype=np.intp)
+    fed_rates = np.array(fed_rates).reshape(len(fed_lanes), -1).T
+    fed_levels = np.concatenate(
+        (
+            np.zeros((1, len(fed_lanes))),
+            np.cumsum(fed_rates * np.diff(breakpoints)[:, None], axis=0),
+        )
+    )
+
+    # Links: the lane outflows each lane receives a share of, grouped by
+    # the travel time of their link in steps.
+    sources: dict[tuple[str, Direction], list[int]] = {}
+    for lane, exit in enumerate(exits):
+        sources.setdefault(exit, []).append(lane)
+    leaving = np.ones(count, dtype=bool)
+    delays: dict[int, list[tuple[int, int, float]]] = {}
+    for link in network.links:
+        upstream = sources.get((link.source, link.exit), [])
+        leaving[upstream] = False
+        lanes = approaches[link.target, link.approach]
+        delay = max(round(link.travel_time / step), 1)
+        for lane in lanes:
+            for source in upstream:
+                delays.setdefault(delay, []).append((lane, source, 1 / len(lanes)))
+    feeds = []
+    for delay, group in sorted(delays.items()):
+        group.sort()
+        lanes, upstream, shares = (np.array(column) for column in zip(*group))
+        feeds.append((delay, lanes.astype(np.intp), upstream.astype(np.intp), shares))
+    block = min(min(delays, default=MAX_BLOCK), MAX_BLOCK)
+    # Outflow of every lane in recent steps, with a last column of zeros.
+    history = np.zeros(
+        (math.ceil((max(delays, default=0) + block) / block) * block, count + 1)
+    )
+    if len(feeds) == 1 and len(np.unique(feeds[0][1])) == len(feeds[0][1]):
+        # Each lane receives at most one upstream lane's outflow, so its
+        # inflow is a single gather.
+        delay, lanes, upstream, shares = feeds[0]
+        single_source = np.full(count, count)
+        single_source[lanes] = upstream
+        single_share = np.zeros(count)
+        single_share[lanes] = shares
+    else:
+        single_source = None
+
+    table = None
+    if len(tables) == 1 and len(tables[0][0]) == count:
+        _, period_steps, table = tables[0]
+
+    queues = np.zeros(count)
+    queued = np.zeros(count)
+    arrived = np.zeros(count)
+    entered = 0.0
+    steps = math.ceil((duration - start_time) / step - 1e-9)
+    offsets = np.arange(block + 1)
+    for first in range(0, steps, block):
+        size = min(block, steps - first)
+        indices = first + offsets[:size]
+
+        if single_source is not None:
+            earlier = history[(indices - delay) % len(history)]
+            inflow = earlier[:, single_source] * single_share
+        else:
+            inflow = np.zeros((size, count))
+            for delay, lanes, upstream, shares in feeds:
+                earlier = history[(indices - delay) % len(history)]
+                inflow += _group_sums(earlier[:, upstream] * shares, lanes, count)
+        if len(fed_lanes):
+            times = start_time + (first + offsets[: size + 1]) * step
+            cycles, phase = np.divmod(times, period)
+            segment = np.searchsorted(breakpoints, phase, side='right') - 1
+            segment = np.minimum(segment, len(breakpoints) - 2)
+            cumulative = (
+                cycles[:, None] * fed_levels[-1]
+                + fed_levels[segment]
+                + fed_rates[segment] * (phase - breakpoints[segment])[:, None]
+            )
+            external = np.diff(cumulative, axis=0)
+            entered += external.sum()
+            inflow[:, fed_lanes] += external
+        arrived += inflow.sum(axis=0)
+
+        if table is not None:
+            capacity, rows = table, indices % period_steps
+        else:
+            capacity, rows = np.empty((size, count)), offsets[:size]
+            for lanes, period_steps, lane_table in tables:
+                capacity[:, lanes] = lane_table[indices % period_steps]
+            if len(drifting):
+                green = _green_time(drifting_windows, indices * step, step, count)
+                capacity[:, drifting] = _capacity(
+                    green[:, drifting], lane_flow[drifting]
+                )
+
+        # Blocks are aligned with the history, so they fill a slice of it.
+        begin = first % len(history)
+        outflow = history[begin : begin + size, :count]
+        for k in range(size):
+            np.add(queues, inflow[k], out=queues)
+            np.minimum(queues, capacity[rows[k]], out=outflow[k])
+            np.subtract(queues, outflow[k], out=queues)
+            np.add(queued, queues, out=queued)
+
+    departed = arrived - queues
+    # The queue integral by the trapezoidal rule, from empty queues.
+    waited = (queued - queues / 2) * step
+    starts = np.flatnonzero(np.r_[True, lane_node[1:] != lane_node[:-1]])
+    return MesoscopicStatistics(
+        intersections=names,
+        arrivals=np.add.reduceat(arrived, starts),
+        departures=np.add.reduceat(departed, starts),
+        waiting_times=np.add.reduceat(waited, starts),
+        entered=float(entered),
+        exited=float(departed[leaving].sum()),
+    )
+
+
+def _capacity(green: np.ndarray, flow: np.ndarray) -> np.ndarray:
+    """Return the vehicles lanes discharging at ``flow`` per second can release.
+
+    ``green`` holds the green seconds of each lane in each step. Lanes
+    with an infinite flow release any queue in a step with some green.
+    """
+
+    with np.errstate(invalid='ignore'):
+        return np.where(green > 0, green * flow, 0.0)
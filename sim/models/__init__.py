@@ -9,8 +9,16 @@ from sim.models.lights import (
     Lane,
     Intersection,
 )
-from sim.models.vehicles import ArrivalRates
-from sim.models.metrics import SummaryStatistics
+from sim.models.vehicles import ArrivalRates, DischargeMode
+from sim.models.metrics import (
+    ControllerReport,
+    EngineReport,
+    MesoscopicStatistics,
+    NetworkStatistics,
+    SummaryStatistics,
+    TimeSeries,
+)
+from sim.models.network import IntersectionNetwork, Link
 
 
 __all__ = [
@@ -22,5 +30,13 @@ __all__ = [
     'Lane',
     'Intersection',
     'ArrivalRates',
+    'DischargeMode',
+    'ControllerReport',
+    'EngineReport',
+    'IntersectionNetwork',
+    'Link',
+    'MesoscopicStatistics',
+    'NetworkStatistics',
     'SummaryStatistics',
+    'TimeSeries',
 ]
@@ -51,11 +51,21 @@ class Phase(BaseModel):
 
 
 class Lane(BaseModel):
-    """A single movement lane controlled by a traffic light."""
+    """A single movement lane controlled by a traffic light.
+
+    A lane only describes its configuration; vehicles queue in the
+    per-run :class:`~sim.runtime.LaneRuntime` compiled from it. By default
+    every queued vehicle may leave as soon as the light is green. Setting
+    ``saturation_headway`` serves the queue at saturation flow instead:
+    the first vehicle leaves ``startup_lost_time`` seconds after the light
+    turns green and each following vehicle at least ``saturation_headway``
+    seconds after the one ahead of it.
+    """
 
     light: TrafficLight
     name: str | None = None
-    queue: list[tuple[int, float]] = Field(default_factory=list)
+    saturation_headway: float | None = Field(default=None, gt=0)
+    startup_lost_time: float = Field(default=0.0, ge=0)
 
     @property
     def source(self) -> Direction:
@@ -67,7 +77,12 @@ class Lane(BaseModel):
 
 
 class Intersection(BaseModel):
-    """Container for lights, phases and lanes at an intersection."""
+    """Container for lights, phases and lanes at an intersection.
+
+    An intersection is a template: simulations compile it into fresh
+    per-run state (see :mod:`sim.runtime`) and never modify it, so one
+    instance can be shared by any number of sequential or concurrent runs.
+    """
 
     lights: dict[Direction, TrafficLight]
     phases: list[Phase]
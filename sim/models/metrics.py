@@ -1,66 +1,715 @@
 """Collection of utilities for measuring simulation performance."""
 
-import matplotlib.pyplot as plt
+from collections.abc import Iterable, Iterator
+import math
+
 import numpy as np
 import numpy.typing as npt
-from pydantic import ConfigDict
+from pydantic import BaseModel, ConfigDict, field_validator
 from pydantic.dataclasses import dataclass, Field
-import pandas as pd
 from pathlib import Path
 
 
+class WaitingTimeBuffer:
+    """Growable ``float64`` array with amortized constant-time appends.
+
+    The backing array doubles in size when full, so recording ``n`` values
+    costs ``O(n)`` in total instead of the ``O(n**2)`` of repeated
+    ``np.append`` calls. The buffer behaves like a read-only array of the
+    recorded values wherever NumPy accepts array-likes.
+    """
+
+    __slots__ = ('_data', '_size')
+
+    def __init__(self, values: npt.ArrayLike = (), capacity: int = 1024) -> None:
+        """Create a buffer holding ``values`` with room for ``capacity`` items."""
+
+        values = np.asarray(values, dtype=np.float64).ravel()
+        self._data = np.empty(max(capacity, len(values)), dtype=np.float64)
+        self._data[: len(values)] = values
+        self._size = len(values)
+
+    @property
+    def values(self) -> np.ndarray:
+        """Return a view of the recorded values."""
+
+        return self._data[: self._size]
+
+    def add(self, value: float) -> None:
+        """Append a single ``value``."""
+
+        if self._size == len(self._data):
+            self._grow(self._size + 1)
+        self._data[self._size] = value
+        self._size += 1
+
+    def extend(self, values: npt.ArrayLike) -> None:
+        """Append all ``values`` in order."""
+
+        values = np.asarray(values, dtype=np.float64).ravel()
+        end = self._size + len(values)
+        if end > len(self._data):
+            self._grow(end)
+        self._data[self._size : end] = values
+        self._size = end
+
+    def _grow(self, minimum: int) -> None:
+        """Reallocate the backing array to hold at least ``minimum`` values."""
+
+        capacity = max(2 * len(self._data), minimum, 16)
+        data = np.empty(capacity, dtype=np.float64)
+        data[: self._size] = self.values
+        self._data = data
+
+    def total(self) -> float:
+        """Return the sum of the recorded values."""
+
+        return float(self.values.sum())
+
+    def max(self) -> float:
+        """Return the largest recorded value."""
+
+        return float(self.values.max())
+
+    def min(self) -> float:
+        """Return the smallest recorded value."""
+
+        return float(self.values.min())
+
+    def median(self) -> float:
+        """Return the median of the recorded values."""
+
+        return float(np.median(self.values))
+
+    def std(self) -> float:
+        """Return the population standard deviation of the recorded values."""
+
+        return float(np.std(self.values))
+
+    def var(self) -> float:
+        """Return the population variance of the recorded values."""
+
+        return float(np.var(self.values))
+
+    def histogram(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return ``(counts, bin_edges)`` of the recorded values."""
+
+        return np.histogram(self.values)
+
+    def merge(
+        self, other: 'WaitingTimeBuffer | WaitingTimeSketch'
+    ) -> 'WaitingTimeBuffer | WaitingTimeSketch':
+        """Return a new recorder holding the values of ``self`` and ``other``.
+
+        Merging with a :class:`WaitingTimeSketch` yields a sketch, since the
+        raw values of the sketch are not available.
+        """
+
+        if isinstance(other, WaitingTimeSketch):
+            return other.merge(self)
+        merged = WaitingTimeBuffer(self.values, capacity=len(self) + len(other))
+        merged.extend(other.values)
+        return merged
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self.values)
+
+    def __getitem__(self, index):
+        return self.values[index]
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        values = self.values
+        if copy:
+            values = values.copy()
+        return values if dtype is None else values.astype(dtype, copy=False)
+
+    def __reduce__(self):
+        # Only ship the recorded values, not the spare capacity.
+        return type(self), (self.values.copy(),)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.values!r})'
+
+
+class WaitingTimeSketch:
+    """Constant-memory summary of a stream of waiting times.
+
+    Count, mean and variance are maintained with Welford updates, and the
+    minimum and maximum exactly. Quantiles are approximated from a
+    histogram of ``bins`` bins of ``bin_width`` seconds over
+    ``[0, bin_width * bins)``, followed by ``log_bins`` bins each ``growth``
+    times wider than the previous one, so that the range follows waits of
+    oversaturated or multi-day runs. Values beyond the last edge are
+    counted in an overflow bin that extends to the maximum. Median
+    estimates are therefore accurate to within ``bin_width`` below
+    ``bin_width * bins``, and to within a relative error of ``growth``
+    above it; the default bins reach beyond two years.
+
+    Sketches with the same binning can be merged exactly, so summaries of
+    several runs or lanes can be combined without keeping raw values.
+    """
+
+    __slots__ = (
+        'bin_width',
+        'bins',
+        'growth',
+        'counts',
+        'overflow',
+        '_count',
+        '_mean',
+        '_m2',
+        '_min',
+        '_max',
+    )
+
+    def __init__(
+        self,
+        bin_width: float = 1.0,
+        bins: int = 3600,
+        growth: float = 0.01,
+        log_bins: int = 1000,
+    ) -> None:
+        """Create an empty sketch with the given binning."""
+
+        if bin_width <= 0 or bins <= 0 or growth <= 0 or log_bins < 0:
+            raise ValueError('bin_width, bins and growth must be positive')
+        self.bin_width = float(bin_width)
+        self.bins = bins
+        self.growth = float(growth)
+        self.counts = np.zeros(bins + log_bins, dtype=np.int64)
+        self.overflow = 0
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._min = np.inf
+        self._max = -np.inf
+
+    @property
+    def edges(self) -> np.ndarray:
+        """Return the edges of the histogram bins, overflow excluded."""
+
+        linear = np.arange(self.bins + 1) * self.bin_width
+        steps = np.arange(1, len(self.counts) - self.bins + 1)
+        return np.concatenate((linear, linear[-1] * (1 + self.growth) ** steps))
+
+    def _indices(self, values: np.ndarray) -> np.ndarray:
+        """Return the bin of each of ``values``, ``len(counts)`` for overflow."""
+
+        indices = np.clip(values / self.bin_width, 0, None)
+        start = self.bin_width * self.bins
+        beyond = values >= start
+        indices[beyond] = self.bins + np.log(values[beyond] / start) / np.log1p(
+            self.growth
+        )
+        return np.minimum(indices, len(self.counts)).astype(np.int64)
+
+    def add(self, value: float) -> None:
+        """Record a single ``value``."""
+
+        self._count += 1
+        delta = value - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (value - self._mean)
+        if value < self._min:
+            self._min = value
+        if value > self._max:
+            self._max = value
+
+        index = int(value / self.bin_width)
+        if index >= self.bins:
+            ratio = value / (self.bin_width * self.bins)
+            index = self.bins + int(math.log(ratio) / math.log1p(self.growth))
+        if index < len(self.counts):
+            self.counts[max(index, 0)] += 1
+        else:
+            self.overflow += 1
+
+    def extend(self, values: npt.ArrayLike) -> None:
+        """Record all ``values``."""
+
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if len(values) == 0:
+            return
+        batch = self._empty()
+        batch._count = len(values)
+        batch._mean = float(values.mean())
+        batch._m2 = float(((values - batch._mean) ** 2).sum())
+        batch._min = float(values.min())
+        batch._max = float(values.max())
+        indices = self._indices(values)
+        in_range = indices < len(self.counts)
+        batch.counts = np.bincount(indices[in_range], minlength=len(self.counts))
+        batch.overflow = int((~in_range).sum())
+        self._absorb(batch)
+
+    def _empty(self) -> 'WaitingTimeSketch':
+        """Return an empty sketch with the binning of ``self``."""
+
+        return WaitingTimeSketch(
+            self.bin_width, self.bins, self.growth, len(self.counts) - self.bins
+        )
+
+    def _absorb(self, other: 'WaitingTimeSketch') -> None:
+        """Combine the moments and histogram of ``other`` into ``self``."""
+
+        if (
+            other.bin_width != self.bin_width
+            or other.bins != self.bins
+            or other.growth != self.growth
+            or len(other.counts) != len(self.counts)
+        ):
+            raise ValueError('Cannot merge sketches with different binning')
+        if other._count == 0:
+            return
+        count = self._count + other._count
+        delta = other._mean - self._mean
+        self._mean += delta * other._count / count
+        self._m2 += other._m2 + delta**2 * self._count * other._count / count
+        self._count = count
+        self._min = min(self._min, other._min)
+        self._max = max(self._max, other._max)
+        self.counts = self.counts + other.counts
+        self.overflow += other.overflow
+
+    def merge(
+        self, other: 'WaitingTimeSketch | WaitingTimeBuffer'
+    ) -> 'WaitingTimeSketch':
+        """Return a new sketch summarizing both ``self`` and ``other``."""
+
+        merged = self._empty()
+        merged._absorb(self)
+        if isinstance(other, WaitingTimeBuffer):
+            merged.extend(other.values)
+        else:
+            merged._absorb(other)
+        return merged
+
+    def total(self) -> float:
+        """Return the sum of the recorded values."""
+
+        return self._mean * self._count
+
+    def max(self) -> float:
+        """Return the largest recorded value."""
+
+        return float(self._max)
+
+    def min(self) -> float:
+        """Return the smallest recorded value."""
+
+        return float(self._min)
+
+    def quantile(self, q: float) -> float:
+        """Return an estimate of quantile ``q`` interpolated within its bin.
+
+        Parameters
+        ----------
+        q : float
+            Quantile in ``[0, 1]``.
+
+        Returns
+        -------
+        float
+            Estimated quantile, or ``nan`` for an empty sketch.
+        """
+
+        if self._count == 0:
+            return float('nan')
+        counts = np.append(self.counts, self.overflow)
+        edges = np.append(self.edges, max(self._max, self.edges[-1]))
+        cumulative = np.cumsum(counts)
+        rank = q * self._count
+        index = min(int(np.searchsorted(cumulative, rank)), len(counts) - 1)
+        below = cumulative[index] - counts[index]
+        fraction = (rank - below) / counts[index] if counts[index] else 0.0
+        estimate = edges[index] + fraction * (edges[index + 1] - edges[index])
+        return float(np.clip(estimate, self._min, self._max))
+
+    def median(self) -> float:
+        """Return an estimate of the median."""
+
+        return self.quantile(0.5)
+
+    def var(self) -> float:
+        """Return the population variance of the recorded values."""
+
+        if self._count == 0:
+            return float('nan')
+        return self._m2 / self._count
+
+    def std(self) -> float:
+        """Return the population standard deviation of the recorded values."""
+
+        return float(np.sqrt(self.var()))
+
+    def histogram(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return ``(counts, bin_edges)`` including the overflow bin."""
+
+        if self.overflow == 0:
+            return self.counts.copy(), self.edges
+        edges = np.append(self.edges, max(self._max, self.edges[-1]))
+        return np.append(self.counts, self.overflow), edges
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __repr__(self) -> str:
+        return (
+            f'{type(self).__name__}(count={self._count}, '
+            f'bin_width={self.bin_width}, bins={self.bins}, '
+            f'growth={self.growth}, log_bins={len(self.counts) - self.bins})'
+        )
+
+
+class EngineReport(BaseModel):
+    """Instrumentation of one run of the event engine.
+
+    Collected by ``simulate(..., instrument=True)`` and attached to the
+    returned :class:`SummaryStatistics` as ``engine_report``.
+    """
+
+    events: dict[str, int]
+    """Domain events by kind: light changes, arrivals, departures and
+    queue checks (wake-ups of lane processes inspecting their queue)."""
+    simpy_events: int
+    """Events processed by the ``simpy`` environment."""
+    peak_event_queue: int
+    """Largest number of events scheduled in the environment at once."""
+    peak_lane_queues: dict[str, int]
+    """Longest queue of each lane, keyed ``'<direction>[<index>]'``."""
+    wall_time: float
+    """Seconds spent running the environment."""
+    wall_time_per_hour: list[float]
+    """Wall-clock seconds spent on each simulated hour."""
+    profile_path: str | None = None
+    """File holding the ``cProfile`` statistics of the run, if profiled."""
+
+    def show_summary(self) -> None:
+        """Print the counters, peaks and timings."""
+
+        for kind, count in self.events.items():
+            label = f'{kind.replace("_", " ").capitalize()}:'
+            print(f'{label:<26}{count}')
+        peak_lane = max(self.peak_lane_queues.values(), default=0)
+        print(
+            f'Simpy events:             {self.simpy_events}\n'
+            f'Peak event queue:         {self.peak_event_queue}\n'
+            f'Peak lane queue:          {peak_lane}\n'
+            f'Wall time:                {self.wall_time:.3f} s'
+        )
+        if self.wall_time_per_hour:
+            slowest = max(self.wall_time_per_hour)
+            print(f'Slowest simulated hour:   {slowest:.3f} s')
+        if self.profile_path:
+            print(f'Profile written to:       {self.profile_path}')
+
+
+class ControllerReport(BaseModel):
+    """Decisions of a signal controller and the wall time they took.
+
+    Measured by the event engine at every phase boundary and attached to
+    the :class:`SummaryStatistics` of ``simulate(..., controller=...)`` as
+    ``controller_report``.
+    """
+
+    controller: str
+    """Class name of the controller."""
+    decisions: list[int]
+    """Controller calls made at the boundaries of each phase."""
+    decision_time: list[float]
+    """Wall-clock seconds spent in those calls, by phase."""
+
+    def mean_decision_time(self) -> list[float]:
+        """Return the average seconds per decision of each phase."""
+
+        return [
+            seconds / count if count else 0.0
+            for count, seconds in zip(self.decisions, self.decision_time)
+        ]
+
+    def show_summary(self) -> None:
+        """Print the decisions and their cost per phase."""
+
+        print(f'Signal controller:        {self.controller}')
+        for index, (count, mean) in enumerate(
+            zip(self.decisions, self.mean_decision_time())
+        ):
+            print(
+                f'Phase {index + 1} decisions:'.ljust(26)
+                + f'{count} ({mean * 1e6:.1f} us each)'
+            )
+        print(f'Decision time:            {sum(self.decision_time):.6f} s')
+
+
+class TimeSeries:
+    """Per-lane queue lengths, light states and throughput sampled over time.
+
+    Every column is a NumPy array with one row per sample; the lane columns
+    have one column per lane, labelled as in :attr:`lanes`:
+
+    * ``time``: simulation time of each sample,
+    * ``queue``: vehicles queued on each lane at that time,
+    * ``light``: code of the lane's light state, an index into
+      :attr:`states`,
+    * ``departures``: vehicles that left each lane since the previous
+      sample.
+
+    :meth:`save` writes an ``.npz`` archive, whose columns :meth:`load`
+    reads only when accessed, or a directory of ``.npy`` files, which
+    :meth:`load` memory-maps.
+    """
+
+    __slots__ = ('time', 'queue', 'light', 'departures', 'lanes', 'states')
+
+    COLUMNS = ('time', 'queue', 'light', 'departures', 'lanes', 'states')
+    """Names of the stored arrays."""
+
+    def __init__(
+        self,
+        time: np.ndarray,
+        queue: np.ndarray,
+        light: np.ndarray,
+        departures: np.ndarray,
+        lanes: npt.ArrayLike,
+        states: npt.ArrayLike,
+    ) -> None:
+        """Wrap the sampled columns."""
+
+        self.time = time
+        self.queue = queue
+        self.light = light
+        self.departures = departures
+        self.lanes = np.asarray(lanes, dtype=str)
+        self.states = np.asarray(states, dtype=str)
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def __repr__(self) -> str:
+        return f'TimeSeries(samples={len(self)}, lanes={self.lanes.tolist()!r})'
+
+    def column(self, name: str, lane: str) -> np.ndarray:
+        """Return column ``name`` of the lane labelled ``lane``."""
+
+        index = int(np.flatnonzero(self.lanes == lane)[0])
+        return getattr(self, name)[:, index]
+
+    def save(self, path: str | Path) -> None:
+        """Write the columns to ``path``.
+
+        Parameters
+        ----------
+        path : str | Path
+            An ``.npz`` file, or a directory that receives one ``.npy``
+            file per column.
+        """
+
+        path = Path(path)
+        columns = {name: np.asarray(getattr(self, name)) for name in self.COLUMNS}
+        if path.suffix == '.npz':
+            np.savez(path, **columns)
+            return
+        path.mkdir(parents=True, exist_ok=True)
+        for name, values in columns.items():
+            np.save(path / f'{name}.npy', values)
+
+    @classmethod
+    def load(cls, path: str | Path) -> 'TimeSeries':
+        """Open columns written by :meth:`save` without reading them eagerly.
+
+        Parameters
+        ----------
+        path : str | Path
+            An ``.npz`` file or a directory of ``.npy`` files.
+
+        Returns
+        -------
+        TimeSeries
+            Columns backed by memory maps for a directory; for an archive,
+            each column is read on first access.
+        """
+
+        path = Path(path)
+        if path.is_dir():
+            return cls(
+                **{
+                    name: np.load(path / f'{name}.npy', mmap_mode='r')
+                    for name in cls.COLUMNS
+                }
+            )
+        archive = np.load(path)
+        return _LazyTimeSeries(archive)
+
+
+class _LazyTimeSeries(TimeSeries):
+    """:class:`TimeSeries` reading each column of an archive when accessed."""
+
+    __slots__ = ('_archive',)
+
+    def __init__(self, archive) -> None:
+        self._archive = archive
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        # Only reached for unset slots, i.e. columns not yet read.
+        if name not in TimeSeries.COLUMNS:
+            raise AttributeError(name)
+        values = self._archive[name]
+        setattr(self, name, values)
+        return values
+
+
 @dataclass(config=ConfigDict(arbitrary_types_allowed=True))
 class SummaryStatistics:
-    """Statistics collected during a simulation run."""
+    """Statistics collected during a simulation run.
+
+    Waiting times are kept individually in a :class:`WaitingTimeBuffer` by
+    default. Use :meth:`streaming` for long runs to summarize them in a
+    constant-memory :class:`WaitingTimeSketch` instead.
+    """
 
     total_vehicles: int = 0
-    waiting_times: npt.ArrayLike = Field(default_factory=lambda: np.array([]))
+    waiting_times: WaitingTimeBuffer | WaitingTimeSketch = Field(
+        default_factory=WaitingTimeBuffer
+    )
+    warmup_time: float = 0.0
+    """Seconds at the start of the run excluded from the statistics."""
+    warmup_vehicles: int = 0
+    """Vehicles excluded from the statistics as part of the warm-up."""
+    engine_report: EngineReport | None = None
+    """Engine instrumentation, when the run was instrumented."""
+    controller_report: ControllerReport | None = None
+    """Decisions of the signal controller, when one was given."""
+    timeseries: TimeSeries | None = None
+    """Sampled queue lengths and light states, when requested."""
+
+    @field_validator('waiting_times', mode='before')
+    @classmethod
+    def _as_recorder(
+        cls, value: npt.ArrayLike | Iterable[float]
+    ) -> WaitingTimeBuffer | WaitingTimeSketch:
+        """Accept any array-like of waiting times."""
+
+        if isinstance(value, WaitingTimeBuffer | WaitingTimeSketch):
+            return value
+        return WaitingTimeBuffer(np.fromiter(value, dtype=np.float64))
+
+    @classmethod
+    def streaming(
+        cls, bin_width: float = 1.0, bins: int = 3600, growth: float = 0.01
+    ) -> 'SummaryStatistics':
+        """Return empty statistics that summarize waiting times in constant memory.
+
+        Parameters
+        ----------
+        bin_width : float, optional
+            Width in seconds of the histogram bins used for the median.
+        bins : int, optional
+            Number of bins of ``bin_width`` seconds.
+        growth : float, optional
+            Relative width of the bins for longer waits, see
+            :class:`WaitingTimeSketch`.
+
+        Returns
+        -------
+        SummaryStatistics
+            Statistics backed by a :class:`WaitingTimeSketch`.
+        """
+
+        return cls(waiting_times=WaitingTimeSketch(bin_width, bins, growth))
+
+    def merge(self, other: 'SummaryStatistics') -> 'SummaryStatistics':
+        """Return statistics combining ``self`` and ``other``.
+
+        Parameters
+        ----------
+        other : SummaryStatistics
+            Statistics of another run, lane or time segment.
+
+        Returns
+        -------
+        SummaryStatistics
+            New statistics; the result is streaming if either input is.
+        """
+
+        return SummaryStatistics(
+            total_vehicles=self.total_vehicles + other.total_vehicles,
+            waiting_times=self.waiting_times.merge(other.waiting_times),
+            warmup_time=self.warmup_time + other.warmup_time,
+            warmup_vehicles=self.warmup_vehicles + other.warmup_vehicles,
+        )
+
+    def truncate(self, count: int, warmup_time: float) -> None:
+        """Discard the first ``count`` recorded waiting times as warm-up.
+
+        Parameters
+        ----------
+        count : int
+            Number of leading waiting times to drop.
+        warmup_time : float
+            Length of the warm-up period the dropped vehicles belong to.
+        """
+
+        if not isinstance(self.waiting_times, WaitingTimeBuffer):
+            raise TypeError(
+                'Only statistics keeping every waiting time can be truncated'
+            )
+        self.waiting_times = WaitingTimeBuffer(self.waiting_times.values[count:])
+        self.total_vehicles -= count
+        self.warmup_vehicles += count
+        self.warmup_time = warmup_time
 
     def average_waiting_time(self):
         """Return the mean waiting time for all vehicles."""
 
         if self.total_vehicles == 0:
             return 0.0
-        return sum(self.waiting_times) / self.total_vehicles
+        return self.total_waiting_time() / self.total_vehicles
 
     def max_waiting_time(self):
         """Return the maximum waiting time observed."""
 
         if len(self.waiting_times) == 0:
             return 0.0
-        return max(self.waiting_times)
+        return self.waiting_times.max()
 
     def min_waiting_time(self):
         """Return the minimum waiting time observed."""
 
         if len(self.waiting_times) == 0:
             return 0.0
-        return min(self.waiting_times)
+        return self.waiting_times.min()
 
     def median_waiting_time(self):
         """Return the median waiting time."""
 
-        return np.median(self.waiting_times)
+        return self.waiting_times.median()
 
     def standard_deviation_waiting_time(self):
         """Return the standard deviation of waiting times."""
 
-        return np.std(self.waiting_times)
+        return self.waiting_times.std()
 
     def variance_waiting_time(self):
         """Return the variance of waiting times."""
 
-        return np.var(self.waiting_times)
+        return self.waiting_times.var()
 
     def total_waiting_time(self):
         """Return the sum of all waiting times."""
 
-        return sum(self.waiting_times)
+        return self.waiting_times.total()
 
     def plot_waiting_times(self):
         """Display a histogram of waiting times."""
 
-        plt.hist(self.waiting_times)
+        # Imported here so that runs without plots do not pay for matplotlib.
+        import matplotlib.pyplot as plt
+
+        counts, edges = self.waiting_times.histogram()
+        plt.hist(edges[:-1], edges, weights=counts)
         plt.show()
 
     def to_dict(self) -> dict:
@@ -85,6 +734,8 @@ class SummaryStatistics:
             Destination CSV path. Any parent directories must already exist.
         """
 
+        import pandas as pd
+
         df = pd.DataFrame([self.to_dict()])
         df.to_csv(Path(file_path), index=False)
 
@@ -101,6 +752,139 @@ class SummaryStatistics:
             f'Variance waiting time:    {self.variance_waiting_time():.2f}\n'
             f'Total waiting time:       {self.total_waiting_time():.2f}'
         )
+        if self.warmup_vehicles:
+            print(
+                f'Warm-up excluded:         {self.warmup_time:.2f} s, '
+                f'{self.warmup_vehicles} vehicles'
+            )
 
         if include_plot:
             self.plot_waiting_times()
+
+
+@dataclass(config=ConfigDict(arbitrary_types_allowed=True))
+class NetworkStatistics:
+    """Statistics of a simulated :class:`~sim.models.IntersectionNetwork`.
+
+    Each intersection records the waits of every vehicle passing it, so a
+    vehicle crossing several intersections contributes one waiting time to
+    each of them.
+    """
+
+    intersections: dict[str, SummaryStatistics]
+    entered: int = 0
+    """Vehicles that entered the network from outside."""
+    exited: int = 0
+    """Vehicles that left the network through an exit without a link."""
+
+    def total(self) -> SummaryStatistics:
+        """Return the statistics of all intersections merged together."""
+
+        parts = list(self.intersections.values())
+        recorders = [stats.waiting_times for stats in parts]
+        if all(isinstance(r, WaitingTimeBuffer) for r in recorders):
+            # One concatenation instead of a copy per pairwise merge.
+            return SummaryStatistics(
+                total_vehicles=sum(stats.total_vehicles for stats in parts),
+                waiting_times=WaitingTimeBuffer(
+                    np.concatenate([r.values for r in recorders]) if recorders else ()
+                ),
+            )
+        merged = SummaryStatistics.streaming()
+        for stats in parts:
+            merged = merged.merge(stats)
+        return merged
+
+    def to_dict(self) -> dict:
+        """Return network-wide summary statistics as a serializable dictionary."""
+
+        return {
+            'intersections': len(self.intersections),
+            'entered': self.entered,
+            'exited': self.exited,
+            **self.total().to_dict(),
+        }
+
+    def show_summary(self) -> None:
+        """Print the vehicle counts and the merged waiting-time summary."""
+
+        print(
+            f'Intersections:            {len(self.intersections)}\n'
+            f'Vehicles entered:         {self.entered}\n'
+            f'Vehicles exited:          {self.exited}'
+        )
+        self.total().show_summary()
+
+
+@dataclass(config=ConfigDict(arbitrary_types_allowed=True))
+class MesoscopicStatistics:
+    """Delay estimates of a mesoscopic run, see :mod:`sim.mesoscopic`.
+
+    Vehicles are fluid, so counts are expected values rather than whole
+    numbers and individual waiting times are not available. The waiting
+    time of an intersection is the time integral of its queues, which
+    corresponds to :meth:`SummaryStatistics.total_waiting_time`.
+    """
+
+    intersections: list[str]
+    arrivals: np.ndarray
+    """Vehicles that reached each intersection."""
+    departures: np.ndarray
+    """Vehicles that left each intersection."""
+    waiting_times: np.ndarray
+    """Total vehicle-seconds spent queueing at each intersection."""
+    entered: float = 0.0
+    """Vehicles that entered the network from outside."""
+    exited: float = 0.0
+    """Vehicles that left the network through an exit without a link."""
+
+    def total_vehicles(self) -> float:
+        """Return the number of vehicles reaching any intersection."""
+
+        return float(self.arrivals.sum())
+
+    def total_waiting_time(self) -> float:
+        """Return the vehicle-seconds spent queueing at all intersections."""
+
+        return float(self.waiting_times.sum())
+
+    def average_waiting_time(self) -> float:
+        """Return the mean waiting time of a vehicle at an intersection."""
+
+        total = self.total_vehicles()
+        return self.total_waiting_time() / total if total else 0.0
+
+    def average_waiting_times(self) -> dict[str, float]:
+        """Return the mean waiting time at each intersection."""
+
+        averages = np.divide(
+            self.waiting_times,
+            self.arrivals,
+            out=np.zeros(len(self.arrivals)),
+            where=self.arrivals > 0,
+        )
+        return dict(zip(self.intersections, averages.tolist()))
+
+    def to_dict(self) -> dict:
+        """Return network-wide delay estimates as a serializable dictionary."""
+
+        return {
+            'intersections': len(self.intersections),
+            'entered': self.entered,
+            'exited': self.exited,
+            'total_vehicles': self.total_vehicles(),
+            'average_waiting_time': self.average_waiting_time(),
+            'total_waiting_time': self.total_waiting_time(),
+        }
+
+    def show_summary(self) -> None:
+        """Print the vehicle counts and delay estimates."""
+
+        print(
+            f'Intersections:            {len(self.intersections)}\n'
+            f'Vehicles entered:         {self.entered:.2f}\n'
+            f'Vehicles exited:          {self.exited:.2f}\n'
+            f'Total vehicles:           {self.total_vehicles():.2f}\n'
+            f'Average waiting time:     {self.average_waiting_time():.2f}\n'
+            f'Total waiting time:       {self.total_waiting_time():.2f}'
+        )
@@ -0,0 +1,141 @@
+"""Models of road networks linking several intersections."""
+
+import json
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from sim.models.lights import Direction, Intersection, TrafficLightCycleTime
+from sim.models.vehicles import ArrivalRates
+
+
+class Link(BaseModel):
+    """A directed road from an exit of one intersection to an approach of another.
+
+    Vehicles leaving ``source`` towards ``exit`` reach the ``approach`` of
+    ``target`` after ``travel_time`` seconds. For example, vehicles coming
+    from the north leave towards the south and may enter the next
+    intersection to the south on its northern approach.
+    """
+
+    source: str
+    exit: Direction
+    target: str
+    approach: Direction
+    travel_time: float = Field(gt=0)
+
+
+class IntersectionNetwork(BaseModel):
+    """Intersections connected by links, with arrivals at its boundary.
+
+    Vehicles enter the network at the approaches listed in
+    ``arrival_rates`` and are routed along the link leaving the exit their
+    lane leads to; exits without a link leave the network.
+    """
+
+    intersections: dict[str, Intersection]
+    links: list[Link] = []
+    arrival_rates: dict[str, ArrivalRates] = {}
+    """External arrival rates by intersection and approach."""
+
+    @field_validator('intersections', mode='before')
+    @classmethod
+    def _expand_cycle_times(cls, value: Any) -> Any:
+        """Accept ``{"green": ..., "yellow": ...}`` for a basic four-way."""
+
+        if not isinstance(value, dict):
+            return value
+        return {
+            name: (
+                Intersection.create_basic_four_way(TrafficLightCycleTime(**config))
+                if isinstance(config, dict) and 'lights' not in config
+                else config
+            )
+            for name, config in value.items()
+        }
+
+    @model_validator(mode='after')
+    def _check_references(self) -> 'IntersectionNetwork':
+        """Reject links and rates naming unknown intersections or duplicate exits."""
+
+        exits = set()
+        for link in self.links:
+            for name in (link.source, link.target):
+                if name not in self.intersections:
+                    raise ValueError(f'Link refers to unknown intersection {name!r}')
+            if (link.source, link.exit) in exits:
+                raise ValueError(
+                    f'Several links leave {link.source!r} towards {link.exit}'
+                )
+            exits.add((link.source, link.exit))
+        for name in self.arrival_rates:
+            if name not in self.intersections:
+                raise ValueError(f'Arrival rates for unknown intersection {name!r}')
+        return self
+
+    @classmethod
+    def from_json(cls, path: str | Path) -> 'IntersectionNetwork':
+        """Load a network from a JSON topology file.
+
+        The file holds an object with ``intersections`` (names mapped to an
+        ``Intersection`` or to a cycle time such as
+        ``{"green": 30, "yellow": 3}`` for a basic four-way intersection),
+        ``links`` (objects with the fields of :class:`Link`) and
+        ``arrival_rates`` (names mapped to per-approach rates).
+        """
+
+        return cls.model_validate(json.loads(Path(path).read_text()))
+
+    @classmethod
+    def grid(
+        cls,
+        rows: int,
+        columns: int,
+        cycle_time: TrafficLightCycleTime,
+        *,
+        travel_time: float = 30.0,
+        arrival_rate: float = 0.05,
+    ) -> 'IntersectionNetwork':
+        """Return a grid of basic four-way intersections.
+
+        Intersections are named ``'{row},{column}'`` with row 0 to the
+        north, neighbours are linked in both directions, and every
+        approach on the boundary receives ``arrival_rate``.
+        """
+
+        steps = {
+            Direction.NORTH: (-1, 0),
+            Direction.SOUTH: (1, 0),
+            Direction.EAST: (0, 1),
+            Direction.WEST: (0, -1),
+        }
+        intersection = Intersection.create_basic_four_way(cycle_time)
+        names = {
+            (row, column): f'{row},{column}'
+            for row in range(rows)
+            for column in range(columns)
+        }
+        links = []
+        arrival_rates: dict[str, ArrivalRates] = {}
+        for (row, column), name in names.items():
+            for side, (dr, dc) in steps.items():
+                neighbour = names.get((row + dr, column + dc))
+                if neighbour is not None:
+                    links.append(
+                        Link(
+                            source=name,
+                            exit=side,
+                            target=neighbour,
+                            approach=side.opposite(),
+                            travel_time=travel_time,
+                        )
+                    )
+                else:
+                    # Nothing beyond this side, so traffic enters from it.
+                    arrival_rates.setdefault(name, {})[side] = arrival_rate
+        return cls(
+            intersections={name: intersection for name in names.values()},
+            links=links,
+            arrival_rates=arrival_rates,
+        )
@@ -1,7 +1,19 @@
 """Vehicle related types and utilities."""
 
+from enum import StrEnum
+
 from sim.models.lights import Direction
 
 
 ArrivalRates = dict[Direction, float]
 """Type alias for per-direction arrival rates."""
+
+
+class DischargeMode(StrEnum):
+    """Strategies for releasing queued vehicles onto a green light."""
+
+    POLLING = 'polling'
+    """Every queued vehicle re-checks its light once per simulated second."""
+
+    EVENT = 'event'
+    """Lanes are woken only when their light turns green or a vehicle arrives."""
@@ -0,0 +1,343 @@
+"""Simulation of networks of linked intersections.
+
+Every intersection of an :class:`~sim.models.IntersectionNetwork` runs as
+an :class:`~sim.intersection.IntersectionSimulation` on one shared
+``simpy`` environment, so the whole network advances on a single event
+loop. A vehicle leaving a lane whose exit has a link is appended to that
+link's FIFO queue, which holds only ``(vehicle_id, arrival_time)`` pairs.
+Travel times are constant, so vehicles reach the end of a link in the
+order they entered it. One process per link sleeps until the vehicle at
+its head arrives and then places it in the shortest lane of the target
+approach. There is no process per vehicle, and idle links and lanes cost
+nothing until they are woken.
+
+A :class:`NetworkSimulation` may also be restricted to a partition of the
+network, as done by :mod:`sim.partitions`. Links leaving the partition
+then only collect the departing vehicles, and links entering it receive
+them in batches through :meth:`NetworkSimulation.receive`.
+"""
+
+from collections import deque
+from collections.abc import Collection, Generator, Mapping
+import math
+from typing import Any
+
+import simpy
+from simpy.events import URGENT, Timeout
+
+from sim.intersection import (
+    ArrivalState,
+    IntersectionSimulation,
+    generate_vehicle_arrivals,
+)
+from sim.models import (
+    Direction,
+    DischargeMode,
+    IntersectionNetwork,
+    NetworkStatistics,
+    SummaryStatistics,
+)
+from sim.control import SignalController
+from sim.runtime import LaneRuntime, LightRuntime
+from sim.seeding import (
+    BLOCK_SIZE,
+    ArrivalSampler,
+    SeedLike,
+    direction_streams,
+    seed_sequence,
+)
+
+
+class LinkRuntime:
+    """Vehicles travelling along one link during a run.
+
+    ``target`` is ``None`` for a link leaving the simulated partition, whose
+    queue only collects vehicles until they are sent on.
+    """
+
+    __slots__ = ('travel_time', 'lanes', 'target', 'queue', 'wakeup')
+
+    def __init__(
+        self,
+        travel_time: float,
+        target: 'NetworkIntersection | None',
+        lanes: list[LaneRuntime],
+    ) -> None:
+        """Create an empty link leading into ``lanes`` of ``target``."""
+
+        self.travel_time = travel_time
+        self.target = target
+        self.lanes = lanes
+        self.queue: deque[tuple[int, float]] = deque()
+        # Pending wake-up event while the link is empty.
+        self.wakeup = None
+
+    def extend(self, vehicles: list[tuple[int, float]]) -> None:
+        """Append ``(vehicle_id, arrival_time)`` pairs sent from upstream."""
+
+        self.queue.extend(vehicles)
+        wakeup = self.wakeup
+        if vehicles and wakeup is not None:
+            self.wakeup = None
+            wakeup.succeed()
+
+
+class LinkArrival(Timeout):
+    """Timeout processed before ordinary events scheduled for the same time.
+
+    Vehicles reaching the end of a link thus always join their lane before
+    the target's own events at that instant, however the network is split
+    into partitions.
+    """
+
+    def __init__(self, env, delay: float) -> None:
+        # Inlined from Timeout.__init__ with a different priority.
+        self.env = env
+        self.callbacks = []
+        self._value = None
+        self._delay = delay
+        self._ok = True
+        env.schedule(self, URGENT, delay)
+
+
+class NetworkIntersection(IntersectionSimulation):
+    """Intersection simulation passing departing vehicles on to its links."""
+
+    def __init__(self, env, intersection, **kwargs: Any) -> None:
+        """Initialize the simulation with no links attached yet."""
+
+        super().__init__(env, intersection, **kwargs)
+        # Outgoing links by exit direction, filled in by the network.
+        self.exits: dict[Direction, LinkRuntime] = {}
+        self.exited = 0
+
+    def record_departure(self, lane: LaneRuntime) -> None:
+        """Record the head vehicle of ``lane`` and send it down its exit."""
+
+        vehicle_id = lane.queue[0][0]
+        super().record_departure(lane)
+        link = self.exits.get(lane.light.destination)
+        if link is None:
+            self.exited += 1
+            return
+        link.queue.append((vehicle_id, self.env.now + link.travel_time))
+        wakeup = link.wakeup
+        if wakeup is not None:
+            link.wakeup = None
+            wakeup.succeed()
+
+    def downstream_queued(self, light: LightRuntime) -> int:
+        """Return the vehicles queued on the approach ``light`` leads to.
+
+        Unknown, and therefore zero, for exits leaving the network or the
+        simulated partition.
+        """
+
+        link = self.exits.get(light.destination)
+        if link is None:
+            return 0
+        return sum(len(lane.queue) for lane in link.lanes)
+
+
+def carry(env, link: LinkRuntime) -> Generator[Any, Any, None]:
+    """Deliver the vehicles on ``link`` to its target as they arrive."""
+
+    queue = link.queue
+    target = link.target
+    lanes = link.lanes
+    while True:
+        if not queue:
+            link.wakeup = env.event()
+            yield link.wakeup
+            continue
+        arrival_time = queue[0][1]
+        if arrival_time > env.now:
+            yield LinkArrival(env, arrival_time - env.now)
+        vehicle_id, _ = queue.popleft()
+        lane = lanes[0] if len(lanes) == 1 else min(lanes, key=_queue_length)
+        target.add_vehicle(vehicle_id, lane)
+
+
+def _queue_length(lane: LaneRuntime) -> int:
+    return len(lane.queue)
+
+
+class NetworkSimulation:
+    """All intersections and links of a network on one ``simpy`` environment.
+
+    Parameters
+    ----------
+    env : simpy.Environment
+        Shared environment of the whole network.
+    network : IntersectionNetwork
+        Network to simulate; it is not modified.
+    seed : SeedLike, optional
+        Root seed; each intersection's arrivals draw from their own child
+        stream, in the order of ``network.intersections``.
+    streaming : bool, optional
+        Summarize each intersection's waiting times in constant memory.
+    block_size : int, optional
+        Number of gaps and lane choices pre-sampled at a time.
+    partition : Collection[str] | None, optional
+        Names of the intersections to simulate; all of them by default.
+        Each keeps the random streams it has in a run of the whole network.
+    controller : SignalController | None, optional
+        Signal controller shared by every intersection; fixed-time control
+        when omitted. Pressure-based controllers see the queues of the
+        approaches each intersection feeds.
+    """
+
+    def __init__(
+        self,
+        env,
+        network: IntersectionNetwork,
+        *,
+        seed: SeedLike = None,
+        streaming: bool = False,
+        block_size: int = BLOCK_SIZE,
+        partition: Collection[str] | None = None,
+        controller: SignalController | None = None,
+    ) -> None:
+        """Compile every intersection and link and start their processes."""
+
+        names = list(network.intersections)
+        seeds = dict(zip(names, seed_sequence(seed).spawn(len(names))))
+        if partition is not None:
+            partition = set(partition)
+            names = [name for name in names if name in partition]
+
+        self.env = env
+        self.intersections = {
+            name: NetworkIntersection(
+                env,
+                network.intersections[name],
+                discharge=DischargeMode.EVENT,
+                stats=(
+                    SummaryStatistics.streaming() if streaming else SummaryStatistics()
+                ),
+                controller=controller,
+            )
+            for name in names
+        }
+
+        # Links crossing the partition boundary, by index in network.links.
+        self.inbound: dict[int, LinkRuntime] = {}
+        self.outbound: dict[int, LinkRuntime] = {}
+        for index, link in enumerate(network.links):
+            source = self.intersections.get(link.source)
+            target = self.intersections.get(link.target)
+            if target is not None:
+                runtime = LinkRuntime(
+                    link.travel_time, target, target.lanes[link.approach]
+                )
+                env.process(carry(env, runtime))
+                if source is None:
+                    self.inbound[index] = runtime
+                    continue
+            elif source is not None:
+                runtime = LinkRuntime(link.travel_time, None, [])
+                self.outbound[index] = runtime
+            else:
+                continue
+            source.exits[link.exit] = runtime
+
+        self.arrivals: list[ArrivalState] = []
+        for name, simulation in self.intersections.items():
+            rates = network.arrival_rates.get(name, {})
+            if not rates:
+                continue
+            streams = direction_streams(seeds[name])
+            for direction, rate in rates.items():
+                lanes = len(simulation.lanes[direction])
+                state = ArrivalState(
+                    ArrivalSampler(*streams[direction], lanes, block_size)
+                )
+                self.arrivals.append(state)
+                env.process(
+                    generate_vehicle_arrivals(
+                        env, simulation, direction, rate, state=state
+                    )
+                )
+
+    def receive(self, batches: Mapping[int, list[tuple[int, float]]]) -> None:
+        """Place vehicles sent by other partitions on their inbound links.
+
+        ``batches`` maps link indices to ``(vehicle_id, arrival_time)``
+        pairs, none of which may arrive before the current time.
+        """
+
+        for index, vehicles in batches.items():
+            self.inbound[index].extend(vehicles)
+
+    def send(self) -> dict[int, list[tuple[int, float]]]:
+        """Remove and return the vehicles collected on outbound links."""
+
+        batches = {}
+        for index, link in self.outbound.items():
+            if link.queue:
+                batches[index] = list(link.queue)
+                link.queue.clear()
+        return batches
+
+    def statistics(self) -> NetworkStatistics:
+        """Return the statistics collected so far."""
+
+        return NetworkStatistics(
+            intersections={
+                name: simulation.stats
+                for name, simulation in self.intersections.items()
+            },
+            entered=sum(state.vehicle_id for state in self.arrivals),
+            exited=sum(simulation.exited for simulation in self.intersections.values()),
+        )
+
+
+def simulate_network(
+    duration: int,
+    network: IntersectionNetwork,
+    *,
+    start_time: int = 0,
+    seed: SeedLike = None,
+    streaming: bool = False,
+    block_size: int = BLOCK_SIZE,
+    controller: SignalController | None = None,
+) -> NetworkStatistics:
+    """Run a complete network simulation.
+
+    Parameters
+    ----------
+    duration : int
+        Time in seconds at which the simulation stops.
+    network : IntersectionNetwork
+        Intersections, links and boundary arrival rates to simulate.
+    start_time : int, optional
+        Initial simulation time in seconds.
+    seed : SeedLike, optional
+        Seed for the run's random streams.
+    streaming : bool, optional
+        Summarize waiting times in constant memory; recommended for large
+        networks.
+    block_size : int, optional
+        Number of gaps and lane choices pre-sampled at a time.
+    controller : SignalController | None, optional
+        Signal controller of every intersection; fixed-time by default.
+
+    Returns
+    -------
+    NetworkStatistics
+        Waiting times of every intersection and vehicle counts.
+    """
+
+    if duration <= start_time or math.isinf(duration):
+        raise ValueError('duration must be a finite time after start_time')
+    env = simpy.Environment(initial_time=start_time)
+    simulation = NetworkSimulation(
+        env,
+        network,
+        seed=seed,
+        streaming=streaming,
+        block_size=block_size,
+        controller=controller,
+    )
+    env.run(until=duration)
+    return simulation.statistics()
@@ -0,0 +1,270 @@
+"""Search for signal timings that minimize waiting time."""
+
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+import math
+import os
+from typing import Any, Literal
+
+import numpy as np
+from pydantic import BaseModel
+
+from sim.intersection import simulate
+from sim.models import ArrivalRates, Intersection, TrafficLightCycleTime
+from sim.replications import ReplicationResults, summarize_replications
+from sim.seeding import SeedLike, seed_sequence
+
+
+class CandidateResult(BaseModel):
+    """Evaluation of one timing plan."""
+
+    cycle_times: list[TrafficLightCycleTime]
+    """Cycle time of each phase, in phase order."""
+    results: ReplicationResults
+
+
+class OptimizationResult(BaseModel):
+    """Timing plans ranked from best to worst by ``metric``."""
+
+    metric: str
+    strategy: str
+    candidates: list[CandidateResult]
+    simulated_seconds: float
+    """Simulated time spent over all candidates and replications."""
+
+    @property
+    def best(self) -> CandidateResult:
+        """Return the best-ranked timing plan."""
+
+        return self.candidates[0]
+
+    def show_table(self, limit: int | None = 10) -> None:
+        """Print the ranked timing plans with their confidence intervals.
+
+        Parameters
+        ----------
+        limit : int | None, optional
+            Number of rows to print; all rows when ``None``.
+        """
+
+        print(f'{"rank":>4}  {"phases (green/yellow)":<30} {"reps":>4}  {self.metric}')
+        for rank, candidate in enumerate(self.candidates[:limit], start=1):
+            phases = ', '.join(
+                f'{c.green:g}/{c.yellow:g}' for c in candidate.cycle_times
+            )
+            interval = candidate.results.intervals[self.metric]
+            print(
+                f'{rank:>4}  {phases:<30} {candidate.results.replications:>4}  '
+                f'{interval.mean:.2f} ± {interval.half_width:.2f}'
+            )
+
+
+def with_cycle_times(
+    intersection: Intersection, cycle_times: Sequence[TrafficLightCycleTime]
+) -> Intersection:
+    """Return a copy of ``intersection`` using ``cycle_times`` for its phases.
+
+    Parameters
+    ----------
+    intersection : Intersection
+        Template intersection; it is not modified.
+    cycle_times : Sequence[TrafficLightCycleTime]
+        One cycle time per phase, in phase order.
+
+    Returns
+    -------
+    Intersection
+        Deep copy of ``intersection`` with the new timings.
+    """
+
+    if len(cycle_times) != len(intersection.phases):
+        raise ValueError('Expected one cycle time per phase')
+    candidate = intersection.model_copy(deep=True)
+    for phase, cycle_time in zip(candidate.phases, cycle_times):
+        phase.cycle_time = cycle_time
+    return candidate
+
+
+def timing_grid(
+    intersection: Intersection,
+    green_times: Sequence[float],
+    yellow_times: Sequence[float],
+    *,
+    split: bool = True,
+) -> list[list[TrafficLightCycleTime]]:
+    """Return the timing plans formed by every combination of durations.
+
+    Parameters
+    ----------
+    intersection : Intersection
+        Intersection whose phases are timed.
+    green_times : Sequence[float]
+        Candidate green durations in seconds.
+    yellow_times : Sequence[float]
+        Candidate yellow durations in seconds.
+    split : bool, optional
+        Choose the green time of each phase independently, so that the
+        grid includes unequal phase splits. Otherwise all phases share one
+        green time. Yellow times are always shared by all phases.
+
+    Returns
+    -------
+    list[list[TrafficLightCycleTime]]
+        Timing plans, each with one cycle time per phase.
+    """
+
+    phases = len(intersection.phases)
+    green_plans = (
+        product(green_times, repeat=phases)
+        if split
+        else ((green,) * phases for green in green_times)
+    )
+    return [
+        [TrafficLightCycleTime(green=green, yellow=yellow) for green in greens]
+        for greens, yellow in product(list(green_plans), yellow_times)
+    ]
+
+
+def _evaluate(
+    candidate: int,
+    intersection: Intersection,
+    replication: int,
+    seed: np.random.SeedSequence,
+    duration: int,
+    arrival_rates: ArrivalRates | None,
+    simulate_kwargs: dict[str, Any],
+) -> tuple[int, int, dict[str, float]]:
+    """Run one replication of one candidate and return its summary."""
+
+    stats = simulate(
+        duration, intersection, arrival_rates, seed=seed, **simulate_kwargs
+    )
+    return candidate, replication, stats.to_dict()
+
+
+def optimize_timings(
+    intersection: Intersection,
+    candidates: Sequence[Sequence[TrafficLightCycleTime]],
+    duration: int,
+    arrival_rates: ArrivalRates | None = None,
+    *,
+    strategy: Literal['grid', 'halving'] = 'halving',
+    replications: int = 8,
+    min_replications: int = 2,
+    eta: int = 3,
+    metric: str = 'average_waiting_time',
+    confidence: float = 0.95,
+    workers: int | None = None,
+    seed: SeedLike = None,
+    **simulate_kwargs: Any,
+) -> OptimizationResult:
+    """Evaluate timing plans and rank them by ``metric`` (lower is better).
+
+    Every candidate's ``k``-th replication uses the same seed, so all
+    candidates see identical arrival streams (common random numbers) and
+    differences between them reflect the timings rather than sampling
+    noise. Replications of all candidates are spread over a process pool.
+
+    With ``strategy='grid'`` every candidate gets ``replications`` runs.
+    With ``'halving'`` (successive halving) all candidates start with
+    ``min_replications`` runs; after each round only the best ``1/eta``
+    are kept and their replications are multiplied by ``eta``, up to
+    ``replications``. Eliminated candidates are still ranked, below the
+    survivors, by their last estimate.
+
+    Parameters
+    ----------
+    intersection : Intersection
+        Template intersection; it is not modified.
+    candidates : Sequence[Sequence[TrafficLightCycleTime]]
+        Timing plans to compare, e.g. from :func:`timing_grid`.
+    duration : int
+        Length of each replication in seconds.
+    arrival_rates : ArrivalRates | None, optional
+        Constant per-direction arrival rates, as for :func:`simulate`.
+    strategy : {'grid', 'halving'}, optional
+        Search strategy.
+    replications : int, optional
+        Replications per candidate for ``'grid'``, and the most any
+        candidate receives for ``'halving'``.
+    min_replications : int, optional
+        Replications per candidate in the first halving round.
+    eta : int, optional
+        Reduction factor between halving rounds.
+    metric : str, optional
+        Field of :meth:`SummaryStatistics.to_dict` to minimize.
+    confidence : float, optional
+        Confidence level of the reported intervals.
+    workers : int | None, optional
+        Number of worker processes; defaults to the CPU count.
+    seed : SeedLike, optional
+        Root seed shared by all candidates.
+    **simulate_kwargs
+        Further keyword arguments forwarded to :func:`simulate`.
+
+    Returns
+    -------
+    OptimizationResult
+        Candidates ranked from best to worst.
+    """
+
+    plans = [with_cycle_times(intersection, plan) for plan in candidates]
+    seeds = seed_sequence(seed).spawn(replications)
+    summaries: list[list[dict[str, float]]] = [[] for _ in plans]
+    workers = workers or os.cpu_count() or 1
+
+    if strategy == 'grid':
+        rounds = [replications]
+    elif strategy == 'halving':
+        rounds = []
+        budget = max(min_replications, 2)
+        while budget < replications:
+            rounds.append(budget)
+            budget *= eta
+        rounds.append(replications)
+    else:
+        raise ValueError(f'Unknown strategy: {strategy!r}')
+
+    def mean_metric(index: int) -> float:
+        return float(np.mean([s[metric] for s in summaries[index]]))
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        survivors = list(range(len(plans)))
+        eliminated: list[int] = []
+        for round_number, target in enumerate(rounds):
+            tasks = [
+                (c, plans[c], r, seeds[r], duration, arrival_rates, simulate_kwargs)
+                for c in survivors
+                for r in range(len(summaries[c]), target)
+            ]
+            if executor is None:
+                outcomes = [_evaluate(*task) for task in tasks]
+            else:
+                outcomes = executor.map(_evaluate, *zip(*tasks)) if tasks else []
+            for candidate, replication, summary in sorted(outcomes):
+                summaries[candidate].append(summary)
+
+            survivors.sort(key=mean_metric)
+            if round_number < len(rounds) - 1:
+                keep = max(1, math.ceil(len(survivors) / eta))
+                eliminated = survivors[keep:] + eliminated
+                survivors = survivors[:keep]
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    ranked = [
+        CandidateResult(
+            cycle_times=list(candidates[c]),
+            results=summarize_replications(summaries[c], confidence),
+        )
+        for c in survivors + eliminated
+    ]
+    return OptimizationResult(
+        metric=metric,
+        strategy=strategy,
+        candidates=ranked,
+        simulated_seconds=duration * sum(len(s) for s in summaries),
+    )
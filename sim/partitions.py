@@ -0,0 +1,248 @@
+"""Multi-process simulation of partitioned intersection networks.
+
+:func:`simulate_partitioned` splits an
+:class:`~sim.models.IntersectionNetwork` into partitions, each simulated
+by a :class:`~sim.network.NetworkSimulation` in its own worker process.
+Workers are synchronized conservatively: the lookahead is the shortest
+travel time of a link between two partitions, so a vehicle leaving a
+partition during a window of that length cannot reach another partition
+before the window ends. Every worker runs to the end of the window, sends
+the vehicles that left it through its pipe, and receives the vehicles
+entering it before starting the next window.
+
+Each intersection draws the random streams it has in a single-process
+run, and vehicles reaching the end of a link join their lane before any
+other event at that instant (see :class:`~sim.network.LinkArrival`), so a
+partitioned run reproduces :func:`~sim.network.simulate_network` for the
+same seed. The only exception is the order of vehicles reaching the same
+approach from several links at the same instant.
+"""
+
+from collections import deque
+from collections.abc import Collection, Sequence
+import math
+import multiprocessing
+from multiprocessing.connection import Connection
+
+import simpy
+
+from sim.models import IntersectionNetwork, NetworkStatistics
+from sim.network import NetworkSimulation, simulate_network
+from sim.seeding import BLOCK_SIZE, SeedLike, seed_sequence
+
+
+def partition_network(network: IntersectionNetwork, parts: int) -> list[list[str]]:
+    """Split ``network`` into ``parts`` groups of neighbouring intersections.
+
+    Intersections are ordered breadth-first along links, ignoring their
+    direction, and the order is cut into groups of equal size, so that
+    each group is a connected band of the network where possible. The
+    result only depends on the network.
+
+    Parameters
+    ----------
+    network : IntersectionNetwork
+        Network to split.
+    parts : int
+        Number of partitions, at most the number of intersections.
+
+    Returns
+    -------
+    list[list[str]]
+        Names of the intersections in each partition.
+    """
+
+    names = list(network.intersections)
+    if not 1 <= parts <= len(names):
+        raise ValueError(
+            'The number of partitions must be between 1 and the number of intersections'
+        )
+    neighbours: dict[str, list[str]] = {name: [] for name in names}
+    for link in network.links:
+        neighbours[link.source].append(link.target)
+        neighbours[link.target].append(link.source)
+
+    order = []
+    seen = set()
+    for root in names:
+        if root in seen:
+            continue
+        seen.add(root)
+        pending = deque([root])
+        while pending:
+            name = pending.popleft()
+            order.append(name)
+            for neighbour in neighbours[name]:
+                if neighbour not in seen:
+                    seen.add(neighbour)
+                    pending.append(neighbour)
+
+    bounds = [round(len(order) * part / parts) for part in range(parts + 1)]
+    return [order[begin:end] for begin, end in zip(bounds, bounds[1:])]
+
+
+def run_partition(
+    connection: Connection,
+    network: IntersectionNetwork,
+    partition: Collection[str],
+    start_time: int,
+    seed: SeedLike,
+    streaming: bool,
+    block_size: int,
+) -> None:
+    """Simulate one partition, one window per message from ``connection``.
+
+    Each message is an ``(until, batches)`` pair: the vehicles entering the
+    partition, as accepted by :meth:`NetworkSimulation.receive`, and the
+    end of the window to simulate. The worker answers with the vehicles
+    that left the partition during the window. ``None`` ends the run, and
+    the worker answers with its :class:`NetworkStatistics`.
+    """
+
+    try:
+        env = simpy.Environment(initial_time=start_time)
+        simulation = NetworkSimulation(
+            env,
+            network,
+            seed=seed,
+            streaming=streaming,
+            block_size=block_size,
+            partition=partition,
+        )
+        while (message := connection.recv()) is not None:
+            until, batches = message
+            simulation.receive(batches)
+            env.run(until=until)
+            connection.send(simulation.send())
+        connection.send(simulation.statistics())
+    except EOFError:
+        # The coordinator stopped the run.
+        pass
+    except Exception as exc:
+        connection.send(exc)
+    finally:
+        connection.close()
+
+
+def simulate_partitioned(
+    duration: int,
+    network: IntersectionNetwork,
+    *,
+    partitions: int | Sequence[Collection[str]],
+    start_time: int = 0,
+    seed: SeedLike = None,
+    streaming: bool = False,
+    block_size: int = BLOCK_SIZE,
+) -> NetworkStatistics:
+    """Run a network simulation split across worker processes.
+
+    Parameters
+    ----------
+    duration : int
+        Time in seconds at which the simulation stops.
+    network : IntersectionNetwork
+        Intersections, links and boundary arrival rates to simulate.
+    partitions : int | Sequence[Collection[str]]
+        Number of partitions to form with :func:`partition_network`, or
+        the names of the intersections in each partition, e.g. one group
+        per corridor. Every intersection must belong to exactly one.
+    start_time : int, optional
+        Initial simulation time in seconds.
+    seed : SeedLike, optional
+        Seed for the run's random streams.
+    streaming : bool, optional
+        Summarize waiting times in constant memory.
+    block_size : int, optional
+        Number of gaps and lane choices pre-sampled at a time.
+
+    Returns
+    -------
+    NetworkStatistics
+        Waiting times of every intersection and vehicle counts, as returned
+        by :func:`sim.network.simulate_network`.
+    """
+
+    if duration <= start_time or math.isinf(duration):
+        raise ValueError('duration must be a finite time after start_time')
+    if isinstance(partitions, int):
+        partitions = partition_network(network, partitions)
+    else:
+        partitions = [list(partition) for partition in partitions]
+        assigned = [name for partition in partitions for name in partition]
+        if sorted(assigned) != sorted(network.intersections):
+            raise ValueError('Every intersection must belong to exactly one partition')
+    if len(partitions) == 1:
+        return simulate_network(
+            duration,
+            network,
+            start_time=start_time,
+            seed=seed,
+            streaming=streaming,
+            block_size=block_size,
+        )
+
+    # Resolved once, so that every worker derives the same streams.
+    seed = seed_sequence(seed)
+    owner = {
+        name: part for part, partition in enumerate(partitions) for name in partition
+    }
+    # Partition receiving each link that crosses a partition boundary.
+    receivers = {
+        index: owner[link.target]
+        for index, link in enumerate(network.links)
+        if owner[link.source] != owner[link.target]
+    }
+    lookahead = min(
+        (network.links[index].travel_time for index in receivers),
+        default=duration - start_time,
+    )
+
+    connections = []
+    workers = []
+    for partition in partitions:
+        connection, child = multiprocessing.Pipe()
+        worker = multiprocessing.Process(
+            target=run_partition,
+            args=(child, network, partition, start_time, seed, streaming, block_size),
+            daemon=True,
+        )
+        worker.start()
+        child.close()
+        connections.append(connection)
+        workers.append(worker)
+
+    try:
+        inboxes: list[dict] = [{} for _ in partitions]
+        windows = math.ceil((duration - start_time) / lookahead)
+        for window in range(1, windows + 1):
+            until = min(start_time + window * lookahead, duration)
+            for connection, inbox in zip(connections, inboxes):
+                connection.send((until, inbox))
+            inboxes = [{} for _ in partitions]
+            for connection in connections:
+                for index, vehicles in _receive(connection).items():
+                    inboxes[receivers[index]][index] = vehicles
+        for connection in connections:
+            connection.send(None)
+        results = [_receive(connection) for connection in connections]
+    finally:
+        for connection in connections:
+            connection.close()
+        for worker in workers:
+            worker.join()
+
+    stats = {}
+    for result in results:
+        stats.update(result.intersections)
+    return NetworkStatistics(
+        intersections={name: stats[name] for name in network.intersections},
+        entered=sum(result.entered for result in results),
+        exited=sum(result.exited for result in results),
+    )
+
+
+def _receive(connection: Connection):
+    message = connection.recv()
+    if isinstance(message, Exception):
+        raise message
+    return message
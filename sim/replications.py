@@ -0,0 +1,462 @@
+"""Independent replications of a simulation with confidence intervals."""
+
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+import math
+import os
+from statistics import NormalDist
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+from pydantic import BaseModel
+
+from sim.intersection import simulate
+from sim.models import Intersection, ArrivalRates, SummaryStatistics
+from sim.seeding import SeedLike, seed_sequence
+
+
+class ConfidenceInterval(BaseModel):
+    """Mean of a metric across replications with its confidence bounds."""
+
+    mean: float
+    half_width: float
+    lower: float
+    upper: float
+
+
+class ReplicationResults(BaseModel):
+    """Outcome of :func:`simulate_replications`."""
+
+    replications: int
+    confidence: float
+    intervals: dict[str, ConfidenceInterval]
+    summaries: list[dict[str, float]]
+    """Per-replication ``SummaryStatistics.to_dict()`` in replication order."""
+
+    def show_summary(self) -> None:
+        """Print every metric as ``mean ± half-width``."""
+
+        print(
+            f'Replications:             {self.replications} '
+            f'({self.confidence:.0%} confidence)'
+        )
+        for name, interval in self.intervals.items():
+            label = f'{name.replace("_", " ").capitalize()}:'
+            print(f'{label:<26}{interval.mean:.2f} ± {interval.half_width:.2f}')
+
+
+class SequentialResults(ReplicationResults):
+    """Outcome of :func:`simulate_until_precision`."""
+
+    metric: str
+    target_half_width: float
+    converged: bool
+    """Whether the target was met before the budget ran out."""
+    discarded: int = 0
+    """Replications that were already running at the stopping point and
+    finished, but are left out of the estimate."""
+    simulated_seconds: float
+    """Simulated time consumed by all completed replications, used and
+    discarded."""
+
+
+def t_quantile(p: float, df: int) -> float:
+    """Return the ``p`` quantile of Student's t distribution.
+
+    Uses the exact closed forms for one and two degrees of freedom and the
+    Cornish-Fisher expansion around the normal quantile otherwise, which is
+    accurate to about three decimals from three degrees of freedom upward.
+
+    Parameters
+    ----------
+    p : float
+        Probability in ``(0, 1)``.
+    df : int
+        Degrees of freedom, at least one.
+
+    Returns
+    -------
+    float
+        Quantile of the t distribution.
+    """
+
+    if df < 1:
+        raise ValueError('df must be at least 1')
+    if df == 1:
+        return math.tan(math.pi * (p - 0.5))
+    if df == 2:
+        return (2 * p - 1) / math.sqrt(2 * p * (1 - p))
+
+    z = NormalDist().inv_cdf(p)
+    g1 = (z**3 + z) / 4
+    g2 = (5 * z**5 + 16 * z**3 + 3 * z) / 96
+    g3 = (3 * z**7 + 19 * z**5 + 17 * z**3 - 15 * z) / 384
+    g4 = (79 * z**9 + 776 * z**7 + 1482 * z**5 - 1920 * z**3 - 945 * z) / 92160
+    return z + g1 / df + g2 / df**2 + g3 / df**3 + g4 / df**4
+
+
+def confidence_interval(
+    samples: npt.ArrayLike, confidence: float = 0.95
+) -> ConfidenceInterval:
+    """Return the t-based confidence interval of the mean of ``samples``.
+
+    Parameters
+    ----------
+    samples : ArrayLike
+        One value per independent replication.
+    confidence : float, optional
+        Two-sided confidence level.
+
+    Returns
+    -------
+    ConfidenceInterval
+        Interval around the sample mean; its half-width is infinite when
+        fewer than two samples are available.
+    """
+
+    samples = np.asarray(samples, dtype=np.float64)
+    mean = float(samples.mean())
+    if len(samples) < 2:
+        half_width = math.inf
+    else:
+        t = t_quantile(0.5 + confidence / 2, len(samples) - 1)
+        half_width = t * float(samples.std(ddof=1)) / math.sqrt(len(samples))
+    return ConfidenceInterval(
+        mean=mean,
+        half_width=half_width,
+        lower=mean - half_width,
+        upper=mean + half_width,
+    )
+
+
+# Run configuration shipped once to every worker process by ``_init_worker``.
+_worker_config: dict[str, Any] = {}
+
+
+def _init_worker(config: dict[str, Any]) -> None:
+    """Store the run configuration in a freshly started worker."""
+
+    _worker_config.update(config)
+
+
+def _run_replication(
+    config: dict[str, Any], index: int, seed: np.random.SeedSequence
+) -> tuple[int, SummaryStatistics | dict[str, float]]:
+    """Run replication ``index`` of the run described by ``config``."""
+
+    stats = simulate(
+        config['duration'],
+        config['intersection'],
+        config['arrival_rates'],
+        seed=seed,
+        **config['simulate_kwargs'],
+    )
+    return index, stats if config['keep_stats'] else stats.to_dict()
+
+
+def _run_in_worker(
+    index: int, seed: np.random.SeedSequence
+) -> tuple[int, SummaryStatistics | dict[str, float]]:
+    """Run replication ``index`` with the configuration of this worker."""
+
+    return _run_replication(_worker_config, index, seed)
+
+
+def iter_replications(
+    n: int,
+    duration: int,
+    intersection: Intersection,
+    arrival_rates: ArrivalRates | None = None,
+    *,
+    workers: int | None = None,
+    seed: SeedLike = None,
+    keep_stats: bool = False,
+    **simulate_kwargs: Any,
+) -> Iterator[tuple[int, SummaryStatistics | dict[str, float]]]:
+    """Yield ``(index, result)`` for each replication as soon as it finishes.
+
+    Replication ``i`` is seeded with the ``i``-th child of ``seed``, so its
+    result does not depend on the number of workers or completion order.
+    At most two replications per worker are queued at a time, so closing
+    the iterator early cancels the replications that have not started.
+    Sending ``True`` to the iterator instead cancels them but goes on to
+    yield the replications still running, so that their cost can be
+    accounted for.
+
+    Parameters
+    ----------
+    n : int
+        Number of replications.
+    duration : int
+        Length of each replication in seconds.
+    intersection : Intersection
+        Intersection configuration to simulate.
+    arrival_rates : ArrivalRates | None, optional
+        Constant per-direction arrival rates, as for :func:`simulate`.
+    workers : int | None, optional
+        Number of worker processes; defaults to the CPU count. With one
+        worker replications run in the calling process.
+    seed : SeedLike, optional
+        Root seed from which every replication's seed is spawned.
+    keep_stats : bool, optional
+        Yield full :class:`SummaryStatistics` instead of their
+        ``to_dict()`` summaries. Waiting-time arrays are then sent back
+        from the workers.
+    **simulate_kwargs
+        Further keyword arguments forwarded to :func:`simulate`.
+
+    Yields
+    ------
+    tuple[int, SummaryStatistics | dict[str, float]]
+        Replication index and its result, in completion order.
+    """
+
+    seeds = seed_sequence(seed).spawn(n)
+    config = {
+        'duration': duration,
+        'intersection': intersection,
+        'arrival_rates': arrival_rates,
+        'keep_stats': keep_stats,
+        'simulate_kwargs': simulate_kwargs,
+    }
+    workers = min(workers or os.cpu_count() or 1, n)
+
+    if workers <= 1:
+        for index, child in enumerate(seeds):
+            if (yield _run_replication(config, index, child)):
+                return
+        return
+
+    executor = ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(config,)
+    )
+    try:
+        queued = enumerate(seeds)
+        pending = {
+            executor.submit(_run_in_worker, index, child)
+            for index, child in islice(queued, 2 * workers)
+        }
+        stopped = False
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if not stopped:
+                    for index, child in islice(queued, 1):
+                        pending.add(executor.submit(_run_in_worker, index, child))
+                if (yield future.result()) and not stopped:
+                    stopped = True
+                    pending = {other for other in pending if not other.cancel()}
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def summarize_replications(
+    summaries: list[dict[str, float]], confidence: float = 0.95
+) -> ReplicationResults:
+    """Return confidence intervals for every metric in ``summaries``.
+
+    Parameters
+    ----------
+    summaries : list[dict[str, float]]
+        ``SummaryStatistics.to_dict()`` of each replication.
+    confidence : float, optional
+        Two-sided confidence level.
+
+    Returns
+    -------
+    ReplicationResults
+        Per-metric intervals together with the raw summaries.
+    """
+
+    if not summaries:
+        raise ValueError('At least one replication is needed for a summary')
+    intervals = {
+        name: confidence_interval([s[name] for s in summaries], confidence)
+        for name in summaries[0]
+    }
+    return ReplicationResults(
+        replications=len(summaries),
+        confidence=confidence,
+        intervals=intervals,
+        summaries=summaries,
+    )
+
+
+def simulate_replications(
+    n: int,
+    duration: int,
+    intersection: Intersection,
+    arrival_rates: ArrivalRates | None = None,
+    *,
+    workers: int | None = None,
+    seed: SeedLike = None,
+    confidence: float = 0.95,
+    on_result: Callable[[int, dict[str, float]], None] | None = None,
+    **simulate_kwargs: Any,
+) -> ReplicationResults:
+    """Run ``n`` independent replications in parallel and summarize them.
+
+    Parameters
+    ----------
+    n : int
+        Number of replications.
+    duration : int
+        Length of each replication in seconds.
+    intersection : Intersection
+        Intersection configuration to simulate.
+    arrival_rates : ArrivalRates | None, optional
+        Constant per-direction arrival rates, as for :func:`simulate`.
+    workers : int | None, optional
+        Number of worker processes; defaults to the CPU count.
+    seed : SeedLike, optional
+        Root seed from which every replication's seed is spawned.
+    confidence : float, optional
+        Two-sided confidence level of the reported intervals.
+    on_result : Callable[[int, dict[str, float]], None] | None, optional
+        Called with each replication's index and summary as it completes.
+    **simulate_kwargs
+        Further keyword arguments forwarded to :func:`simulate`.
+
+    Returns
+    -------
+    ReplicationResults
+        Confidence intervals for every field of
+        :meth:`SummaryStatistics.to_dict`.
+    """
+
+    if n < 1:
+        raise ValueError('n must be at least 1')
+    summaries: list[dict[str, float] | None] = [None] * n
+    for index, summary in iter_replications(
+        n,
+        duration,
+        intersection,
+        arrival_rates,
+        workers=workers,
+        seed=seed,
+        **simulate_kwargs,
+    ):
+        summaries[index] = summary
+        if on_result is not None:
+            on_result(index, summary)
+    return summarize_replications(summaries, confidence)
+
+
+def simulate_until_precision(
+    target_half_width: float,
+    duration: int,
+    intersection: Intersection,
+    arrival_rates: ArrivalRates | None = None,
+    *,
+    metric: str = 'average_waiting_time',
+    relative: bool = False,
+    confidence: float = 0.95,
+    min_replications: int = 5,
+    max_replications: int = 1000,
+    max_simulated_seconds: float | None = None,
+    workers: int | None = None,
+    seed: SeedLike = None,
+    **simulate_kwargs: Any,
+) -> SequentialResults:
+    """Run replications until the confidence interval of ``metric`` is narrow.
+
+    Replications are evaluated in index order: the procedure stops at the
+    first ``n >= min_replications`` whose interval over replications
+    ``0..n-1`` meets the target, so the outcome is the same for any number
+    of workers. Replications still running at that point are completed but
+    discarded; they count towards ``simulated_seconds``, and the total
+    never exceeds the budget.
+
+    Parameters
+    ----------
+    target_half_width : float
+        Required confidence-interval half-width of ``metric``.
+    duration : int
+        Length of each replication in seconds.
+    intersection : Intersection
+        Intersection configuration to simulate.
+    arrival_rates : ArrivalRates | None, optional
+        Constant per-direction arrival rates, as for :func:`simulate`.
+    metric : str, optional
+        Field of :meth:`SummaryStatistics.to_dict` to control.
+    relative : bool, optional
+        Interpret ``target_half_width`` as a fraction of the mean.
+    confidence : float, optional
+        Two-sided confidence level.
+    min_replications : int, optional
+        Replications to run before the stopping rule is checked.
+    max_replications : int, optional
+        Replication budget, counting discarded replications.
+    max_simulated_seconds : float | None, optional
+        Budget of simulated time; caps the replications at
+        ``max_simulated_seconds // duration``.
+    workers : int | None, optional
+        Number of worker processes; defaults to the CPU count.
+    seed : SeedLike, optional
+        Root seed from which every replication's seed is spawned.
+    **simulate_kwargs
+        Further keyword arguments forwarded to :func:`simulate`.
+
+    Returns
+    -------
+    SequentialResults
+        Intervals over the replications used, with the budget consumed and
+        whether the target was reached.
+    """
+
+    if max_simulated_seconds is not None:
+        max_replications = min(max_replications, int(max_simulated_seconds // duration))
+    min_replications = max(min_replications, 2)
+    if max_replications < min_replications:
+        raise ValueError('The budget does not allow min_replications replications')
+
+    def precise_enough(summaries: list[dict[str, float]]) -> bool:
+        interval = confidence_interval([s[metric] for s in summaries], confidence)
+        limit = target_half_width
+        if relative:
+            limit *= abs(interval.mean)
+        return interval.half_width <= limit
+
+    completed: dict[int, dict[str, float]] = {}
+    summaries: list[dict[str, float]] = []
+    converged = False
+    discarded = 0
+    replications = iter_replications(
+        max_replications,
+        duration,
+        intersection,
+        arrival_rates,
+        workers=workers,
+        seed=seed,
+        **simulate_kwargs,
+    )
+    while True:
+        try:
+            # Once converged, stop queueing and drain the running ones.
+            index, summary = replications.send(converged or None)
+        except StopIteration:
+            break
+        if converged:
+            discarded += 1
+            continue
+        completed[index] = summary
+        while len(summaries) in completed:
+            summaries.append(completed.pop(len(summaries)))
+            if len(summaries) >= min_replications and precise_enough(summaries):
+                converged = True
+                break
+        if converged:
+            # Finished out of order after the stopping point.
+            discarded += len(completed)
+
+    results = summarize_replications(summaries, confidence)
+    return SequentialResults(
+        **results.model_dump(),
+        metric=metric,
+        target_half_width=target_half_width,
+        converged=converged,
+        discarded=discarded,
+        simulated_seconds=(len(summaries) + discarded) * duration,
+    )
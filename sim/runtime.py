@@ -0,0 +1,208 @@
+"""Compact runtime representation of an :class:`~sim.models.Intersection`.
+
+The pydantic models validate configuration, but their attribute access and
+``StrEnum`` comparisons are comparatively slow in the simulation's inner
+loop. :func:`compile_intersection` copies an ``Intersection`` into plain
+``__slots__`` objects once per run. The light state is mirrored in a
+``green`` flag so that the hot path tests a bool instead of comparing
+enums, and each light keeps its lanes so that turning green wakes them
+without a dictionary lookup.
+
+Each light and each phase also counts the vehicles queued in its lanes,
+kept up to date by :meth:`LightRuntime.count_queued` as vehicles arrive
+and leave, so that signal controllers read the demand of a lane
+(``len(lane.queue)``), a light or a phase in constant time.
+
+Compiling never modifies the ``Intersection`` and every run gets its own
+queues, so one configuration can be simulated any number of times, also
+from several threads at once.
+"""
+
+from collections import deque
+import math
+
+from sim.models import (
+    Direction,
+    Intersection,
+    Lane,
+    TrafficLight,
+    TrafficLightState,
+)
+
+
+class LightRuntime:
+    """Mutable state of one traffic light during a run."""
+
+    __slots__ = (
+        'source',
+        'destination',
+        'name',
+        'state',
+        'green',
+        'green_since',
+        'lanes',
+        'phases',
+        'queued',
+    )
+
+    def __init__(self, light: TrafficLight, now: float) -> None:
+        """Copy ``light`` as it is at simulation time ``now``."""
+
+        self.source = light.source
+        self.destination = light.destination
+        self.name = light.name
+        self.state = light.state
+        self.green = light.state == TrafficLightState.GREEN
+        # Time the light last turned green, used for start-up lost time.
+        self.green_since = now if self.green else -math.inf
+        self.lanes: list[LaneRuntime] = []
+        # Phases serving the light, whose queue counts include its own.
+        self.phases: list[PhaseRuntime] = []
+        # Vehicles queued in all of the light's lanes.
+        self.queued = 0
+
+    def set_state(self, state: TrafficLightState, now: float) -> None:
+        """Switch the light to ``state`` at time ``now``."""
+
+        self.state = state
+        self.green = state is TrafficLightState.GREEN
+        if self.green:
+            self.green_since = now
+
+    def count_queued(self, count: int) -> None:
+        """Add ``count`` vehicles to the queue counts of the light and its phases.
+
+        ``count`` is negative for vehicles leaving.
+        """
+
+        self.queued += count
+        for phase in self.phases:
+            phase.queued += count
+
+
+class LaneRuntime:
+    """Queue and discharge parameters of one lane during a run."""
+
+    __slots__ = (
+        'light',
+        'direction',
+        'index',
+        'name',
+        'queue',
+        'saturation_headway',
+        'startup_lost_time',
+        'wakeup',
+        'departed',
+        'last_departure',
+    )
+
+    def __init__(
+        self,
+        lane: Lane,
+        light: LightRuntime,
+        direction: Direction,
+        index: int,
+    ) -> None:
+        """Copy ``lane``, the ``index``-th lane of ``direction``'s approach."""
+
+        self.light = light
+        self.direction = direction
+        self.index = index
+        self.name = lane.name
+        self.queue: deque[tuple[int, float]] = deque()
+        self.saturation_headway = lane.saturation_headway
+        self.startup_lost_time = lane.startup_lost_time
+        # Pending wake-up event while the lane's discharge process is idle.
+        self.wakeup = None
+        # Vehicles that have left the lane so far, and when the last one did.
+        self.departed = 0
+        self.last_departure = -math.inf
+
+    @property
+    def source(self) -> Direction:
+        return self.light.source
+
+    @property
+    def destination(self) -> Direction:
+        return self.light.destination
+
+
+class PhaseRuntime:
+    """Lights and durations of one signal phase."""
+
+    __slots__ = ('lights', 'green', 'yellow', 'queued')
+
+    def __init__(self, lights: list[LightRuntime], green: float, yellow: float) -> None:
+        """Store the phase's lights and its green and yellow times."""
+
+        self.lights = lights
+        self.green = green
+        self.yellow = yellow
+        # Vehicles queued for all of the phase's lights.
+        self.queued = 0
+        for light in lights:
+            light.phases.append(self)
+
+
+class IntersectionRuntime:
+    """Lights, phases and lanes of an intersection during a run."""
+
+    __slots__ = ('lights', 'phases', 'lanes')
+
+    def __init__(
+        self,
+        lights: dict[Direction, LightRuntime],
+        phases: list[PhaseRuntime],
+        lanes: dict[Direction, list[LaneRuntime]],
+    ) -> None:
+        """Store the compiled components."""
+
+        self.lights = lights
+        self.phases = phases
+        self.lanes = lanes
+
+
+def compile_intersection(
+    intersection: Intersection, now: float = 0.0
+) -> IntersectionRuntime:
+    """Return the runtime representation of ``intersection`` at time ``now``.
+
+    Phases and lanes refer to lights by their source direction, as in the
+    simulation. Directions without configured lanes get one default lane.
+
+    Parameters
+    ----------
+    intersection : Intersection
+        Validated configuration; it is not modified.
+    now : float, optional
+        Simulation time at which the run starts.
+
+    Returns
+    -------
+    IntersectionRuntime
+        Fresh runtime state for one run.
+    """
+
+    lights = {
+        direction: LightRuntime(light, now)
+        for direction, light in intersection.lights.items()
+    }
+    phases = [
+        PhaseRuntime(
+            [lights[light.source] for light in phase.lights],
+            phase.cycle_time.green,
+            phase.cycle_time.yellow,
+        )
+        for phase in intersection.phases
+    ]
+    configured = intersection.lanes or {}
+    lanes = {}
+    for direction, light in intersection.lights.items():
+        approach = configured.get(direction) or [Lane(light=light)]
+        lanes[direction] = [
+            LaneRuntime(lane, lights[lane.source], direction, index)
+            for index, lane in enumerate(approach)
+        ]
+        for lane in lanes[direction]:
+            lane.light.lanes.append(lane)
+    return IntersectionRuntime(lights, phases, lanes)
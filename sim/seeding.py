@@ -0,0 +1,137 @@
+"""Reproducible random streams for simulation runs."""
+
+import numpy as np
+
+from sim.models.lights import Direction
+
+
+SeedLike = int | np.random.SeedSequence | np.random.Generator | None
+"""Anything accepted as the ``seed`` of a simulation run."""
+
+BLOCK_SIZE = 4096
+"""Number of variates drawn from a generator at a time."""
+
+
+def seed_sequence(seed: SeedLike) -> np.random.SeedSequence:
+    """Return the ``SeedSequence`` rooting all streams of a run.
+
+    Parameters
+    ----------
+    seed : SeedLike
+        An integer, an existing ``SeedSequence``, a ``Generator`` whose
+        next spawned child is used, or ``None`` for fresh OS entropy.
+
+    Returns
+    -------
+    numpy.random.SeedSequence
+        Root sequence for the run.
+    """
+
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    if isinstance(seed, np.random.Generator):
+        return seed.bit_generator.seed_seq.spawn(1)[0]
+    return np.random.SeedSequence(seed)
+
+
+def direction_streams(
+    seed: SeedLike,
+) -> dict[Direction, tuple[np.random.Generator, np.random.Generator]]:
+    """Return independent generators for each arrival direction.
+
+    Each direction's streams are derived from its fixed position in
+    :class:`Direction`, so they do not depend on which other directions
+    take part in the run or in which order their processes start.
+
+    Parameters
+    ----------
+    seed : SeedLike
+        Seed of the run, see :func:`seed_sequence`.
+
+    Returns
+    -------
+    dict[Direction, tuple[numpy.random.Generator, numpy.random.Generator]]
+        For each direction, the generator of inter-arrival gaps and the
+        generator of lane choices.
+    """
+
+    root = seed_sequence(seed)
+    streams = {}
+    for index, direction in enumerate(Direction):
+        child = np.random.SeedSequence(root.entropy, spawn_key=(*root.spawn_key, index))
+        gaps, lanes = child.spawn(2)
+        streams[direction] = (
+            np.random.default_rng(gaps),
+            np.random.default_rng(lanes),
+        )
+    return streams
+
+
+class ArrivalSampler:
+    """Pre-sampled blocks of inter-arrival gaps and lane choices.
+
+    Drawing one variate per call to a ``Generator`` costs microseconds of
+    NumPy overhead per vehicle. The sampler instead draws ``block_size``
+    variates at a time and refills lazily, so each vehicle costs a list
+    index. Draws depend only on the generators and ``block_size``.
+
+    Parameters
+    ----------
+    rng : numpy.random.Generator
+        Generator of inter-arrival gaps.
+    lane_rng : numpy.random.Generator
+        Generator of lane choices.
+    lanes : int
+        Number of lanes to choose from.
+    block_size : int, optional
+        Number of variates drawn per refill.
+    """
+
+    __slots__ = ('rng', 'lane_rng', 'lanes', 'block_size', '_gaps', '_choices')
+
+    def __init__(
+        self,
+        rng: np.random.Generator,
+        lane_rng: np.random.Generator,
+        lanes: int = 1,
+        block_size: int = BLOCK_SIZE,
+    ) -> None:
+        """Create a sampler drawing from ``rng`` and ``lane_rng``."""
+
+        if block_size <= 0:
+            raise ValueError('block_size must be positive')
+        self.rng = rng
+        self.lane_rng = lane_rng
+        self.lanes = lanes
+        self.block_size = block_size
+        self._gaps: list[float] = []
+        self._choices: list[int] = []
+
+    def gap_block(self) -> np.ndarray:
+        """Return the next block of unit-rate exponential gaps."""
+
+        return self.rng.standard_exponential(self.block_size)
+
+    def lane_block(self) -> np.ndarray:
+        """Return the next block of lane indices."""
+
+        if self.lanes == 1:
+            return np.zeros(self.block_size, dtype=np.intp)
+        return self.lane_rng.integers(self.lanes, size=self.block_size)
+
+    def gap(self, rate: float) -> float:
+        """Return the next gap of a Poisson process with ``rate``."""
+
+        if not self._gaps:
+            # Reversed so that ``pop`` returns the block in order.
+            self._gaps = self.gap_block().tolist()[::-1]
+        return self._gaps.pop() * (1 / rate)
+
+    def lane(self) -> int:
+        """Return the index of the next vehicle's lane."""
+
+        if self.lanes == 1:
+            return 0
+        if not self._choices:
+            self._choices = self.lane_block().tolist()[::-1]
+        return self._choices.pop()
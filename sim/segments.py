@@ -0,0 +1,210 @@
+"""Time-segment parallel execution of long runs.
+
+:func:`simulate_segments` splits the horizon of a long run into
+consecutive segments simulated in parallel processes. Every segment but
+the first starts ``lead_in`` seconds before its window, or at the start
+of the run if that is later, with empty queues and the fixed-time signal
+cycle positioned where it would be at that moment, so that its queues
+have warmed up by the time it starts counting.
+A segment counts the vehicles arriving within its window and keeps running
+for another ``lead_in`` seconds to let them leave; the last segment stops
+at the end of the run, as :func:`sim.intersection.simulate` does. The
+segments' statistics are then merged with :meth:`SummaryStatistics.merge`.
+
+Segments draw independent random streams, so the result is a different
+sample path than a serial run with the same seed, with the same
+distribution as long as ``lead_in`` covers the queues' memory.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+import os
+from typing import Any
+
+import numpy as np
+import simpy
+
+from sim.intersection import (
+    ArrivalState,
+    IntersectionSimulation,
+    generate_vehicle_arrivals,
+)
+from sim.models import (
+    ArrivalRates,
+    DischargeMode,
+    Intersection,
+    SummaryStatistics,
+)
+from sim.seeding import (
+    BLOCK_SIZE,
+    ArrivalSampler,
+    SeedLike,
+    direction_streams,
+    seed_sequence,
+)
+from sim.traffic_patterns import RateSource
+
+
+def run_segment(
+    config: dict[str, Any],
+    begin: float,
+    end: float,
+    seed: np.random.SeedSequence,
+) -> SummaryStatistics:
+    """Simulate the vehicles arriving in ``[begin, end)``.
+
+    Parameters
+    ----------
+    config : dict[str, Any]
+        ``intersection``, ``rates``, ``start_time``, ``duration``,
+        ``lead_in``, ``warmup``, ``discharge``, ``streaming`` and
+        ``block_size`` of the whole run.
+    begin, end : float
+        Window of the segment.
+    seed : numpy.random.SeedSequence
+        Seed of the segment's random streams.
+
+    Returns
+    -------
+    SummaryStatistics
+        Statistics of the vehicles arriving in the window.
+    """
+
+    start_time = config['start_time']
+    first = begin == start_time
+    # Never before the start of the run, where the signal cycle begins.
+    lead_in = min(config['lead_in'], begin - start_time)
+    until = min(end + config['lead_in'], config['duration'])
+
+    env = simpy.Environment(initial_time=begin - lead_in)
+    if config['streaming']:
+        stats = SummaryStatistics.streaming()
+    else:
+        stats = SummaryStatistics()
+    collect_from = begin
+    if first and config['warmup'] is not None:
+        collect_from += config['warmup']
+        stats.warmup_time = config['warmup']
+    simulation = IntersectionSimulation(
+        env,
+        config['intersection'],
+        discharge=config['discharge'],
+        stats=stats,
+        collect_from=collect_from,
+        collect_until=end,
+        cycle_start=start_time,
+    )
+
+    streams = direction_streams(seed)
+    for direction, rate in config['rates'].items():
+        lanes = len(simulation.lanes[direction])
+        sampler = ArrivalSampler(*streams[direction], lanes, config['block_size'])
+        env.process(
+            generate_vehicle_arrivals(
+                env, simulation, direction, rate, state=ArrivalState(sampler)
+            )
+        )
+    env.run(until=until)
+
+    if not first:
+        # Lead-in vehicles belong to the previous segment.
+        stats.warmup_vehicles = 0
+    return stats
+
+
+def simulate_segments(
+    duration: int,
+    intersection: Intersection,
+    arrival_rates: ArrivalRates | None = None,
+    *,
+    segments: int,
+    lead_in: float = 3600.0,
+    workers: int | None = None,
+    traffic_manager: RateSource | None = None,
+    start_time: int = 0,
+    discharge: DischargeMode = DischargeMode.EVENT,
+    streaming: bool = False,
+    seed: SeedLike = None,
+    warmup: float | None = None,
+    block_size: int = BLOCK_SIZE,
+) -> SummaryStatistics:
+    """Run a long simulation as parallel time segments and merge the results.
+
+    Parameters
+    ----------
+    duration : int
+        End of the run in seconds, as for :func:`sim.intersection.simulate`.
+    intersection : Intersection
+        Intersection configuration to simulate.
+    arrival_rates : ArrivalRates | None, optional
+        Constant per-direction arrival rates. Ignored when
+        ``traffic_manager`` is provided.
+    segments : int
+        Number of equal time segments.
+    lead_in : float, optional
+        Seconds each segment after the first is simulated before its window
+        to warm up its queues, at most back to ``start_time``, and after
+        its window to let its vehicles leave.
+    workers : int | None, optional
+        Number of worker processes; defaults to the CPU count. With one
+        worker the segments run in the calling process.
+    traffic_manager : RateSource | None, optional
+        Source of time-varying arrival rates, as for ``simulate``.
+    start_time : int, optional
+        Initial simulation time in seconds.
+    discharge : DischargeMode, optional
+        How queued vehicles are released onto green lights.
+    streaming : bool, optional
+        Summarize waiting times in constant memory.
+    seed : SeedLike, optional
+        Root seed from which every segment's seed is spawned.
+    warmup : float | None, optional
+        Seconds at the start of the run to exclude; must end within the
+        first segment.
+    block_size : int, optional
+        Number of gaps and lane choices pre-sampled at a time.
+
+    Returns
+    -------
+    SummaryStatistics
+        Merged statistics of all segments.
+    """
+
+    if segments < 1:
+        raise ValueError('segments must be at least 1')
+    if lead_in < 0:
+        raise ValueError('lead_in must not be negative')
+    length = (duration - start_time) / segments
+    if warmup is not None and warmup >= length:
+        raise ValueError('The warm-up must end within the first segment')
+
+    if traffic_manager is not None:
+        rates = dict(traffic_manager.compile())
+    elif arrival_rates is not None:
+        rates = dict(arrival_rates)
+    else:
+        raise ValueError('Either arrival_rates or traffic_manager must be provided')
+
+    config = {
+        'intersection': intersection,
+        'rates': rates,
+        'start_time': start_time,
+        'duration': duration,
+        'lead_in': lead_in,
+        'warmup': warmup,
+        'discharge': DischargeMode(discharge),
+        'streaming': streaming,
+        'block_size': block_size,
+    }
+    bounds = [start_time + length * index for index in range(segments)]
+    ends = [*bounds[1:], duration]
+    seeds = seed_sequence(seed).spawn(segments)
+    jobs = [[config] * segments, bounds, ends, seeds]
+
+    workers = min(workers or os.cpu_count() or 1, segments)
+    if workers <= 1:
+        results = list(map(run_segment, *jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(run_segment, *jobs))
+    return reduce(SummaryStatistics.merge, results)
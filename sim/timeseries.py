@@ -0,0 +1,96 @@
+"""Sampling of lane queues and light states during a run.
+
+``simulate(..., sample_interval=...)`` starts a :class:`TimeSeriesRecorder`
+process next to the simulation. It writes every sample straight into
+NumPy columns allocated for the whole run, so a day at one-second
+resolution costs one ``simpy`` timeout and a few row assignments per
+sample, and the result is attached to the returned statistics as a
+:class:`~sim.models.TimeSeries`.
+"""
+
+from collections.abc import Generator
+import math
+from typing import Any
+
+import numpy as np
+
+from sim.models import TimeSeries, TrafficLightState
+from sim.runtime import LaneRuntime
+
+
+LIGHT_STATES = tuple(TrafficLightState)
+"""Light states in the order of their codes in :attr:`TimeSeries.light`."""
+
+
+class TimeSeriesRecorder:
+    """Record the lanes of a run every ``interval`` seconds."""
+
+    def __init__(
+        self,
+        lanes: dict[Any, list[LaneRuntime]],
+        start_time: float,
+        until: float,
+        interval: float,
+    ) -> None:
+        """Allocate one row per sample in ``[start_time, until)``.
+
+        Parameters
+        ----------
+        lanes : dict[Any, list[LaneRuntime]]
+            Lanes of the run by direction, e.g.
+            :attr:`IntersectionSimulation.lanes`.
+        start_time : float
+            Time of the first sample.
+        until : float
+            End of the run; no sample is taken at or after it.
+        interval : float
+            Seconds between samples.
+        """
+
+        if interval <= 0:
+            raise ValueError('The sample interval must be positive')
+        self.interval = interval
+        self.lanes = [lane for group in lanes.values() for lane in group]
+        self.labels = [
+            f'{direction}[{index}]'
+            for direction, group in lanes.items()
+            for index in range(len(group))
+        ]
+        rows = max(math.ceil((until - start_time) / interval), 0)
+        self.time = start_time + interval * np.arange(rows)
+        # Queue length, light code and cumulative departures of every lane,
+        # side by side so that a sample is a single row assignment; split
+        # and differenced into the columns by ``result``.
+        self.samples = np.empty((rows, 3 * len(self.lanes)), dtype=np.int64)
+        self.size = 0
+
+    def run(self, env) -> Generator[Any, Any, None]:
+        """Take a sample now and then every ``interval`` seconds."""
+
+        codes = {state: code for code, state in enumerate(LIGHT_STATES)}
+        columns = [(lane.queue, lane.light, lane) for lane in self.lanes]
+        samples = self.samples
+        interval = self.interval
+        for row in range(len(samples)):
+            samples[row] = [
+                value
+                for queue, light, lane in columns
+                for value in (len(queue), codes[light.state], lane.departed)
+            ]
+            self.size = row + 1
+            yield env.timeout(interval)
+
+    def result(self) -> TimeSeries:
+        """Return the samples taken so far."""
+
+        samples = self.samples[: self.size]
+        departed = samples[:, 2::3]
+        departures = np.diff(departed, axis=0, prepend=departed[:1])
+        return TimeSeries(
+            time=self.time[: self.size],
+            queue=samples[:, 0::3].astype(np.int32),
+            light=samples[:, 1::3].astype(np.uint8),
+            departures=departures.astype(np.int32),
+            lanes=self.labels,
+            states=[str(state) for state in LIGHT_STATES],
+        )
@@ -0,0 +1,141 @@
+"""Binary per-vehicle traces.
+
+A trace holds one fixed-width record per vehicle, laid out as
+:data:`TRACE_DTYPE`: the vehicle's id (numbered from 1 within its
+direction), the code of its direction in :data:`DIRECTIONS`, the index of
+its lane within that direction, and its arrival and departure times.
+Vehicles still queued when the run ends have a departure time of ``inf``.
+
+:class:`TraceWriter` fills a preallocated record buffer and writes it to
+the file in one call whenever it is full, so memory stays bounded and the
+cost per vehicle is a single buffer assignment. :func:`read_trace`
+memory-maps a trace file as a structured NumPy array.
+"""
+
+from pathlib import Path
+from types import TracebackType
+
+import numpy as np
+
+from sim.models import Direction
+from sim.runtime import LaneRuntime
+
+
+TRACE_MAGIC = b'TLTRACE1'
+"""Header identifying trace files and their record layout."""
+
+TRACE_DTYPE = np.dtype(
+    [
+        ('vehicle_id', '<i8'),
+        ('direction', 'u1'),
+        ('lane', '<u2'),
+        ('arrival', '<f8'),
+        ('departure', '<f8'),
+    ]
+)
+"""Layout of one trace record."""
+
+DIRECTIONS = tuple(Direction)
+"""Directions in the order of their codes in the ``direction`` field."""
+
+
+class TraceWriter:
+    """Buffered writer of :data:`TRACE_DTYPE` records.
+
+    Use it as a context manager, or call :meth:`close` to write the
+    remaining buffered records.
+    """
+
+    __slots__ = ('path', 'records', '_file', '_buffer', '_size', '_codes')
+
+    def __init__(self, path: str | Path, buffer_size: int = 65536) -> None:
+        """Create the trace file at ``path``, buffering ``buffer_size`` records."""
+
+        if buffer_size < 1:
+            raise ValueError('The trace buffer must hold at least one record')
+        self.path = Path(path)
+        # Records written so far, including buffered ones.
+        self.records = 0
+        self._file = open(self.path, 'wb')
+        self._file.write(TRACE_MAGIC)
+        self._buffer = np.empty(buffer_size, dtype=TRACE_DTYPE)
+        self._size = 0
+        self._codes = {direction: code for code, direction in enumerate(DIRECTIONS)}
+
+    def record(
+        self,
+        vehicle_id: int,
+        lane: LaneRuntime,
+        arrival: float,
+        departure: float,
+    ) -> None:
+        """Add the record of a vehicle that used ``lane``."""
+
+        buffer = self._buffer
+        buffer[self._size] = (
+            vehicle_id,
+            self._codes[lane.direction],
+            lane.index,
+            arrival,
+            departure,
+        )
+        self._size += 1
+        self.records += 1
+        if self._size == len(buffer):
+            self.flush()
+
+    def extend(self, records: np.ndarray) -> None:
+        """Add a whole array of :data:`TRACE_DTYPE` records."""
+
+        self.flush()
+        self._file.write(np.ascontiguousarray(records, dtype=TRACE_DTYPE).data)
+        self.records += len(records)
+
+    def flush(self) -> None:
+        """Write the buffered records to the file."""
+
+        if self._size:
+            self._file.write(self._buffer[: self._size].data)
+            self._size = 0
+
+    def close(self) -> None:
+        """Write the buffered records and close the file."""
+
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self) -> 'TraceWriter':
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+def read_trace(path: str | Path) -> np.ndarray:
+    """Return the records of the trace file at ``path``.
+
+    Parameters
+    ----------
+    path : str | Path
+        File written by :class:`TraceWriter`.
+
+    Returns
+    -------
+    numpy.ndarray
+        Read-only structured array of :data:`TRACE_DTYPE`, memory-mapped
+        from the file so that only the accessed pages are read.
+    """
+
+    path = Path(path)
+    with open(path, 'rb') as file:
+        if file.read(len(TRACE_MAGIC)) != TRACE_MAGIC:
+            raise ValueError(f'{path} is not a vehicle trace')
+    if path.stat().st_size == len(TRACE_MAGIC):
+        return np.empty(0, dtype=TRACE_DTYPE)
+    return np.memmap(path, dtype=TRACE_DTYPE, mode='r', offset=len(TRACE_MAGIC))
@@ -2,10 +2,18 @@
 
 from datetime import time
 from enum import StrEnum
+from typing import Protocol
+
+import numpy as np
+import numpy.typing as npt
 
 from sim.models.lights import Direction
 
 
+DAY = 24 * 60 * 60
+"""Length of the daily traffic cycle in seconds."""
+
+
 class TrafficPattern(StrEnum):
     """Named traffic patterns by time of day."""
 
@@ -15,9 +23,125 @@ class TrafficPattern(StrEnum):
     NIGHT = 'night'
 
 
+class RateSchedule:
+    """Piecewise-constant arrival rate repeating every ``period`` seconds.
+
+    The rate is ``rates[i]`` on ``[breakpoints[i], breakpoints[i + 1])``.
+    Lookups are binary searches over the breakpoints, and arrivals of the
+    non-homogeneous Poisson process are sampled exactly by inverting the
+    cumulative intensity ``Λ(t)``: if ``E`` is a unit-rate exponential gap,
+    the next arrival after ``t`` is ``Λ⁻¹(Λ(t) + E)``.
+
+    Parameters
+    ----------
+    breakpoints : numpy.typing.ArrayLike
+        Increasing segment starts, beginning at ``0`` and ending at
+        ``period``.
+    rates : numpy.typing.ArrayLike
+        Non-negative rate of each segment, one fewer than ``breakpoints``.
+    period : float, optional
+        Length of one cycle of the schedule.
+    """
+
+    __slots__ = ('breakpoints', 'rates', 'period', '_levels')
+
+    def __init__(
+        self,
+        breakpoints: npt.ArrayLike,
+        rates: npt.ArrayLike,
+        period: float = DAY,
+    ) -> None:
+        """Create a schedule from its segments."""
+
+        self.breakpoints = np.asarray(breakpoints, dtype=np.float64)
+        self.rates = np.asarray(rates, dtype=np.float64)
+        self.period = float(period)
+        if (
+            len(self.breakpoints) != len(self.rates) + 1
+            or self.breakpoints[0] != 0
+            or self.breakpoints[-1] != self.period
+            or np.any(np.diff(self.breakpoints) <= 0)
+        ):
+            raise ValueError('breakpoints must increase from 0 to period')
+        if np.any(self.rates < 0):
+            raise ValueError('rates must be non-negative')
+        # Cumulative intensity at each breakpoint within one period.
+        self._levels = np.concatenate(
+            ([0.0], np.cumsum(self.rates * np.diff(self.breakpoints)))
+        )
+
+    @property
+    def period_intensity(self) -> float:
+        """Return the expected number of arrivals in one period."""
+
+        return float(self._levels[-1])
+
+    def rate(self, times: npt.ArrayLike) -> np.ndarray:
+        """Return the arrival rate in effect at each of ``times``."""
+
+        phase = np.mod(times, self.period)
+        return self.rates[np.searchsorted(self.breakpoints, phase, side='right') - 1]
+
+    def cumulative(self, times: npt.ArrayLike) -> np.ndarray:
+        """Return the expected number of arrivals in ``[0, t)`` for each time."""
+
+        cycles, phase = np.divmod(np.asarray(times, dtype=np.float64), self.period)
+        segment = np.searchsorted(self.breakpoints, phase, side='right') - 1
+        return (
+            cycles * self._levels[-1]
+            + self._levels[segment]
+            + self.rates[segment] * (phase - self.breakpoints[segment])
+        )
+
+    def inverse(self, levels: npt.ArrayLike) -> np.ndarray:
+        """Return the time at which ``cumulative`` reaches each level.
+
+        A level reached just before a zero-rate segment maps to the end of
+        that segment. Levels are never reached when the schedule has no
+        arrivals at all, and map to ``inf``.
+        """
+
+        levels = np.asarray(levels, dtype=np.float64)
+        total = self._levels[-1]
+        if total == 0:
+            return np.full(levels.shape, np.inf)
+        cycles, remainder = np.divmod(levels, total)
+        # ``side='right'`` skips segments with a zero rate.
+        segment = np.searchsorted(self._levels, remainder, side='right') - 1
+        segment = np.minimum(segment, len(self.rates) - 1)
+        return (
+            cycles * self.period
+            + self.breakpoints[segment]
+            + (remainder - self._levels[segment]) / self.rates[segment]
+        )
+
+
+class RateSource(Protocol):
+    """Anything that compiles into per-direction arrival rate schedules.
+
+    ``simulate(traffic_manager=...)`` accepts any such source, e.g. a
+    :class:`TrafficPatternManager` or a
+    :class:`~sim.detector_profiles.DetectorProfile`.
+    """
+
+    def compile(self) -> dict[Direction, RateSchedule]:
+        """Return the arrival rate schedule of each direction."""
+
+
 class TrafficPatternManager:
     """Calculate arrival rates according to the active ``TrafficPattern``."""
 
+    windows: tuple[tuple[time, time, TrafficPattern], ...] = (
+        (time(7, 0), time(9, 0), TrafficPattern.MORNING_RUSH),
+        (time(16, 0), time(18, 0), TrafficPattern.EVENING_RUSH),
+        (time(23, 0), time(5, 0), TrafficPattern.NIGHT),
+    )
+    """Inclusive ``(start, end, pattern)`` windows, checked in order.
+
+    A window whose start is after its end wraps past midnight. Times in no
+    window follow ``TrafficPattern.NORMAL``.
+    """
+
     def __init__(self, base_arrival_rates: dict[Direction, float]):
         """Create the manager with baseline rates."""
 
@@ -32,12 +156,12 @@ class TrafficPatternManager:
     def get_pattern(self, current_time: time) -> TrafficPattern:
         """Return the traffic pattern active at ``current_time``."""
 
-        if time(7, 0) <= current_time <= time(9, 0):
-            return TrafficPattern.MORNING_RUSH
-        elif time(16, 0) <= current_time <= time(18, 0):
-            return TrafficPattern.EVENING_RUSH
-        elif time(23, 0) <= current_time or current_time <= time(5, 0):
-            return TrafficPattern.NIGHT
+        for start, end, pattern in self.windows:
+            if start <= end:
+                if start <= current_time <= end:
+                    return pattern
+            elif start <= current_time or current_time <= end:
+                return pattern
         return TrafficPattern.NORMAL
 
     def get_arrival_rates(self, current_time: time) -> dict[Direction, float]:
@@ -49,3 +173,35 @@ class TrafficPatternManager:
             direction: rate * multiplier
             for direction, rate in self.base_rates.items()
         }
+
+    def compile(self) -> dict[Direction, RateSchedule]:
+        """Return each direction's daily rates as a :class:`RateSchedule`.
+
+        Windows are matched at whole seconds, so a window ending at
+        ``09:00`` covers the whole second ``[09:00:00, 09:00:01)``.
+
+        Returns
+        -------
+        dict[Direction, RateSchedule]
+            Schedule of every direction in ``base_rates``.
+        """
+
+        def seconds(moment: time) -> int:
+            return moment.hour * 3600 + moment.minute * 60 + moment.second
+
+        cuts = {0, DAY}
+        for start, end, _ in self.windows:
+            cuts.update((seconds(start), seconds(end) + 1))
+        breakpoints = sorted(cut for cut in cuts if cut <= DAY)
+        multipliers = np.array(
+            [
+                self.multipliers[
+                    self.get_pattern(time(cut // 3600, cut // 60 % 60, cut % 60))
+                ]
+                for cut in breakpoints[:-1]
+            ]
+        )
+        return {
+            direction: RateSchedule(breakpoints, rate * multipliers)
+            for direction, rate in self.base_rates.items()
+        }
@@ -0,0 +1,70 @@
+"""Detection of the initial transient in simulation output."""
+
+import numpy as np
+import numpy.typing as npt
+
+from sim.models import SummaryStatistics
+
+
+def mser_truncation(values: npt.ArrayLike, batch_size: int = 5) -> int:
+    """Return how many leading observations to discard as warm-up.
+
+    Implements MSER-``batch_size`` (MSER-5 by default): ``values`` are
+    averaged in consecutive batches and the truncation point ``d`` minimizes
+    the marginal standard error
+    ``sum((Y[d:] - mean(Y[d:])) ** 2) / (k - d) ** 2`` of the ``k`` batch
+    means ``Y``. As usual, only the first half of the batches is considered,
+    since minima in the second half reflect noise rather than bias.
+
+    Parameters
+    ----------
+    values : ArrayLike
+        Observations in the order they were produced, e.g. per-vehicle
+        waiting times by departure.
+    batch_size : int, optional
+        Number of observations per batch.
+
+    Returns
+    -------
+    int
+        Number of observations to discard, a multiple of ``batch_size``.
+    """
+
+    values = np.asarray(values, dtype=np.float64)
+    batches = len(values) // batch_size
+    if batches < 2:
+        return 0
+    means = values[: batches * batch_size].reshape(batches, batch_size).mean(axis=1)
+
+    # Sums over the remaining batches ``means[d:]`` for every ``d``.
+    tail_sum = np.cumsum(means[::-1])[::-1]
+    tail_sq = np.cumsum((means**2)[::-1])[::-1]
+    remaining = np.arange(batches, 0, -1)
+    squared_error = tail_sq - tail_sum**2 / remaining
+    mser = squared_error / remaining**2
+
+    candidates = mser[: batches // 2 + 1]
+    return int(np.argmin(candidates)) * batch_size
+
+
+def truncate_warmup(
+    stats: SummaryStatistics,
+    departure_times: npt.ArrayLike,
+    start_time: float,
+) -> None:
+    """Drop the MSER-5 warm-up from ``stats`` in place.
+
+    Parameters
+    ----------
+    stats : SummaryStatistics
+        Statistics whose waiting times are in departure order.
+    departure_times : ArrayLike
+        Departure time of each recorded waiting time.
+    start_time : float
+        Start of the run, used to express the warm-up as a duration.
+    """
+
+    truncated = mser_truncation(stats.waiting_times.values)
+    if truncated:
+        warmup_end = departure_times[truncated - 1]
+        stats.truncate(truncated, warmup_time=warmup_end - start_time)
@@ -0,0 +1,114 @@
+"""Tests for the throughput benchmark suite."""
+
+import json
+
+import pytest
+
+from sim import bench
+from sim.basic_fourway_intersection import arrival_rates
+from sim.bench import (
+    BenchmarkCase,
+    BenchmarkResult,
+    benchmark_cases,
+    build_intersection,
+    compare,
+    light_changes,
+    run_benchmarks,
+    run_case,
+    save_baseline,
+)
+from sim.intersection import simulate
+
+
+def test_light_changes_counts_every_transition():
+    """Each light changes three times per 66 s cycle of the default timing."""
+    intersection = build_intersection(1)
+
+    # East-west turns red at 66 s, when north-south turns green again.
+    assert light_changes(intersection, 66) == 10
+    assert light_changes(intersection, 66.5) == 14
+    assert light_changes(intersection, 30.5) == 4
+    assert light_changes(intersection, 0.5) == 2
+
+
+def test_quick_matrix_is_a_subset():
+    """The quick matrix picks cases of the full one."""
+    full = {case.name for case in benchmark_cases()}
+    quick = {case.name for case in benchmark_cases(quick=True)}
+
+    assert len(full) == 36
+    assert quick < full
+
+
+def test_events_are_those_counted_by_the_engine(monkeypatch):
+    """Events are the arrivals, departures and light changes of the run."""
+    monkeypatch.setattr(bench, 'MIN_WALL_TIME', 0.0)
+    case = BenchmarkCase(name='tiny', duration=600, scale=1.0, lanes=2)
+    result = run_case(case)
+    stats = simulate(600, build_intersection(2), arrival_rates, seed=0, instrument=True)
+    counted = stats.engine_report.events
+
+    assert result.runs == 1
+    assert result.events == (
+        counted['arrivals'] + counted['departures'] + counted['light_changes']
+    )
+    assert result.vehicles_per_second == pytest.approx(
+        counted['arrivals'] / result.wall_time
+    )
+
+
+def test_baseline_round_trip_flags_regressions(tmp_path):
+    """A case far slower than its baseline is reported."""
+    case = BenchmarkCase(name='tiny', duration=600, scale=1.0, lanes=2)
+    report = run_benchmarks([case], isolate=False, repeats=1)
+    result = report.results[0]
+
+    path = tmp_path / 'baseline.json'
+    save_baseline(report.results, path)
+    assert json.loads(path.read_text())['events_per_second']['tiny'] > 0
+    assert compare(report.results, {'tiny': result.events_per_second}, 0.3) == []
+    slow = compare(report.results, {'tiny': 10 * result.events_per_second}, 0.3)
+    assert slow and slow[0].startswith('tiny:')
+
+
+def test_repeats_keep_the_fastest_run(monkeypatch):
+    """Of several runs of a case, the one with the most events/s is kept."""
+    case = BenchmarkCase(name='tiny', duration=600, scale=1.0, lanes=1)
+    speeds = iter([40.0, 60.0, 50.0])
+    monkeypatch.setattr(
+        bench,
+        'run_case',
+        lambda case: BenchmarkResult(
+            case=case,
+            runs=1,
+            wall_time=1.0,
+            events=60,
+            events_per_second=next(speeds),
+            vehicles_per_second=20.0,
+            peak_rss_mb=None,
+        ),
+    )
+
+    report = run_benchmarks([case], isolate=False, repeats=3)
+
+    assert [result.events_per_second for result in report.results] == [60.0]
+
+
+def test_short_cases_allow_more_noise():
+    """One-hour cases tolerate larger drops than day-long ones."""
+    results = [
+        BenchmarkResult(
+            case=BenchmarkCase(name=name, duration=duration, scale=1.0, lanes=1),
+            runs=1,
+            wall_time=1.0,
+            events=60,
+            events_per_second=60.0,
+            vehicles_per_second=20.0,
+            peak_rss_mb=None,
+        )
+        for name, duration in [('short', 3600), ('long', 86400)]
+    ]
+
+    slow = compare(results, {'short': 100.0, 'long': 100.0}, 0.3)
+
+    assert [line.split(':')[0] for line in slow] == ['long']
@@ -0,0 +1,148 @@
+"""Tests for checkpoints, resumed runs and time-segment execution."""
+
+import numpy as np
+import pytest
+import simpy
+
+from sim.basic_fourway_intersection import arrival_rates, intersection
+from sim.checkpoint import Checkpoint, resume
+from sim.intersection import IntersectionSimulation, simulate
+from sim.models import Direction, DischargeMode, Intersection, Lane
+from sim.segments import simulate_segments
+from sim.traffic_patterns import RateSchedule, TrafficPatternManager
+
+
+HEAVY = {direction: 3 * rate for direction, rate in arrival_rates.items()}
+
+
+def saturated() -> Intersection:
+    """Return a four-way intersection with two saturation-flow lanes per approach."""
+    lanes = {
+        direction: [
+            Lane(light=light, saturation_headway=2.0, startup_lost_time=2.0),
+            Lane(light=light, saturation_headway=2.5),
+        ]
+        for direction, light in intersection.lights.items()
+    }
+    return intersection.model_copy(update={'lanes': lanes})
+
+
+@pytest.mark.parametrize(
+    'config, kwargs',
+    [
+        (intersection, {'arrival_rates': HEAVY}),
+        (saturated(), {'arrival_rates': HEAVY}),
+        (
+            intersection,
+            {
+                'traffic_manager': TrafficPatternManager(arrival_rates),
+                'warmup': 'auto',
+            },
+        ),
+    ],
+)
+def test_resume_reproduces_the_run(tmp_path, config, kwargs):
+    """A run resumed from its last checkpoint ends as if never stopped."""
+    path = tmp_path / 'run.ckpt'
+    plain = simulate(4 * 3600, config, seed=1, **kwargs)
+    saved = simulate(
+        4 * 3600,
+        config,
+        seed=1,
+        checkpoint_path=path,
+        checkpoint_every=3599.5,
+        **kwargs,
+    )
+    resumed = resume(path)
+
+    assert Checkpoint.load(path).time == 4 * 3599.5
+    assert saved.to_dict() == plain.to_dict()
+    assert resumed.to_dict() == pytest.approx(plain.to_dict())
+    np.testing.assert_allclose(
+        np.sort(resumed.waiting_times), np.sort(plain.waiting_times)
+    )
+
+
+def test_resume_keeps_checkpointing(tmp_path):
+    """A resumed run keeps writing checkpoints at the new interval."""
+    path = tmp_path / 'run.ckpt'
+    simulate(
+        3600, intersection, HEAVY, seed=2, checkpoint_path=path, checkpoint_every=1000
+    )
+    resume(path, checkpoint_every=250)
+
+    assert Checkpoint.load(path).time == 3500
+
+
+def test_checkpoints_need_event_mode(tmp_path):
+    """Polling runs cannot be checkpointed."""
+    with pytest.raises(ValueError, match='DischargeMode.EVENT'):
+        simulate(
+            600,
+            intersection,
+            arrival_rates,
+            discharge=DischargeMode.POLLING,
+            checkpoint_path=tmp_path / 'run.ckpt',
+        )
+
+
+@pytest.mark.parametrize('moment', [0.5, 10, 31, 40, 65.9, 100, 1000.3, 5000])
+def test_seek_cycle_matches_a_running_cycle(moment):
+    """A cycle positioned from its start agrees with one run up to then."""
+    env = simpy.Environment()
+    running = IntersectionSimulation(env, intersection)
+    env.run(until=moment)
+    seeked = IntersectionSimulation(
+        simpy.Environment(initial_time=moment), intersection, cycle_start=0
+    )
+
+    for direction, light in running.lights.items():
+        assert seeked.lights[direction].state == light.state
+    assert seeked.phase_index == running.phase_index
+    assert seeked.phase_state == running.phase_state
+    assert seeked.next_change == pytest.approx(running.next_change)
+
+
+def test_segments_match_a_serial_run():
+    """Merged segments count every vehicle once with comparable waits."""
+    duration = 8 * 3600
+    serial = simulate(duration, intersection, HEAVY, seed=5)
+    merged = simulate_segments(
+        duration, intersection, HEAVY, segments=4, lead_in=900, workers=1, seed=5
+    )
+    expected = duration * sum(HEAVY.values())
+
+    assert merged.total_vehicles == pytest.approx(expected, rel=0.02)
+    assert len(merged.waiting_times) <= merged.total_vehicles
+    assert merged.warmup_vehicles == 0
+    assert merged.average_waiting_time() == pytest.approx(
+        serial.average_waiting_time(), rel=0.1
+    )
+
+
+def test_segments_keep_the_cycle_with_a_long_lead_in():
+    """A lead-in longer than the first segment keeps the serial signal plan."""
+    # North arrivals only during the north-south green of every cycle, so
+    # that vehicles of a segment with a shifted cycle would wait for red.
+    pulse = RateSchedule([0, 10, 25, 66], [0.0, 0.5, 0.0], period=66)
+    rates = {Direction.NORTH: pulse}
+    serial = simulate(4 * 3600, intersection, rates, seed=3)
+    merged = simulate_segments(
+        4 * 3600, intersection, rates, segments=8, lead_in=3600, workers=1, seed=3
+    )
+
+    assert serial.average_waiting_time() < 1
+    assert merged.average_waiting_time() == pytest.approx(
+        serial.average_waiting_time(), abs=0.1
+    )
+
+
+def test_segments_are_reproducible_across_workers():
+    """Segments give the same result inline and in a process pool."""
+    kwargs = {'segments': 3, 'lead_in': 600, 'seed': 9, 'warmup': 300}
+    inline = simulate_segments(7200, intersection, HEAVY, workers=1, **kwargs)
+    pooled = simulate_segments(7200, intersection, HEAVY, workers=2, **kwargs)
+
+    assert inline.to_dict() == pooled.to_dict()
+    assert inline.warmup_time == 300
+    assert inline.warmup_vehicles > 0
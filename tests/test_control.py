@@ -0,0 +1,168 @@
+"""Tests for signal controllers and the queue counts they read."""
+
+import numpy as np
+import pytest
+import simpy
+
+from sim.basic_fourway_intersection import intersection
+from sim.checkpoint import resume
+from sim.control import ActuatedController, FixedTimeController
+from sim.intersection import (
+    Engine,
+    IntersectionSimulation,
+    generate_vehicle_arrivals,
+    simulate,
+)
+from sim.models import Direction, Phase, TrafficLightCycleTime
+
+
+UNBALANCED = {
+    Direction.NORTH: 0.25,
+    Direction.SOUTH: 0.25,
+    Direction.EAST: 0.02,
+    Direction.WEST: 0.02,
+}
+
+
+def test_fixed_time_controller_keeps_the_plan():
+    """Fixed-time control reproduces a run without a controller."""
+    plain = simulate(7200, intersection, UNBALANCED, seed=4)
+    controlled = simulate(
+        7200, intersection, UNBALANCED, seed=4, controller=FixedTimeController()
+    )
+
+    np.testing.assert_array_equal(controlled.waiting_times, plain.waiting_times)
+    report = controlled.controller_report
+    assert plain.controller_report is None
+    assert report.controller == 'FixedTimeController'
+    # A green time, an extension check and the next phase per green; in
+    # two hours of 66-second cycles the first phase starts 110 times and
+    # reaches its other boundaries 109 times, like the second phase.
+    assert report.decisions == [110 + 2 * 109, 3 * 109]
+    assert all(seconds >= 0 for seconds in report.decision_time)
+
+
+def test_actuated_controller_follows_demand():
+    """Actuated control serves the busy phase longer and cuts delays."""
+    fixed = simulate(7200, intersection, UNBALANCED, seed=4)
+    actuated = simulate(
+        7200, intersection, UNBALANCED, seed=4, controller=ActuatedController()
+    )
+
+    assert actuated.total_vehicles == fixed.total_vehicles
+    assert actuated.average_waiting_time() < 0.5 * fixed.average_waiting_time()
+    # The busy north-south phase is extended far more often.
+    north_south, east_west = actuated.controller_report.decisions
+    assert north_south > 1.5 * east_west
+
+
+def test_actuated_decisions_read_queue_counts():
+    """Extensions and phase choices follow the queued vehicles."""
+    env = simpy.Environment()
+    controller = ActuatedController(min_green=5, max_green=20, extension=4)
+    simulation = IntersectionSimulation(env, intersection, controller=controller)
+    north = simulation.lanes[Direction.NORTH][0]
+    east = simulation.lanes[Direction.EAST][0]
+    env.run(until=1)
+
+    # Without demand the green ends and the cycle continues in order.
+    assert controller.extend(simulation, 0) == 0
+    assert controller.next_phase(simulation, 0) == 1
+    for vehicle_id in range(3):
+        simulation.add_vehicle(vehicle_id, north)
+    simulation.add_vehicle(3, east)
+    assert simulation.phase_queued(0) == 3
+    # North-south has the highest pressure, so it is extended and chosen
+    # next, also right after itself; east-west takes over once it leads.
+    assert controller.extend(simulation, 0) == 4
+    assert controller.next_phase(simulation, 1) == 0
+    assert controller.next_phase(simulation, 0) == 0
+    for vehicle_id in range(4, 8):
+        simulation.add_vehicle(vehicle_id, east)
+    assert controller.extend(simulation, 0) == 0
+    assert controller.next_phase(simulation, 0) == 1
+
+
+def test_actuated_control_skips_clearance_phases():
+    """Phases without lights are never extended or chosen while others queue."""
+    clearance = intersection.model_copy(deep=True)
+    clearance.phases.append(
+        Phase(lights=[], cycle_time=TrafficLightCycleTime(green=2, yellow=0))
+    )
+    env = simpy.Environment()
+    controller = ActuatedController()
+    simulation = IntersectionSimulation(env, clearance, controller=controller)
+    simulation.add_vehicle(0, simulation.lanes[Direction.NORTH][0])
+
+    assert controller.extend(simulation, 2) == 0
+    assert controller.next_phase(simulation, 1) == 0
+    result = simulate(3600, clearance, UNBALANCED, seed=4, controller=controller)
+    assert result.total_vehicles > 0
+
+
+def test_queue_counts_match_lane_queues():
+    """Light and phase queue counts always equal the lane queues."""
+    env = simpy.Environment()
+    simulation = IntersectionSimulation(
+        env, intersection, controller=ActuatedController()
+    )
+    for direction in Direction:
+        env.process(generate_vehicle_arrivals(env, simulation, direction, 0.2))
+    for moment in range(50, 2000, 50):
+        env.run(until=moment)
+        for light in simulation.lights.values():
+            assert light.queued == sum(len(lane.queue) for lane in light.lanes)
+        for index, phase in enumerate(simulation.runtime.phases):
+            assert simulation.phase_queued(index) == sum(
+                len(lane.queue) for light in phase.lights for lane in light.lanes
+            )
+
+
+def test_resumed_run_keeps_controller_and_counts(tmp_path):
+    """A resumed run keeps its controller and decision counts."""
+    path = tmp_path / 'run.ckpt'
+    controller = ActuatedController()
+    plain = simulate(3 * 3600, intersection, UNBALANCED, seed=6, controller=controller)
+    simulate(
+        3 * 3600,
+        intersection,
+        UNBALANCED,
+        seed=6,
+        controller=controller,
+        checkpoint_path=path,
+        checkpoint_every=3000,
+    )
+    resumed = resume(path)
+
+    assert resumed.to_dict() == pytest.approx(plain.to_dict())
+    assert resumed.controller_report.decisions == plain.controller_report.decisions
+
+
+def test_vectorized_engine_runs_fixed_time_control():
+    """The vectorized engine accepts fixed-time control and reports nothing."""
+    plain = simulate(3600, intersection, UNBALANCED, seed=4, engine=Engine.VECTORIZED)
+    controlled = simulate(
+        3600,
+        intersection,
+        UNBALANCED,
+        seed=4,
+        engine=Engine.VECTORIZED,
+        controller=FixedTimeController(),
+    )
+
+    np.testing.assert_array_equal(controlled.waiting_times, plain.waiting_times)
+    assert controlled.controller_report is None
+
+
+def test_controllers_need_the_event_engine():
+    """Adaptive controllers need the simpy engine and consistent green limits."""
+    with pytest.raises(ValueError, match='simpy engine'):
+        simulate(
+            600,
+            intersection,
+            UNBALANCED,
+            engine=Engine.VECTORIZED,
+            controller=ActuatedController(),
+        )
+    with pytest.raises(ValueError, match='min_green'):
+        ActuatedController(min_green=30, max_green=20)
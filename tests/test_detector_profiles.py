@@ -0,0 +1,138 @@
+"""Tests for arrival rate profiles built from detector counts."""
+
+import numpy as np
+import pytest
+
+from sim import detector_profiles
+from sim.basic_fourway_intersection import uniform_cyle_time
+from sim.detector_profiles import DetectorProfile
+from sim.intersection import simulate
+from sim.models import Direction, Intersection
+
+
+def write_csv(path, rows):
+    """Write detector ``rows`` below a ``time,direction,lane,count`` header.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        Destination file.
+    rows : list[tuple]
+        Values of each row.
+    """
+    lines = ['time,direction,lane,count']
+    lines += [','.join(str(value) for value in row) for row in rows]
+    path.write_text('\n'.join(lines) + '\n')
+
+
+def test_csv_counts_are_summed_per_direction(tmp_path):
+    """Lanes of one direction add up; rates are counts per second."""
+    path = tmp_path / 'counts.csv'
+    write_csv(
+        path,
+        [
+            (0, 'north', 1, 90),
+            (0, 'North', 2, 90),
+            (900, 'north', 1, 45),
+            (900, 'EAST', 1, 9),
+        ],
+    )
+
+    profile = DetectorProfile.from_file(path, cache_dir=tmp_path)
+    schedules = profile.compile()
+
+    assert set(schedules) == {Direction.NORTH, Direction.EAST}
+    np.testing.assert_allclose(schedules[Direction.NORTH].rates, [0.2, 0.05])
+    np.testing.assert_allclose(schedules[Direction.EAST].rates, [0.0, 0.01])
+    assert schedules[Direction.NORTH].period == 1800
+
+
+def test_csv_timestamps_keep_time_of_day(tmp_path):
+    """Timestamped records start at midnight of their first day."""
+    path = tmp_path / 'counts.csv'
+    write_csv(
+        path,
+        [
+            ('2024-03-01T00:15:00', 'South', 1, 9),
+            ('2024-03-02T00:00:00', 'South', 1, 18),
+        ],
+    )
+
+    profile = DetectorProfile.from_file(path, cache_dir=tmp_path)
+    rates = profile.counts[Direction.SOUTH] / profile.interval
+
+    assert len(rates) == 97
+    assert rates[1] == pytest.approx(0.01)
+    assert rates[96] == pytest.approx(0.02)
+
+
+@pytest.mark.parametrize(
+    'rows',
+    [
+        [(0, 'North', 1, 9), ('2024-03-01T00:15:00', 'North', 1, 9)],
+        [('2024-03-01T00:15:00', 'North', 1, 9), (900, 'North', 1, 9)],
+    ],
+)
+def test_csv_time_format_is_fixed_by_the_first_chunk(tmp_path, monkeypatch, rows):
+    """Later chunks in another time format are rejected.
+
+    Parameters
+    ----------
+    rows : list[tuple]
+        Rows whose times switch format between chunks.
+    """
+    monkeypatch.setattr(detector_profiles, 'CHUNK_ROWS', 1)
+    path = tmp_path / 'counts.csv'
+    write_csv(path, rows)
+
+    with pytest.raises(ValueError, match='all seconds or all timestamps'):
+        DetectorProfile.from_file(path, cache_dir=tmp_path)
+
+
+def test_npy_counts_are_memory_mapped(tmp_path):
+    """Per-lane arrays are summed over lanes."""
+    path = tmp_path / 'counts.npy'
+    counts = np.zeros((8, 4, 3), dtype=np.int32)
+    counts[:, 0, :] = 30
+    np.save(path, counts)
+
+    profile = DetectorProfile.from_file(path, cache_dir=tmp_path)
+
+    assert set(profile.counts) == {Direction.NORTH}
+    np.testing.assert_allclose(profile.counts[Direction.NORTH], 90)
+
+
+def test_cache_skips_parsing(tmp_path, monkeypatch):
+    """A second load of the same file reads the cached profile."""
+    path = tmp_path / 'counts.csv'
+    write_csv(path, [(0, 'West', 1, 45)])
+    first = DetectorProfile.from_file(path, cache_dir=tmp_path / 'cache')
+
+    def fail(*args):
+        raise AssertionError('file parsed again')
+
+    monkeypatch.setattr(detector_profiles, 'read_csv_counts', fail)
+    second = DetectorProfile.from_file(path, cache_dir=tmp_path / 'cache')
+
+    assert len(list((tmp_path / 'cache').glob('*.npz'))) == 1
+    np.testing.assert_array_equal(
+        second.counts[Direction.WEST], first.counts[Direction.WEST]
+    )
+
+
+def test_simulate_with_profile():
+    """A profile can replace the traffic pattern manager."""
+    profile = DetectorProfile(
+        {
+            Direction.NORTH: np.array([0.0, 360.0]),
+            Direction.EAST: np.array([90.0, 0.0]),
+        }
+    )
+    stats = simulate(
+        1800,
+        Intersection.create_basic_four_way(uniform_cyle_time),
+        traffic_manager=profile,
+        seed=3,
+    )
+
+    assert abs(stats.total_vehicles - 450) < 4 * np.sqrt(450)
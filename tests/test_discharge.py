@@ -0,0 +1,149 @@
+"""Tests comparing the polling and event-driven queue discharge modes."""
+
+import numpy as np
+import pytest
+import simpy
+
+from sim.basic_fourway_intersection import arrival_rates, uniform_cyle_time
+from sim.intersection import IntersectionSimulation, simulate
+from sim.models import (
+    Direction,
+    DischargeMode,
+    Intersection,
+    Lane,
+    TrafficLightState,
+)
+
+
+def run_mode(discharge: DischargeMode, rates: dict[Direction, float]):
+    """Simulate two hours on a fresh intersection using ``discharge``.
+
+    Parameters
+    ----------
+    discharge : DischargeMode
+        Discharge strategy under test.
+    rates : dict[Direction, float]
+        Per-direction arrival rates.
+    """
+    intersection = Intersection.create_basic_four_way(uniform_cyle_time)
+    return simulate(7200, intersection, rates, discharge=discharge, seed=7)
+
+
+@pytest.mark.parametrize('scale', [1.0, 4.0])
+def test_event_mode_matches_polling(scale):
+    """Both modes should release every vehicle at the same time.
+
+    Parameters
+    ----------
+    scale : float
+        Factor applied to the default arrival rates.
+    """
+    rates = {d: rate * scale for d, rate in arrival_rates.items()}
+    polling = run_mode(DischargeMode.POLLING, rates)
+    event = run_mode(DischargeMode.EVENT, rates)
+
+    assert event.total_vehicles == polling.total_vehicles
+    np.testing.assert_allclose(
+        np.sort(event.waiting_times), np.sort(polling.waiting_times)
+    )
+
+
+def test_green_wakes_idle_lane():
+    """A vehicle waiting at red should leave when its light turns green."""
+    intersection = Intersection.create_basic_four_way(uniform_cyle_time)
+    env = simpy.Environment()
+    sim = IntersectionSimulation(env, intersection)
+    lane = sim.lanes[Direction.EAST][0]
+
+    env.run(until=0.5)
+    assert lane.light.state == TrafficLightState.RED
+    sim.add_vehicle(1, lane)
+    env.run(until=40)
+
+    assert not lane.queue
+    # East-west turns green at 33 s; the vehicle reacts on its 1 s grid.
+    assert sim.stats.waiting_times[0] == pytest.approx(33.0)
+
+
+def saturated_intersection(headway: float, lost_time: float) -> Intersection:
+    """Return a four-way intersection whose lanes discharge at saturation flow.
+
+    Parameters
+    ----------
+    headway : float
+        Saturation headway in seconds per vehicle.
+    lost_time : float
+        Start-up lost time in seconds.
+    """
+    intersection = Intersection.create_basic_four_way(uniform_cyle_time)
+    intersection.lanes = {
+        d: [
+            Lane(
+                light=light,
+                saturation_headway=headway,
+                startup_lost_time=lost_time,
+            )
+        ]
+        for d, light in intersection.lights.items()
+    }
+    return intersection
+
+
+def test_saturation_headway_limits_green_throughput():
+    """A 30 s green should release one vehicle per headway after lost time."""
+    intersection = saturated_intersection(headway=2.0, lost_time=3.0)
+    env = simpy.Environment()
+    sim = IntersectionSimulation(env, intersection)
+    lane = sim.lanes[Direction.EAST][0]
+
+    env.run(until=0.5)
+    for vehicle_id in range(20):
+        sim.add_vehicle(vehicle_id, lane)
+    env.run(until=66)
+
+    # Green runs from 33 s to 63 s, so departures happen at 36, 38, ..., 62.
+    expected = np.arange(36.0, 63.0, 2.0) - 0.5
+    np.testing.assert_allclose(sim.stats.waiting_times, expected)
+    assert len(lane.queue) == 20 - len(expected)
+
+
+def test_saturation_headway_requires_event_mode():
+    """Polling vehicles cannot honour a saturation headway."""
+    intersection = saturated_intersection(headway=2.0, lost_time=0.0)
+    with pytest.raises(ValueError):
+        IntersectionSimulation(
+            simpy.Environment(), intersection, discharge=DischargeMode.POLLING
+        )
+
+
+def test_lights_configured_green_count_lost_time_from_start():
+    """A light configured green counts its lost time from the start of the run."""
+    intersection = saturated_intersection(headway=2.0, lost_time=3.0)
+    intersection.lights[Direction.EAST].state = TrafficLightState.GREEN
+    env = simpy.Environment()
+    sim = IntersectionSimulation(env, intersection)
+    lane = sim.lanes[Direction.EAST][0]
+
+    # East-west is green before its phase first comes around at 33 s.
+    assert lane.light.green
+    sim.add_vehicle(0, lane)
+    sim.add_vehicle(1, lane)
+    env.run(until=10)
+
+    np.testing.assert_allclose(sim.stats.waiting_times, [3.0, 5.0])
+
+
+def test_new_green_restarts_lost_time_of_waiting_lane():
+    """A green that starts while a lane waits for its headway adds lost time."""
+    intersection = saturated_intersection(headway=60.0, lost_time=10.0)
+    env = simpy.Environment()
+    sim = IntersectionSimulation(env, intersection)
+    lane = sim.lanes[Direction.NORTH][0]
+
+    sim.add_vehicle(0, lane)
+    sim.add_vehicle(1, lane)
+    env.run(until=100)
+
+    # The second vehicle is due at 70 s, but north-south turns green again
+    # at 66 s, so it may only leave after the new lost time, at 76 s.
+    np.testing.assert_allclose(sim.stats.waiting_times, [10.0, 76.0])
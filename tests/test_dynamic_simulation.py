@@ -5,17 +5,59 @@ import simpy
 import pytest
 from datetime import time
 
-from sim.basic_fourway_intersection import intersection
+from sim.basic_fourway_intersection import (
+    arrival_rates,
+    intersection,
+    uniform_cyle_time,
+)
 from sim.intersection import (
     IntersectionSimulation,
     generate_vehicle_arrivals,
+    simulate,
 )
+from sim.models import Intersection
 from sim.models.lights import Direction
 from sim.traffic_patterns import TrafficPatternManager
 
 
-def run_single_direction(start_time: time, multiplier: float, monkeypatch):
-    """Run the arrival process once and record the exponential scale.
+class UnitGenerator:
+    """Stand-in for ``numpy.random.Generator`` whose gaps are all one."""
+
+    def standard_exponential(self, size):
+        """Return ``size`` unit-rate gaps of exactly one."""
+        return np.ones(size)
+
+
+def arrival_times(start_seconds: int, base_rate: float, until: int) -> list[float]:
+    """Return the arrival times of one direction with unit exponential draws.
+
+    Each gap equals ``1 / rate`` for the rate active when it is drawn.
+
+    Parameters
+    ----------
+    start_seconds : int
+        Simulation clock time at which arrivals begin.
+    base_rate : float
+        Base arrival rate of the direction.
+    until : int
+        Time at which the run stops.
+    """
+    manager = TrafficPatternManager({Direction.NORTH: base_rate})
+    env = simpy.Environment(initial_time=start_seconds)
+    sim = IntersectionSimulation(env, intersection)
+    times = []
+    sim.add_vehicle = lambda vehicle_id, lane: times.append(env.now)
+    env.process(
+        generate_vehicle_arrivals(
+            env, sim, Direction.NORTH, base_rate, manager, rng=UnitGenerator()
+        )
+    )
+    env.run(until=until)
+    return times
+
+
+def run_single_direction(start_time: time, multiplier: float):
+    """Run the arrival process once and check the first gap.
 
     Parameters
     ----------
@@ -23,27 +65,11 @@ def run_single_direction(start_time: time, multiplier: float, monkeypatch):
         Simulation clock time used to seed the environment.
     multiplier : float
         Expected scaling factor for the base arrival rate.
-    monkeypatch : pytest.MonkeyPatch
-        Fixture used to patch ``numpy.random.exponential``.
     """
     base_rate = 0.2
-    manager = TrafficPatternManager({Direction.NORTH: base_rate})
-    scales = []
-    orig_exp = np.random.exponential
-
-    def recording_exp(scale):
-        scales.append(scale)
-        return orig_exp(scale)
-
-    monkeypatch.setattr(np.random, 'exponential', recording_exp)
     seconds = start_time.hour * 3600 + start_time.minute * 60 + start_time.second
-    env = simpy.Environment(initial_time=seconds)
-    sim = IntersectionSimulation(env, intersection)
-    env.process(
-        generate_vehicle_arrivals(env, sim, Direction.NORTH, base_rate, manager)
-    )
-    env.run(until=seconds + 1)
-    assert scales[0] == pytest.approx(1 / (base_rate * multiplier))
+    times = arrival_times(seconds, base_rate, seconds + 20)
+    assert times[0] - seconds == pytest.approx(1 / (base_rate * multiplier))
 
 
 @pytest.mark.parametrize(
@@ -55,45 +81,67 @@ def run_single_direction(start_time: time, multiplier: float, monkeypatch):
         (time(1, 0), 0.3),
     ],
 )
-def test_dynamic_rate(monkeypatch, start, multiplier):
+def test_dynamic_rate(start, multiplier):
     """Arrival rates should scale according to the active traffic pattern.
 
     Parameters
     ----------
-    monkeypatch : pytest.MonkeyPatch
-        Fixture to patch ``numpy.random.exponential``.
     start : datetime.time
         The simulation time when arrivals begin.
     multiplier : float
         Expected factor applied to the base arrival rate.
     """
-    run_single_direction(start, multiplier, monkeypatch)
-
+    run_single_direction(start, multiplier)
 
-def test_rate_changes_with_time(monkeypatch):
-    """Rates should update when the simulation time crosses a threshold.
 
-    Parameters
-    ----------
-    monkeypatch : pytest.MonkeyPatch
-        Fixture used to patch ``numpy.random.exponential``.
-    """
+def test_rate_changes_with_time():
+    """Rates should update when the simulation time crosses a threshold."""
     base_rate = 0.1
-    manager = TrafficPatternManager({Direction.NORTH: base_rate})
-    scales = []
+    start_seconds = 8 * 3600 + 59 * 60 + 59
+    times = arrival_times(start_seconds, base_rate, start_seconds + 20)
+    gaps = np.diff([start_seconds, *times])
+    # Two seconds of rush hour supply 0.4 of the first unit gap and the
+    # normal rate the remaining 0.6, so the change applies within the gap.
+    np.testing.assert_allclose(gaps, [2 + 0.6 / base_rate, 1 / base_rate])
 
-    def fixed_exp(scale):
-        scales.append(scale)
-        return 1
 
-    monkeypatch.setattr(np.random, 'exponential', fixed_exp)
-    start_seconds = 8 * 3600 + 59 * 60 + 59
-    env = simpy.Environment(initial_time=start_seconds)
-    sim = IntersectionSimulation(env, intersection)
-    env.process(
-        generate_vehicle_arrivals(env, sim, Direction.NORTH, base_rate, manager)
+def test_night_arrivals_follow_morning_rate():
+    """A long night gap must not delay the switch to the rush-hour rate."""
+    manager = TrafficPatternManager({Direction.NORTH: 0.05})
+    fresh = Intersection.create_basic_four_way(uniform_cyle_time)
+    start = 6 * 3600
+    stats = simulate(
+        start + 4 * 3600,
+        fresh,
+        traffic_manager=manager,
+        start_time=start,
+        seed=1,
     )
-    env.run(until=start_seconds + 3)
-    assert scales[0] == pytest.approx(1 / (base_rate * 2.0))
-    assert scales[1] == pytest.approx(1 / (base_rate * 2.0))
-    assert scales[2] == pytest.approx(1 / base_rate)
+    expected = 0.05 * (3600 + 2 * 7201 + 1.0 * 2799)
+    assert abs(stats.total_vehicles - expected) < 4 * np.sqrt(expected)
+
+
+def test_block_size_does_not_change_gaps():
+    """Gaps and single-lane runs do not depend on the block size."""
+
+    def run(block_size):
+        fresh = Intersection.create_basic_four_way(uniform_cyle_time)
+        return simulate(1800, fresh, arrival_rates, seed=4, block_size=block_size)
+
+    assert run(4096).to_dict() == run(7).to_dict()
+
+
+def test_seeded_runs_are_reproducible():
+    """Runs with the same seed should match despite other global draws."""
+
+    def run(seed):
+        fresh = Intersection.create_basic_four_way(uniform_cyle_time)
+        return simulate(1800, fresh, arrival_rates, seed=seed)
+
+    first = run(5)
+    np.random.random(100)
+    second = run(5)
+    other = run(6)
+
+    assert first.to_dict() == second.to_dict()
+    assert first.to_dict() != other.to_dict()
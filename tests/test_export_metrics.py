@@ -4,15 +4,13 @@ import pandas as pd
 from pathlib import Path
 
 from sim.intersection import simulate
-import numpy as np
 from sim.basic_fourway_intersection import intersection, arrival_rates
 from sim.traffic_patterns import TrafficPatternManager
 
 
 def test_to_csv(tmp_path):
-    np.random.seed(42)
     manager = TrafficPatternManager(arrival_rates)
-    stats = simulate(100, intersection, traffic_manager=manager, start_time=0)
+    stats = simulate(100, intersection, traffic_manager=manager, start_time=0, seed=42)
     output = tmp_path / "out.csv"
     stats.to_csv(output)
 
@@ -0,0 +1,67 @@
+"""Tests for the opt-in engine instrumentation."""
+
+import pstats
+
+import pytest
+
+from sim.basic_fourway_intersection import arrival_rates, intersection
+from sim.bench import light_changes
+from sim.intersection import Engine, simulate
+from sim.models import DischargeMode
+
+
+def test_counters_match_statistics():
+    """Instrumented runs count what they record and change nothing else."""
+    plain = simulate(7200, intersection, arrival_rates, seed=4)
+    stats = simulate(7200, intersection, arrival_rates, seed=4, instrument=True)
+    report = stats.engine_report
+
+    assert plain.engine_report is None
+    assert stats.to_dict() == plain.to_dict()
+    assert report.events['arrivals'] == stats.total_vehicles
+    assert report.events['departures'] == len(stats.waiting_times)
+    assert report.events['light_changes'] == light_changes(intersection, 7200)
+    assert report.simpy_events > report.events['arrivals']
+    assert report.peak_event_queue > 0
+    assert set(report.peak_lane_queues) == {
+        'North[0]',
+        'South[0]',
+        'East[0]',
+        'West[0]',
+    }
+    assert len(report.wall_time_per_hour) == 2
+
+
+def test_polling_checks_every_second():
+    """Polling vehicles check their light far more often than lanes do."""
+    kwargs = {'seed': 4, 'instrument': True}
+    event = simulate(3600, intersection, arrival_rates, **kwargs)
+    polling = simulate(
+        3600, intersection, arrival_rates, discharge=DischargeMode.POLLING, **kwargs
+    )
+
+    assert polling.to_dict() == event.to_dict()
+    assert (
+        polling.engine_report.events['queue_checks']
+        > 5 * event.engine_report.events['queue_checks']
+    )
+    assert (
+        polling.engine_report.peak_lane_queues == event.engine_report.peak_lane_queues
+    )
+
+
+def test_profile_is_written(tmp_path):
+    """Profiling dumps statistics readable by ``pstats``."""
+    path = tmp_path / 'run.prof'
+    stats = simulate(600, intersection, arrival_rates, seed=1, profile_path=path)
+
+    assert stats.engine_report.profile_path == str(path)
+    assert pstats.Stats(str(path)).total_calls > 0
+
+
+def test_vectorized_engine_cannot_be_instrumented():
+    """The array engine has no events to count."""
+    with pytest.raises(ValueError):
+        simulate(
+            600, intersection, arrival_rates, engine=Engine.VECTORIZED, instrument=True
+        )
@@ -0,0 +1,98 @@
+"""Tests for the mesoscopic cell-transmission model."""
+
+import numpy as np
+import pytest
+
+from sim.basic_fourway_intersection import (
+    arrival_rates,
+    intersection,
+    uniform_cyle_time,
+)
+from sim.intersection import simulate
+from sim.mesoscopic import simulate_mesoscopic
+from sim.models import Direction, IntersectionNetwork, Lane
+from sim.network import simulate_network
+from sim.traffic_patterns import TrafficPatternManager
+
+
+SINGLE = IntersectionNetwork(
+    intersections={'a': intersection}, arrival_rates={'a': arrival_rates}
+)
+
+
+def test_single_intersection_delay_matches_event_engine():
+    """The average delay of one intersection agrees with the event engine."""
+    estimate = simulate_mesoscopic(36000, SINGLE)
+    stats = simulate(36000, intersection, arrival_rates, seed=3)
+
+    assert estimate.entered == pytest.approx(36000 * sum(arrival_rates.values()))
+    assert estimate.exited == pytest.approx(estimate.departures.sum())
+    assert estimate.average_waiting_time() == pytest.approx(
+        stats.average_waiting_time(), rel=0.1
+    )
+
+
+def test_grid_delay_matches_network_engine():
+    """Grid arrivals and delays agree with the network engine."""
+    network = IntersectionNetwork.grid(4, 4, uniform_cyle_time)
+
+    estimate = simulate_mesoscopic(7200, network)
+    stats = simulate_network(7200, network, seed=3)
+
+    assert estimate.entered == pytest.approx(stats.entered, rel=0.1)
+    assert estimate.average_waiting_time() == pytest.approx(
+        stats.total().average_waiting_time(), rel=0.1
+    )
+    assert set(estimate.average_waiting_times()) == set(network.intersections)
+
+
+def test_flow_reaches_next_intersection_after_travel_time():
+    """Flow leaving a lane arrives downstream one travel time later."""
+    network = IntersectionNetwork.grid(1, 2, uniform_cyle_time, travel_time=40)
+    network = network.model_copy(
+        update={'arrival_rates': {'0,0': {Direction.WEST: 0.1}}}
+    )
+
+    # Flow leaves at the start of the east-west green at 33 s.
+    early = simulate_mesoscopic(70, network)
+    late = simulate_mesoscopic(600, network)
+
+    np.testing.assert_array_equal(early.arrivals, [7.0, 0.0])
+    assert late.arrivals[1] > 0
+    assert late.exited == pytest.approx(late.departures[1])
+
+
+def test_saturation_headway_limits_discharge():
+    """Green lanes discharge at most at their saturation flow."""
+    lanes = {
+        direction: [Lane(light=light, saturation_headway=3.0)]
+        for direction, light in intersection.lights.items()
+    }
+    saturated = IntersectionNetwork(
+        intersections={'a': intersection.model_copy(update={'lanes': lanes})},
+        arrival_rates={'a': {direction: 0.5 for direction in Direction}},
+    )
+
+    estimate = simulate_mesoscopic(6600, saturated)
+
+    # 100 cycles with 30 s of green per direction at one vehicle per 3 s.
+    assert estimate.departures[0] == pytest.approx(4 * 100 * 10)
+
+
+def test_traffic_managers_replace_constant_rates():
+    """Time-of-day managers set the arrival rates of their intersections."""
+    manager = TrafficPatternManager(arrival_rates)
+    network = IntersectionNetwork(intersections={'a': intersection})
+
+    estimate = simulate_mesoscopic(86400, network, traffic_managers={'a': manager})
+
+    expected = sum(
+        float(schedule.cumulative(86400)) for schedule in manager.compile().values()
+    )
+    assert estimate.entered == pytest.approx(expected)
+
+
+def test_rejects_steps_longer_than_a_cycle():
+    """A step longer than a signal cycle is rejected."""
+    with pytest.raises(ValueError, match='cycle'):
+        simulate_mesoscopic(3600, SINGLE, step=100)
@@ -0,0 +1,176 @@
+"""Tests for waiting-time recording and summary statistics."""
+
+import pickle
+
+import numpy as np
+import pytest
+
+from sim.basic_fourway_intersection import arrival_rates, uniform_cyle_time
+from sim.intersection import simulate
+from sim.models import Intersection, SummaryStatistics
+from sim.models.metrics import WaitingTimeBuffer, WaitingTimeSketch
+
+
+def test_buffer_grows_past_initial_capacity():
+    """Appending beyond the initial capacity should keep every value."""
+    buffer = WaitingTimeBuffer(capacity=4)
+    for value in range(10):
+        buffer.add(value)
+    buffer.extend([10.0, 11.0])
+
+    assert len(buffer) == 12
+    np.testing.assert_array_equal(buffer, np.arange(12.0))
+
+
+def test_buffer_pickles_only_recorded_values():
+    """Pickled buffers should round-trip without their spare capacity."""
+    buffer = WaitingTimeBuffer([1.0, 2.0], capacity=1_000_000)
+    restored = pickle.loads(pickle.dumps(buffer))
+
+    np.testing.assert_array_equal(restored, [1.0, 2.0])
+    assert len(pickle.dumps(buffer)) < 10_000
+
+
+def test_summary_accepts_array_like_waiting_times():
+    """Constructing statistics from plain arrays should still work."""
+    stats = SummaryStatistics(total_vehicles=4, waiting_times=[4.0, 0.0, 2.0])
+
+    assert isinstance(stats.waiting_times, WaitingTimeBuffer)
+    assert stats.average_waiting_time() == pytest.approx(1.5)
+    assert stats.total_waiting_time() == pytest.approx(6.0)
+    assert stats.max_waiting_time() == pytest.approx(4.0)
+    assert stats.min_waiting_time() == pytest.approx(0.0)
+    assert stats.median_waiting_time() == pytest.approx(2.0)
+    assert stats.variance_waiting_time() == pytest.approx(np.var([4, 0, 2]))
+
+
+@pytest.fixture
+def waits():
+    """Return exponential waiting times, some beyond the histogram range.
+
+    Returns
+    -------
+    numpy.ndarray
+        Sample of 20,000 waiting times.
+    """
+    return np.random.default_rng(3).exponential(30.0, size=20_000)
+
+
+def test_sketch_matches_exact_statistics(waits):
+    """Streaming moments are exact and the median is within one bin.
+
+    Parameters
+    ----------
+    waits : numpy.ndarray
+        Sample waiting times.
+    """
+    exact = SummaryStatistics(total_vehicles=len(waits), waiting_times=waits)
+    streaming = SummaryStatistics.streaming(bin_width=0.5, bins=200)
+    for value in waits[:1000]:
+        streaming.waiting_times.add(value)
+    streaming.waiting_times.extend(waits[1000:])
+    streaming.total_vehicles = len(waits)
+
+    for key, value in exact.to_dict().items():
+        tolerance = 0.5 if key == 'median_waiting_time' else 1e-6
+        assert streaming.to_dict()[key] == pytest.approx(value, rel=1e-9, abs=tolerance)
+
+
+def test_sketch_median_beyond_an_hour():
+    """Waits longer than the linear bins keep a small relative error."""
+    waits = np.random.default_rng(5).uniform(1800.0, 5 * 3600.0, size=20_000)
+    sketch = WaitingTimeSketch()
+    for value in waits[:1000]:
+        sketch.add(value)
+    sketch.extend(waits[1000:])
+
+    assert np.median(waits) > 3600
+    assert sketch.overflow == 0
+    assert sketch.median() == pytest.approx(np.median(waits), rel=0.01)
+    assert sketch.quantile(0.95) == pytest.approx(np.quantile(waits, 0.95), rel=0.01)
+
+
+def test_sketch_memory_is_constant(waits):
+    """Recording more values should not grow the sketch.
+
+    Parameters
+    ----------
+    waits : numpy.ndarray
+        Sample waiting times.
+    """
+    sketch = WaitingTimeSketch()
+    size = sketch.counts.nbytes
+    sketch.extend(waits)
+    sketch.extend(waits)
+    assert sketch.counts.nbytes == size
+    assert len(sketch) == 2 * len(waits)
+
+
+def test_merged_sketches_equal_single_sketch(waits):
+    """Merging per-run sketches should equal sketching all values at once.
+
+    Parameters
+    ----------
+    waits : numpy.ndarray
+        Sample waiting times.
+    """
+    first = SummaryStatistics.streaming()
+    first.waiting_times.extend(waits[:5000])
+    first.total_vehicles = 5000
+    second = SummaryStatistics.streaming()
+    second.waiting_times.extend(waits[5000:])
+    second.total_vehicles = len(waits) - 5000
+    whole = SummaryStatistics.streaming()
+    whole.waiting_times.extend(waits)
+    whole.total_vehicles = len(waits)
+
+    merged = first.merge(second)
+
+    np.testing.assert_array_equal(
+        merged.waiting_times.counts, whole.waiting_times.counts
+    )
+    for key, value in whole.to_dict().items():
+        assert merged.to_dict()[key] == pytest.approx(value)
+
+
+def test_streaming_summary_exports(tmp_path, capsys, waits):
+    """CSV export and the printed summary should work for streaming stats.
+
+    Parameters
+    ----------
+    tmp_path : pathlib.Path
+        Temporary directory for the CSV file.
+    capsys : pytest.CaptureFixture
+        Fixture capturing printed output.
+    waits : numpy.ndarray
+        Sample waiting times.
+    """
+    stats = SummaryStatistics.streaming()
+    stats.waiting_times.extend(waits)
+    stats.total_vehicles = len(waits)
+
+    stats.to_csv(tmp_path / 'out.csv')
+    stats.show_summary()
+
+    assert 'Median waiting time' in capsys.readouterr().out
+    assert (tmp_path / 'out.csv').read_text().startswith('total_vehicles,')
+
+
+def test_streaming_simulation_matches_exact():
+    """A streaming run should report the same moments as an exact run."""
+    results = []
+    for streaming in (False, True):
+        intersection = Intersection.create_basic_four_way(uniform_cyle_time)
+        results.append(
+            simulate(3600, intersection, arrival_rates, streaming=streaming, seed=11)
+        )
+    exact, streaming = results
+
+    assert isinstance(streaming.waiting_times, WaitingTimeSketch)
+    assert streaming.total_vehicles == exact.total_vehicles
+    assert streaming.average_waiting_time() == pytest.approx(
+        exact.average_waiting_time()
+    )
+    assert streaming.variance_waiting_time() == pytest.approx(
+        exact.variance_waiting_time()
+    )
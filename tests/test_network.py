@@ -0,0 +1,137 @@
+"""Tests for networks of linked intersections."""
+
+import json
+
+import numpy as np
+import pydantic
+import pytest
+import simpy
+
+from sim.basic_fourway_intersection import intersection, uniform_cyle_time
+from sim.models import Direction, IntersectionNetwork, Link
+from sim.network import NetworkSimulation, simulate_network
+
+
+def test_grid_links_neighbours_and_feeds_boundary():
+    """A grid links each pair of neighbours and feeds its boundary approaches."""
+    network = IntersectionNetwork.grid(3, 4, uniform_cyle_time, arrival_rate=0.1)
+
+    assert len(network.intersections) == 12
+    # Two directed links per pair of horizontal or vertical neighbours.
+    assert len(network.links) == 2 * (3 * 3 + 4 * 2)
+    assert network.arrival_rates['0,0'] == {
+        Direction.NORTH: 0.1,
+        Direction.WEST: 0.1,
+    }
+    assert '1,1' not in network.arrival_rates
+    link = next(link for link in network.links if link.source == '1,1')
+    assert link.approach == link.exit.opposite()
+
+
+def test_from_json_expands_cycle_times(tmp_path):
+    """Cycle-time shorthands in a topology file become basic intersections."""
+    path = tmp_path / 'network.json'
+    path.write_text(
+        json.dumps(
+            {
+                'intersections': {
+                    'a': {'green': 20, 'yellow': 4},
+                    'b': json.loads(intersection.model_dump_json()),
+                },
+                'links': [
+                    {
+                        'source': 'a',
+                        'exit': 'East',
+                        'target': 'b',
+                        'approach': 'West',
+                        'travel_time': 15,
+                    }
+                ],
+                'arrival_rates': {'a': {'West': 0.1}},
+            }
+        )
+    )
+
+    network = IntersectionNetwork.from_json(path)
+
+    assert network.intersections['a'].phases[0].cycle_time.green == 20
+    assert network.intersections['b'] == intersection
+    assert network.links[0].exit == Direction.EAST
+
+
+def test_rejects_unknown_intersections_and_duplicate_exits():
+    """Links must join known intersections and leave each exit only once."""
+    link = Link(
+        source='a',
+        exit=Direction.EAST,
+        target='b',
+        approach=Direction.WEST,
+        travel_time=10,
+    )
+    with pytest.raises(pydantic.ValidationError, match='unknown'):
+        IntersectionNetwork(intersections={'a': intersection}, links=[link])
+    with pytest.raises(pydantic.ValidationError, match='Several links'):
+        IntersectionNetwork(
+            intersections={'a': intersection, 'b': intersection},
+            links=[link, link],
+        )
+
+
+def test_vehicle_travels_along_link():
+    """A departing vehicle reaches the next intersection one travel time later."""
+    network = IntersectionNetwork.grid(1, 2, uniform_cyle_time, travel_time=40)
+    env = simpy.Environment()
+    simulation = NetworkSimulation(
+        env, network.model_copy(update={'arrival_rates': {}})
+    )
+    first = simulation.intersections['0,0']
+    first.add_vehicle(1, first.lanes[Direction.WEST][0])
+
+    env.run(until=200)
+
+    # Leaves at the start of the east-west green at 33 s, reaches the next
+    # intersection at 73 s during its red and leaves on the next green.
+    np.testing.assert_array_equal(first.stats.waiting_times, [33.0])
+    np.testing.assert_array_equal(
+        simulation.intersections['0,1'].stats.waiting_times, [26.0]
+    )
+    assert simulation.statistics().exited == 1
+
+
+def test_network_conserves_vehicles():
+    """Every vehicle that entered has left, is queued or is on a link."""
+    network = IntersectionNetwork.grid(3, 3, uniform_cyle_time)
+    env = simpy.Environment()
+    simulation = NetworkSimulation(env, network, seed=5)
+
+    env.run(until=1800)
+
+    stats = simulation.statistics()
+    queued = sum(
+        len(lane.queue)
+        for node in simulation.intersections.values()
+        for lanes in node.lanes.values()
+        for lane in lanes
+    )
+    travelling = sum(
+        len(link.queue)
+        for node in simulation.intersections.values()
+        for link in node.exits.values()
+    )
+    assert stats.entered > 0
+    assert stats.entered == stats.exited + queued + travelling
+    assert stats.total().total_vehicles > stats.entered
+
+
+def test_simulate_network_is_reproducible():
+    """Runs with the same seed agree, streaming or not."""
+    network = IntersectionNetwork.grid(2, 2, uniform_cyle_time)
+
+    first = simulate_network(900, network, seed=11)
+    second = simulate_network(900, network, seed=11, streaming=True)
+
+    assert first.entered == second.entered
+    assert first.exited == second.exited
+    assert first.total().average_waiting_time() == pytest.approx(
+        second.total().average_waiting_time()
+    )
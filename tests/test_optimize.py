@@ -0,0 +1,71 @@
+"""Tests for the signal timing optimizer."""
+
+from sim.basic_fourway_intersection import arrival_rates, intersection
+from sim.models import TrafficLightCycleTime
+from sim.optimize import optimize_timings, timing_grid, with_cycle_times
+
+
+def test_timing_grid_includes_phase_splits():
+    """Independent greens per phase should multiply the grid size."""
+    split = timing_grid(intersection, [20, 30, 40], [3, 4])
+    shared = timing_grid(intersection, [20, 30, 40], [3, 4], split=False)
+
+    assert len(split) == 3 * 3 * 2
+    assert len(shared) == 3 * 2
+    assert all(plan[0] == plan[1] for plan in shared)
+
+
+def test_with_cycle_times_leaves_template_untouched():
+    """Candidates are copies with their own phase timings."""
+    original = [phase.cycle_time for phase in intersection.phases]
+    plan = [
+        TrafficLightCycleTime(green=10, yellow=2),
+        TrafficLightCycleTime(green=50, yellow=5),
+    ]
+    candidate = with_cycle_times(intersection, plan)
+
+    assert [phase.cycle_time for phase in candidate.phases] == plan
+    assert [phase.cycle_time for phase in intersection.phases] == original
+    assert (
+        candidate.phases[0].lights[0]
+        is candidate.lights[candidate.phases[0].lights[0].source]
+    )
+
+
+def test_grid_ranks_by_metric_and_ignores_worker_count():
+    """Grid search ranks plans by mean wait, identically for any pool size."""
+    candidates = timing_grid(intersection, [15, 45], [3], split=False)
+    kwargs = dict(strategy='grid', replications=3, seed=5)
+    serial = optimize_timings(
+        intersection, candidates, 900, arrival_rates, workers=1, **kwargs
+    )
+    parallel = optimize_timings(
+        intersection, candidates, 900, arrival_rates, workers=2, **kwargs
+    )
+
+    means = [
+        c.results.intervals['average_waiting_time'].mean for c in serial.candidates
+    ]
+    assert means == sorted(means)
+    assert serial.model_dump() == parallel.model_dump()
+    assert serial.simulated_seconds == 2 * 3 * 900
+
+
+def test_successive_halving_focuses_replications_on_the_best():
+    """The winner receives the full budget and losers fewer replications."""
+    candidates = timing_grid(intersection, [15, 30, 45], [3])
+    result = optimize_timings(
+        intersection,
+        candidates,
+        600,
+        arrival_rates,
+        strategy='halving',
+        replications=8,
+        workers=1,
+        seed=1,
+    )
+
+    counts = [c.results.replications for c in result.candidates]
+    assert counts[0] == 8
+    assert max(counts[1:]) < 8
+    assert len(result.candidates) == len(candidates)
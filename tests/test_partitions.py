@@ -0,0 +1,50 @@
+"""Tests for multi-process partitioned network simulation."""
+
+import numpy as np
+import pytest
+
+from sim.basic_fourway_intersection import uniform_cyle_time
+from sim.models import IntersectionNetwork
+from sim.network import simulate_network
+from sim.partitions import partition_network, simulate_partitioned
+
+
+NETWORK = IntersectionNetwork.grid(3, 4, uniform_cyle_time, travel_time=30)
+
+
+def test_partition_network_splits_into_connected_groups():
+    """Partitions are equal, deterministic bands covering every intersection."""
+    partitions = partition_network(NETWORK, 3)
+
+    assert [len(partition) for partition in partitions] == [4, 4, 4]
+    assert sorted(sum(partitions, [])) == sorted(NETWORK.intersections)
+    assert partition_network(NETWORK, 3) == partitions
+    with pytest.raises(ValueError):
+        partition_network(NETWORK, 13)
+
+
+@pytest.mark.parametrize(
+    'partitions',
+    [2, [[f'{row},{column}' for column in range(4)] for row in range(3)]],
+)
+def test_partitioned_run_matches_single_process(partitions):
+    """Partitioned runs give the waiting times of a single-process run."""
+    expected = simulate_network(1800, NETWORK, seed=7)
+
+    result = simulate_partitioned(1800, NETWORK, partitions=partitions, seed=7)
+
+    assert result.entered == expected.entered
+    assert result.exited == expected.exited
+    assert list(result.intersections) == list(expected.intersections)
+    for name, stats in expected.intersections.items():
+        np.testing.assert_array_equal(
+            np.sort(result.intersections[name].waiting_times),
+            np.sort(stats.waiting_times),
+        )
+        assert result.intersections[name].total_vehicles == stats.total_vehicles
+
+
+def test_rejects_incomplete_partitions():
+    """Every intersection must be assigned to a partition."""
+    with pytest.raises(ValueError, match='exactly one partition'):
+        simulate_partitioned(600, NETWORK, partitions=[['0,0', '0,1']])
@@ -0,0 +1,119 @@
+"""Tests for parallel replications and their confidence intervals."""
+
+import math
+
+import pytest
+
+from sim.basic_fourway_intersection import arrival_rates, intersection
+from sim.replications import (
+    confidence_interval,
+    iter_replications,
+    simulate_replications,
+    simulate_until_precision,
+    summarize_replications,
+    t_quantile,
+)
+
+
+@pytest.mark.parametrize(
+    'df, expected',
+    [(1, 12.706), (2, 4.303), (4, 2.776), (9, 2.262), (29, 2.045)],
+)
+def test_t_quantile_matches_table(df, expected):
+    """The 97.5% t quantile should match published tables.
+
+    Parameters
+    ----------
+    df : int
+        Degrees of freedom.
+    expected : float
+        Tabulated quantile.
+    """
+    assert t_quantile(0.975, df) == pytest.approx(expected, abs=2e-3)
+
+
+def test_confidence_interval_of_known_samples():
+    """The interval should be centred on the mean with the t half-width."""
+    interval = confidence_interval([1.0, 2.0, 3.0, 4.0, 5.0])
+
+    assert interval.mean == pytest.approx(3.0)
+    assert interval.half_width == pytest.approx(2.776 * math.sqrt(2.5 / 5), rel=1e-3)
+    assert interval.lower < interval.mean < interval.upper
+
+
+def test_results_do_not_depend_on_worker_count():
+    """Replications are seeded by index, not by the process that runs them."""
+    serial = simulate_replications(
+        4, 900, intersection, arrival_rates, workers=1, seed=9
+    )
+    parallel = simulate_replications(
+        4, 900, intersection, arrival_rates, workers=2, seed=9
+    )
+
+    assert serial.summaries == parallel.summaries
+    assert set(serial.intervals) == set(serial.summaries[0])
+
+
+def test_replications_need_at_least_one_run():
+    """Empty replication sets are rejected before anything runs."""
+    with pytest.raises(ValueError, match='at least 1'):
+        simulate_replications(0, 900, intersection, arrival_rates, workers=1)
+    with pytest.raises(ValueError, match='At least one replication'):
+        summarize_replications([])
+
+
+def test_summaries_are_plain_dicts_unless_requested():
+    """Only summaries travel back unless full statistics are requested."""
+    ((_, summary),) = iter_replications(
+        1, 300, intersection, arrival_rates, workers=1, seed=1
+    )
+    ((_, stats),) = iter_replications(
+        1, 300, intersection, arrival_rates, workers=1, seed=1, keep_stats=True
+    )
+
+    assert isinstance(summary, dict)
+    assert stats.to_dict() == summary
+
+
+def test_sequential_stopping_reaches_target():
+    """A loose target should stop early and report the budget consumed."""
+    results = simulate_until_precision(
+        2.0, 900, intersection, arrival_rates, workers=1, seed=4
+    )
+
+    assert results.converged
+    assert results.intervals['average_waiting_time'].half_width <= 2.0
+    assert results.simulated_seconds == results.replications * 900
+
+
+def test_sequential_stopping_counts_discarded_replications():
+    """Replications running at the stopping point count towards the budget."""
+    serial = simulate_until_precision(
+        2.0, 900, intersection, arrival_rates, workers=1, seed=4
+    )
+    parallel = simulate_until_precision(
+        2.0, 900, intersection, arrival_rates, workers=2, seed=4
+    )
+
+    assert parallel.summaries == serial.summaries
+    assert serial.discarded == 0
+    # How many were running at the stopping point depends on timing.
+    assert (
+        parallel.simulated_seconds == (parallel.replications + parallel.discarded) * 900
+    )
+    assert parallel.replications + parallel.discarded <= 1000
+
+
+def test_sequential_stopping_is_deterministic_and_bounded():
+    """An unreachable target exhausts the budget identically for any worker count."""
+    kwargs = dict(max_simulated_seconds=3600, seed=4)
+    serial = simulate_until_precision(
+        1e-6, 600, intersection, arrival_rates, workers=1, **kwargs
+    )
+    parallel = simulate_until_precision(
+        1e-6, 600, intersection, arrival_rates, workers=2, **kwargs
+    )
+
+    assert not serial.converged
+    assert serial.replications == 6
+    assert serial.summaries == parallel.summaries
@@ -0,0 +1,53 @@
+"""Tests for the compiled runtime model of an intersection."""
+
+from sim.basic_fourway_intersection import (
+    arrival_rates,
+    intersection,
+    uniform_cyle_time,
+)
+from sim.intersection import simulate, simulate_many
+from sim.models import Direction, Intersection, Lane, TrafficLightState
+from sim.runtime import compile_intersection
+
+
+def test_compile_links_lights_lanes_and_phases():
+    """Phases and lanes share the runtime light of their direction."""
+    intersection = Intersection.create_basic_four_way(
+        uniform_cyle_time, light_state=TrafficLightState.GREEN
+    )
+    intersection.lanes[Direction.EAST].append(
+        Lane(light=intersection.lights[Direction.EAST], saturation_headway=2.0)
+    )
+
+    runtime = compile_intersection(intersection, now=5.0)
+    east = runtime.lights[Direction.EAST]
+
+    assert runtime.phases[1].lights[0] is east
+    assert east.lanes == runtime.lanes[Direction.EAST]
+    assert [lane.saturation_headway for lane in east.lanes] == [None, 2.0]
+    assert east.green and east.green_since == 5.0
+
+
+def test_simulation_leaves_configuration_untouched():
+    """Runs mutate only their runtime copy, so they can be repeated."""
+    intersection = Intersection.create_basic_four_way(uniform_cyle_time)
+    before = intersection.model_dump()
+
+    first = simulate(3600, intersection, arrival_rates, seed=1)
+    second = simulate(3600, intersection, arrival_rates, seed=1)
+
+    assert intersection.model_dump() == before
+    assert first.to_dict() == second.to_dict()
+
+
+def test_simulate_many_matches_sequential_runs():
+    """Concurrent runs on a shared template match sequential ones."""
+    seeds = [1, 2, 3, 4, 5, 6]
+    concurrent = simulate_many(
+        3600, intersection, arrival_rates, seeds=seeds, workers=3
+    )
+    sequential = [
+        simulate(3600, intersection, arrival_rates, seed=seed) for seed in seeds
+    ]
+
+    assert [s.to_dict() for s in concurrent] == [s.to_dict() for s in sequential]
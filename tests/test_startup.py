@@ -0,0 +1,47 @@
+"""Import-time budget of the simulation engine."""
+
+from pathlib import Path
+import subprocess
+import sys
+
+
+ROOT = Path(__file__).parent.parent
+
+IMPORT_BUDGET = 0.8
+"""Seconds allowed for ``import sim.intersection`` in a fresh interpreter."""
+
+DEFERRED = ('matplotlib', 'pandas')
+"""Packages that must only be imported when plotting or exporting CSV."""
+
+
+def import_times(module: str) -> dict[str, float]:
+    """Return the cumulative import time in seconds of every loaded module.
+
+    Parameters
+    ----------
+    module : str
+        Module imported in a fresh interpreter with ``-X importtime``.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.removeprefix('import time:').split('|')
+        times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+def test_engine_import_skips_plotting_and_export():
+    """Plotting and CSV dependencies are loaded lazily."""
+    times = import_times('sim.intersection')
+
+    loaded = {name.split('.')[0] for name in times}
+    assert loaded.isdisjoint(DEFERRED)
+    assert times['sim.intersection'] < IMPORT_BUDGET
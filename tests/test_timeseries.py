@@ -0,0 +1,81 @@
+"""Tests for the sampled time series of queues and light states."""
+
+import numpy as np
+import pytest
+
+from sim.basic_fourway_intersection import arrival_rates, intersection
+from sim.intersection import Engine, simulate
+from sim.models import DischargeMode, TimeSeries
+
+
+def test_sampling_leaves_results_unchanged():
+    """The sampled columns agree with the run and do not perturb it."""
+    plain = simulate(3600, intersection, arrival_rates, seed=2)
+    stats = simulate(3600, intersection, arrival_rates, seed=2, sample_interval=1)
+    series = stats.timeseries
+
+    assert plain.timeseries is None
+    assert stats.to_dict() == plain.to_dict()
+    assert len(series) == 3600
+    np.testing.assert_array_equal(series.time, np.arange(3600.0))
+    assert series.queue.shape == series.light.shape == (3600, 4)
+    assert series.lanes.tolist() == ['North[0]', 'South[0]', 'East[0]', 'West[0]']
+    assert series.departures.sum() <= len(stats.waiting_times)
+    assert series.queue.min() >= 0
+
+
+def test_light_codes_follow_the_phases():
+    """North starts green, turns yellow after 30 s and red after 33 s."""
+    stats = simulate(120, intersection, arrival_rates, seed=1, sample_interval=1)
+    series = stats.timeseries
+    north = series.states[series.column('light', 'North[0]')]
+
+    assert north[:30].tolist() == ['Green'] * 30
+    assert north[30:33].tolist() == ['Yellow'] * 3
+    assert north[33] == 'Red'
+
+
+def test_polling_mode_matches_event_mode():
+    """Both discharge modes produce the same time series."""
+    event = simulate(1800, intersection, arrival_rates, seed=5, sample_interval=2)
+    polling = simulate(
+        1800,
+        intersection,
+        arrival_rates,
+        seed=5,
+        sample_interval=2,
+        discharge=DischargeMode.POLLING,
+    )
+
+    np.testing.assert_array_equal(event.timeseries.light, polling.timeseries.light)
+    np.testing.assert_array_equal(
+        event.timeseries.departures.sum(axis=0),
+        polling.timeseries.departures.sum(axis=0),
+    )
+
+
+@pytest.mark.parametrize('name', ['series.npz', 'series'])
+def test_save_and_load(tmp_path, name):
+    """Archives and ``.npy`` directories round-trip every column."""
+    series = simulate(
+        900, intersection, arrival_rates, seed=3, sample_interval=5
+    ).timeseries
+    series.save(tmp_path / name)
+    loaded = TimeSeries.load(tmp_path / name)
+
+    for column in TimeSeries.COLUMNS:
+        np.testing.assert_array_equal(getattr(loaded, column), getattr(series, column))
+    if name == 'series':
+        assert isinstance(loaded.queue, np.memmap)
+
+
+def test_vectorized_engine_rejects_sampling():
+    """Sampling a time series needs the simpy engine."""
+    with pytest.raises(ValueError, match='simpy engine'):
+        simulate(
+            60,
+            intersection,
+            arrival_rates,
+            engine=Engine.VECTORIZED,
+            sample_interval=1,
+        )
@@ -0,0 +1,79 @@
+"""Tests for the binary per-vehicle trace."""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from sim.basic_fourway_intersection import arrival_rates, intersection
+from sim.intersection import Engine, simulate
+from sim.models import Direction, DischargeMode
+from sim.trace import DIRECTIONS, TRACE_DTYPE, TraceWriter, read_trace
+
+
+def by_vehicle(records: np.ndarray) -> np.ndarray:
+    """Return trace ``records`` sorted by direction and vehicle id."""
+    return np.sort(records, order=['direction', 'vehicle_id'])
+
+
+def test_trace_matches_statistics(tmp_path):
+    """Every vehicle is traced, and departed ones match the waiting times."""
+    path = tmp_path / 'run.trace'
+    stats = simulate(3600, intersection, arrival_rates, seed=1, trace_path=path)
+    records = read_trace(path)
+    departed = records[np.isfinite(records['departure'])]
+
+    assert isinstance(records, np.memmap)
+    assert len(records) == stats.total_vehicles
+    np.testing.assert_allclose(
+        departed['departure'] - departed['arrival'], stats.waiting_times.values
+    )
+    assert (np.diff(departed['departure']) >= 0).all()
+    assert (records['lane'] == 0).all()
+
+
+@pytest.mark.parametrize(
+    'options',
+    [{'engine': Engine.VECTORIZED}, {'discharge': DischargeMode.POLLING}],
+)
+def test_engines_write_the_same_trace(tmp_path, options):
+    """Other engines and discharge modes trace the same vehicles."""
+    rates = {direction: 3 * rate for direction, rate in arrival_rates.items()}
+    simulate(7200, intersection, rates, seed=8, trace_path=tmp_path / 'a')
+    simulate(7200, intersection, rates, seed=8, trace_path=tmp_path / 'b', **options)
+    expected = by_vehicle(read_trace(tmp_path / 'a'))
+    actual = by_vehicle(read_trace(tmp_path / 'b'))
+
+    for field in ('vehicle_id', 'direction', 'lane'):
+        np.testing.assert_array_equal(actual[field], expected[field])
+    np.testing.assert_allclose(actual['arrival'], expected['arrival'])
+    np.testing.assert_allclose(actual['departure'], expected['departure'])
+
+
+def test_writer_flushes_in_blocks(tmp_path):
+    """Records survive buffer flushes and bulk writes in order."""
+    path = tmp_path / 'blocks.trace'
+    block = np.zeros(3, dtype=TRACE_DTYPE)
+    block['vehicle_id'] = [10, 11, 12]
+    lane = SimpleNamespace(direction=Direction.EAST, index=1)
+    with TraceWriter(path, buffer_size=2) as trace:
+        for vehicle_id in range(5):
+            trace.record(vehicle_id, lane, 1.0, 2.0)
+        trace.extend(block)
+        assert trace.records == 8
+    records = read_trace(path)
+
+    assert records['vehicle_id'].tolist() == [0, 1, 2, 3, 4, 10, 11, 12]
+    assert records['direction'][:5].tolist() == [DIRECTIONS.index(Direction.EAST)] * 5
+    assert records['lane'][:5].tolist() == [1] * 5
+
+
+def test_read_trace_rejects_other_files(tmp_path):
+    """Files without the trace header are rejected, empty traces are not."""
+    path = tmp_path / 'other.bin'
+    path.write_bytes(b'not a trace')
+    with pytest.raises(ValueError, match='not a vehicle trace'):
+        read_trace(path)
+    with TraceWriter(tmp_path / 'empty.trace'):
+        pass
+    assert len(read_trace(tmp_path / 'empty.trace')) == 0
@@ -1,9 +1,14 @@
 """Unit tests for traffic pattern selection and scaling."""
 
+import numpy as np
 import pytest
 from datetime import time
 
-from sim.traffic_patterns import TrafficPatternManager, TrafficPattern
+from sim.traffic_patterns import (
+    RateSchedule,
+    TrafficPattern,
+    TrafficPatternManager,
+)
 from sim.models.lights import Direction
 
 
@@ -156,3 +161,46 @@ class TestTrafficPatternManager:
         assert rates[Direction.SOUTH] == pytest.approx(0.06)  # 0.2 * 0.3
         assert rates[Direction.EAST] == pytest.approx(0.045)  # 0.15 * 0.3
         assert rates[Direction.WEST] == pytest.approx(0.075)  # 0.25 * 0.3
+
+
+class TestRateSchedule:
+    """Unit tests for :class:`RateSchedule`."""
+
+    def test_compiled_rates_match_patterns(self, traffic_manager):
+        """Every second of the day has the rate of its pattern.
+
+        Parameters
+        ----------
+        traffic_manager : TrafficPatternManager
+            Instance under test.
+        """
+        schedule = traffic_manager.compile()[Direction.SOUTH]
+        seconds = np.arange(0, 24 * 3600, 7)
+        expected = [
+            traffic_manager.get_arrival_rates(
+                time(int(s) // 3600, int(s) // 60 % 60, int(s) % 60)
+            )[Direction.SOUTH]
+            for s in seconds
+        ]
+        np.testing.assert_allclose(schedule.rate(seconds + 0.5), expected)
+        assert schedule.rate(9 * 3600 + 0.5) == pytest.approx(0.4)
+        assert schedule.rate(9 * 3600 + 1) == pytest.approx(0.2)
+
+    def test_inverse_of_cumulative(self):
+        """Inverting the cumulative intensity recovers the time."""
+        schedule = RateSchedule([0, 10, 20, 30], [1.0, 0.0, 2.0], period=30)
+        times = np.array([0.0, 5.0, 10.0, 25.0, 47.5])
+
+        np.testing.assert_allclose(
+            schedule.cumulative(times), [0.0, 5.0, 10.0, 20.0, 40.0]
+        )
+        # A level reached before a zero-rate segment maps past that segment.
+        np.testing.assert_allclose(
+            schedule.inverse([5.0, 10.0, 45.0]), [5.0, 20.0, 52.5]
+        )
+        assert schedule.period_intensity == 30
+
+    def test_rejects_bad_breakpoints(self):
+        """Breakpoints must cover one period in increasing order."""
+        with pytest.raises(ValueError):
+            RateSchedule([0, 20, 10], [1.0, 1.0], period=10)
@@ -0,0 +1,129 @@
+"""Tests for the array-based fixed-time engine."""
+
+import numpy as np
+import pytest
+
+from sim.basic_fourway_intersection import arrival_rates, uniform_cyle_time
+from sim.intersection import Engine, simulate
+from sim.models import Direction, Intersection, Lane
+from sim.traffic_patterns import TrafficPatternManager
+from sim.vectorized import green_windows
+
+
+def fresh_intersection(**lane_options) -> Intersection:
+    """Return a four-way intersection with empty queues.
+
+    Parameters
+    ----------
+    **lane_options
+        Fields of :class:`Lane`; when given, every direction gets two such
+        lanes.
+    """
+    intersection = Intersection.create_basic_four_way(uniform_cyle_time)
+    if lane_options:
+        intersection.lanes = {
+            direction: [Lane(light=light, **lane_options) for _ in range(2)]
+            for direction, light in intersection.lights.items()
+        }
+    return intersection
+
+
+@pytest.mark.parametrize(
+    ('scale', 'lane_options'),
+    [
+        (1.0, {}),
+        (6.0, {}),
+        (4.0, {'saturation_headway': 2.0, 'startup_lost_time': 2.0}),
+    ],
+)
+def test_matches_event_engine(scale, lane_options):
+    """Both engines should produce the same waiting times for one seed.
+
+    Parameters
+    ----------
+    scale : float
+        Factor applied to the default arrival rates.
+    lane_options : dict
+        Lane fields under test.
+    """
+    rates = {d: rate * scale for d, rate in arrival_rates.items()}
+    expected = simulate(7200, fresh_intersection(**lane_options), rates, seed=3)
+    actual = simulate(
+        7200,
+        fresh_intersection(**lane_options),
+        rates,
+        seed=3,
+        engine=Engine.VECTORIZED,
+    )
+
+    assert actual.total_vehicles == expected.total_vehicles
+    np.testing.assert_allclose(
+        np.sort(actual.waiting_times), np.sort(expected.waiting_times), atol=1e-6
+    )
+
+
+def test_green_windows_follow_phases():
+    """North's light is green for the first phase of every cycle."""
+    intersection = fresh_intersection()
+    cycle = 2 * (uniform_cyle_time.green + uniform_cyle_time.yellow)
+
+    starts, ends = green_windows(intersection, Direction.NORTH, 0, 3 * cycle)
+
+    np.testing.assert_array_equal(starts, [0, cycle, 2 * cycle])
+    np.testing.assert_array_equal(ends - starts, uniform_cyle_time.green)
+    east_starts, _ = green_windows(intersection, Direction.EAST, 0, cycle)
+    np.testing.assert_array_equal(
+        east_starts, [uniform_cyle_time.green + uniform_cyle_time.yellow]
+    )
+
+
+def test_warmup_and_streaming():
+    """Warm-up and streaming statistics behave as in the event engine."""
+    expected = simulate(3600, fresh_intersection(), arrival_rates, seed=5, warmup=600)
+    actual = simulate(
+        3600,
+        fresh_intersection(),
+        arrival_rates,
+        seed=5,
+        warmup=600,
+        streaming=True,
+        engine=Engine.VECTORIZED,
+    )
+
+    assert actual.warmup_vehicles == expected.warmup_vehicles
+    assert actual.total_vehicles == expected.total_vehicles
+    assert actual.average_waiting_time() == pytest.approx(
+        expected.average_waiting_time()
+    )
+
+
+def test_matches_event_engine_with_traffic_patterns():
+    """Time-varying rates are sampled identically by both engines."""
+    manager = TrafficPatternManager(arrival_rates)
+    kwargs = {'traffic_manager': manager, 'start_time': 6 * 3600, 'seed': 2}
+    expected = simulate(12 * 3600, fresh_intersection(), **kwargs)
+    actual = simulate(
+        12 * 3600, fresh_intersection(), engine=Engine.VECTORIZED, **kwargs
+    )
+
+    assert actual.total_vehicles == expected.total_vehicles
+    np.testing.assert_allclose(
+        np.sort(actual.waiting_times), np.sort(expected.waiting_times), atol=1e-6
+    )
+
+
+def test_lane_choices_match_for_any_block_size():
+    """Both engines consume lane choices in the same blocks."""
+    kwargs = {'seed': 9, 'block_size': 100}
+    expected = simulate(
+        3600, fresh_intersection(startup_lost_time=0.0), arrival_rates, **kwargs
+    )
+    actual = simulate(
+        3600,
+        fresh_intersection(startup_lost_time=0.0),
+        arrival_rates,
+        engine=Engine.VECTORIZED,
+        **kwargs,
+    )
+
+    np.testing.assert_allclose(actual.waiting_times, expected.waiting_times)
@@ -0,0 +1,64 @@
+"""Tests for warm-up truncation of simulation statistics."""
+
+import numpy as np
+import pytest
+
+from sim.basic_fourway_intersection import arrival_rates, uniform_cyle_time
+from sim.intersection import simulate
+from sim.models import Intersection
+from sim.warmup import mser_truncation
+
+
+def fresh_intersection() -> Intersection:
+    """Return a four-way intersection with empty queues."""
+    return Intersection.create_basic_four_way(uniform_cyle_time)
+
+
+def test_mser_detects_initial_transient():
+    """A decaying initial bias should be truncated, steady noise kept."""
+    rng = np.random.default_rng(0)
+    steady = rng.normal(10.0, 1.0, size=2000)
+    biased = steady + 40.0 * np.exp(-np.arange(2000) / 100.0)
+
+    truncated = mser_truncation(biased)
+
+    assert truncated % 5 == 0
+    assert 200 <= truncated <= 1000
+    assert mser_truncation(steady) < 200
+
+
+def test_fixed_warmup_excludes_early_arrivals():
+    """Vehicles arriving during a fixed warm-up are not recorded."""
+    full = simulate(3600, fresh_intersection(), arrival_rates, seed=2)
+    warm = simulate(3600, fresh_intersection(), arrival_rates, seed=2, warmup=600)
+
+    assert warm.warmup_time == 600
+    assert warm.warmup_vehicles > 0
+    assert warm.total_vehicles + warm.warmup_vehicles == full.total_vehicles
+    assert len(warm.waiting_times) < len(full.waiting_times)
+
+
+def test_auto_warmup_reports_truncation_point():
+    """Automatic detection drops leading departures and reports them."""
+    rates = {d: rate * 3 for d, rate in arrival_rates.items()}
+    full = simulate(7200, fresh_intersection(), rates, seed=8)
+    auto = simulate(7200, fresh_intersection(), rates, seed=8, warmup='auto')
+
+    dropped = auto.warmup_vehicles
+    assert auto.total_vehicles == full.total_vehicles - dropped
+    np.testing.assert_array_equal(
+        auto.waiting_times, np.asarray(full.waiting_times)[dropped:]
+    )
+    assert (auto.warmup_time > 0) == (dropped > 0)
+
+
+def test_auto_warmup_rejects_streaming():
+    """MSER needs the individual waiting times."""
+    with pytest.raises(ValueError):
+        simulate(
+            60,
+            fresh_intersection(),
+            arrival_rates,
+            streaming=True,
+            warmup='auto',
+        )